@@ -0,0 +1,94 @@
+# Compares the fp32 and int8 CPU inference paths of the ML nodes on the same inputs.
+#
+#   python3 -m benchmarks.cpu_inference --node embedding-clip --images ./samples
+#   python3 -m benchmarks.cpu_inference --node image-description --samples 8
+#
+# Embeddings are compared by cosine similarity, captions by exact match.
+import argparse
+import glob
+import io
+import json
+import os
+import random
+from typing import Any, List
+from PIL import Image # type: ignore
+from core.util.cpu_inference import FP32, INT8, compare
+
+TEXTS = [
+    "a red bicycle leaning against a wall",
+    "two dogs playing in the snow",
+    "a bowl of fresh fruit on a wooden table",
+    "a city skyline at night",
+    "a person riding a wave on a surfboard",
+    "a plate with a sandwich and fries",
+    "an old car parked on a street",
+    "a cat sleeping on a couch",
+]
+
+def load_images(directory: str, samples: int) -> List[bytes]:
+    if directory:
+        paths = sorted(glob.glob(os.path.join(directory, "*")))[:samples]
+        return [open(path, "rb").read() for path in paths]
+
+    # Without real images, random noise still exercises the full pipeline
+    images = []
+    for seed in range(samples):
+        rng = random.Random(seed)
+        image = Image.new("RGB", (224, 224), tuple(rng.randrange(256) for _ in range(3)))
+        image.putdata([tuple(rng.randrange(256) for _ in range(3)) for _ in range(224 * 224)])
+        buffer = io.BytesIO()
+        image.save(buffer, format="JPEG")
+        images.append(buffer.getvalue())
+    return images
+
+def open_image(data: bytes) -> Image.Image:
+    return Image.open(io.BytesIO(data)).convert("RGB")
+
+def compare_clip(images: List[bytes], texts: List[str], repeat: int) -> Any:
+    from nodes.embed.node import EmbeddingClip
+
+    reference, candidate = EmbeddingClip(FP32), EmbeddingClip(INT8)
+    return {
+        "text": compare(
+            lambda text: reference.embed_texts([text])[0],
+            lambda text: candidate.embed_texts([text])[0],
+            texts, repeat,
+        ),
+        "image": compare(
+            lambda data: reference.embed_images([reference.preprocess_image(open_image(data))])[0],
+            lambda data: candidate.embed_images([candidate.preprocess_image(open_image(data))])[0],
+            images, repeat,
+        ),
+    }
+
+def compare_blip(images: List[bytes], repeat: int) -> Any:
+    from nodes.image_description.node import GenerateCaption
+
+    reference, candidate = GenerateCaption(FP32), GenerateCaption(INT8)
+    options = reference.generation_options({})
+    return {
+        "caption": compare(
+            lambda data: reference.caption_batch([(open_image(data), options)])[0],
+            lambda data: candidate.caption_batch([(open_image(data), options)])[0],
+            images, repeat,
+        ),
+    }
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Compare fp32 and int8 CPU inference for ML nodes")
+    parser.add_argument("--node", choices=["embedding-clip", "image-description"], required=True)
+    parser.add_argument("--images", default="", help="directory of sample images (random images when omitted)")
+    parser.add_argument("--samples", type=int, default=8)
+    parser.add_argument("--repeat", type=int, default=3)
+    args = parser.parse_args()
+
+    images = load_images(args.images, args.samples)
+    if args.node == "embedding-clip":
+        report = compare_clip(images, TEXTS[:args.samples], args.repeat)
+    else:
+        report = compare_blip(images, args.repeat)
+
+    print(json.dumps(report, indent=2))
+
+if __name__ == "__main__":
+    main()
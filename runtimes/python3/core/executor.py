@@ -0,0 +1,92 @@
+import asyncio
+import importlib
+import multiprocessing
+import os
+import threading
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+from typing import Any, Coroutine, Dict, Optional
+
+INLINE = "inline"
+THREAD = "thread"
+PROCESS = "process"
+EXECUTION_CLASSES = (INLINE, THREAD, PROCESS)
+
+CPU_COUNT = os.cpu_count() or 1
+
+class NodeExecutors:
+    # Bounded pools shared by every node that runs off the event loop.
+    # Pools are created on first use so inline-only runtimes never start them.
+    def __init__(self, thread_workers: Optional[int] = None, process_workers: Optional[int] = None):
+        self.thread_workers = thread_workers or int(os.getenv("NODE_THREAD_POOL_SIZE", str(min(32, CPU_COUNT + 4))))
+        self.process_workers = process_workers or int(os.getenv("NODE_PROCESS_POOL_SIZE", str(CPU_COUNT)))
+        # spawn by default: forking a process that already runs grpc threads is unsafe
+        self.start_method = os.getenv("NODE_PROCESS_START_METHOD", "spawn")
+        self.pools: Dict[str, Executor] = {}
+        self.lock = threading.Lock()
+
+    def get(self, execution: str) -> Executor:
+        pool = self.pools.get(execution)
+        if pool is not None:
+            return pool
+
+        with self.lock:
+            pool = self.pools.get(execution)
+            if pool is None:
+                if execution == THREAD:
+                    pool = ThreadPoolExecutor(max_workers=self.thread_workers, thread_name_prefix="node")
+                elif execution == PROCESS:
+                    pool = ProcessPoolExecutor(
+                        max_workers=self.process_workers,
+                        mp_context=multiprocessing.get_context(self.start_method),
+                    )
+                else:
+                    raise ValueError(f"Unsupported execution class: {execution}")
+                self.pools[execution] = pool
+        return pool
+
+    def shutdown(self, wait: bool = True) -> None:
+        with self.lock:
+            pools = list(self.pools.values())
+            self.pools.clear()
+
+        for pool in pools:
+            pool.shutdown(wait=wait, cancel_futures=not wait)
+
+executors = NodeExecutors()
+
+local = threading.local()
+
+def run_coroutine(coroutine: Coroutine[Any, Any, Any]) -> Any:
+    # Each worker thread keeps one event loop for the async handle() of the nodes it runs
+    loop = getattr(local, "loop", None)
+    if loop is None or loop.is_closed():
+        loop = asyncio.new_event_loop()
+        local.loop = loop
+    return loop.run_until_complete(coroutine)
+
+def run_in_thread(node: Any, ctx: Any, inputs: Dict[str, Any]) -> Any:
+    return run_coroutine(node.handle(ctx, inputs))
+
+process_nodes: Dict[str, Any] = {}
+
+def run_in_process(node_class: str, config: Dict[str, Any], ctx: Any, inputs: Dict[str, Any]) -> Any:
+    # Runs in a pool process: the node is built once per process, inputs arrive pickled
+    node = process_nodes.get(node_class)
+    if node is None:
+        module_name, class_name = node_class.split(":", 1)
+        node = getattr(importlib.import_module(module_name), class_name)()
+        process_nodes[node_class] = node
+
+    return run_coroutine(node.invocation(config).handle(ctx, inputs))
+
+async def execute(node: Any, ctx: Any, inputs: Dict[str, Any]) -> Any:
+    execution = getattr(node, "execution", INLINE)
+    if execution == INLINE:
+        return await node.handle(ctx, inputs)
+
+    loop = asyncio.get_running_loop()
+    if execution == THREAD:
+        return await loop.run_in_executor(executors.get(THREAD), run_in_thread, node, ctx, inputs)
+
+    node_class = f"{type(node).__module__}:{type(node).__qualname__}"
+    return await loop.run_in_executor(executors.get(execution), run_in_process, node_class, node.originalConfig, ctx, inputs)
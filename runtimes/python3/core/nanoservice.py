@@ -1,25 +1,31 @@
 from abc import abstractmethod
-from typing import Any, Dict, List, Union
-from jsonschema import Draft7Validator, ValidationError # type: ignore
-from copy import deepcopy
+from typing import Any, AsyncIterator, Dict, List, Union
+import os
 import time
 import logging
 from core.types.context import Context
 from core.types.response import ResponseContext
 from core.types.nanoservice_response import NanoServiceResponse
 from core.node_base import NodeBase
+from core.util.schema import compile_schema
+from core.executor import INLINE, execute
+
+STREAM_CHUNK_SIZE = int(os.getenv("STREAM_CHUNK_SIZE", str(1024 * 1024)))
 
 class NanoService(NodeBase):
     def __init__(self):
         NodeBase.__init__(self)
         self.input_schema: Any = {}
         self.output_schema: Any = {}
-        self.validator = Draft7Validator(self.input_schema)
+        # Where handle() runs: INLINE on the event loop, THREAD for blocking I/O or
+        # GIL-releasing work, PROCESS for CPU-bound Python (inputs are pickled)
+        self.execution: str = INLINE
 
     def setSchemas(self, input_schema: Any, output_schema: Any) -> None:
         self.input_schema = input_schema
         self.output_schema = output_schema
-        self.validator = Draft7Validator(self.input_schema)
+        compile_schema(input_schema)
+        compile_schema(output_schema)
 
     def getSchemas(self) -> Dict[str, Any]:
         return {
@@ -36,15 +42,18 @@ class NanoService(NodeBase):
         start = time.time()
         logging.info(f"Running node: {self.name} [{ctx.config}]")
 
-        config = deepcopy(ctx.config)
         data = ctx.response.get('data') or ctx.request.get('body')
 
-        config = self.blueprintMapper(config, ctx, data)
+        # Single mapping pass: builds a new structure and leaves ctx.config untouched
+        config = self.blueprintMapper(ctx.config, ctx, data)
         self.validate(config, self.input_schema)
+        config = self.with_attachments(ctx, config)
 
         # Process node custom logic
-        result = await self.handle(ctx, config)
-        self.validator.validate(result, self.output_schema)
+        result = await execute(self, ctx, config)
+        # The output schema describes the node's data, not the response wrapper
+        if result.error is None:
+            self.validate(result.data, self.output_schema)
         end = time.time()
 
         logging.info(f"Executed node: {self.name} in {(end - start) * 1000:.2f}ms")
@@ -57,15 +66,41 @@ class NanoService(NodeBase):
 
         return response
 
+    async def run_stream(self, ctx: Context) -> AsyncIterator[Any]:
+        logging.info(f"Streaming node: {self.name} [{ctx.config}]")
+
+        data = ctx.response.get('data') or ctx.request.get('body')
+        config = self.blueprintMapper(ctx.config, ctx, data)
+        self.validate(config, self.input_schema)
+        config = self.with_attachments(ctx, config)
+
+        async for chunk in self.stream(ctx, config):
+            yield chunk
+
+    async def stream(self, ctx: Context, inputs: Dict[str, Any]) -> AsyncIterator[Any]:
+        # Generator-style API: override to yield output as it is produced. By default
+        # the handle() result is sent as one chunk, with binary results split into slices.
+        result = await execute(self, ctx, inputs)
+        if result.error is not None:
+            raise Exception(result.error.to_dict())
+
+        if isinstance(result.data, (bytes, bytearray, memoryview)):
+            view = memoryview(result.data)
+            for offset in range(0, len(view), STREAM_CHUNK_SIZE):
+                yield view[offset:offset + STREAM_CHUNK_SIZE]
+        else:
+            yield result.data
+
+    def with_attachments(self, ctx: Context, inputs: Dict[str, Any]) -> Dict[str, Any]:
+        # Uploaded binary inputs are added to the inputs under their attachment name
+        attachments = getattr(ctx, 'attachments', None)
+        if not attachments:
+            return inputs
+        return {**inputs, **attachments}
+
     def validate(self, obj: Dict[str, Any], schema: Any) -> None:
-        try:
-            self.validator.validate(obj, schema)
-        except ValidationError as e:
-            errors: List[str] = []
-            for error in sorted(self.validator.evolve(schema=schema).iter_errors(obj), key=str):
-                errors.append(f"{error.path} {error.message}")
-
-            raise ValidationError(", ".join(errors)) from e
+        # Validators are compiled once per distinct schema; empty schemas skip validation
+        compile_schema(schema).validate(obj)
 
     @abstractmethod
     async def handle(self, ctx: 'Context', inputs: Dict[str, Any]) -> Union[NanoServiceResponse, List['NanoService[Dict[str, Any]]']]:
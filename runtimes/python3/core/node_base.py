@@ -1,15 +1,20 @@
 from abc import ABC, abstractmethod
-from typing import Any, Dict, Union
+from copy import copy
+from typing import Any, AsyncIterator, Dict, Union
 from core.types.context import Context
 from core.types.config import ConfigContext
 from core.types.response import ResponseContext
 from core.util.mapper import Mapper
+from core.util.expression import evaluate
 from core.types.error import ErrorContext
 from core.types.global_error import GlobalError
 
 mapper = Mapper()
 
 class NodeBase(ABC):
+    # Replaced on an invocation to map with a config's precompiled templates
+    mapper: Mapper = mapper
+
     def __init__(self):
         self.flow = False
         self.name = ""
@@ -20,6 +25,18 @@ class NodeBase(ABC):
         self.originalConfig: Dict[str, Any] = {}
         self.set_var = False
 
+    def invocation(self, config: Dict[str, Any]) -> 'NodeBase':
+        # Shallow copy: per-call state lives on the copy, while resources built
+        # in __init__ (models, validators, sessions) stay shared with the registered node.
+        node = copy(self)
+        node.node = config.get('node')
+        node.name = config.get('name')
+        node.active = config.get('active', True)
+        node.stop = config.get('stop', False)
+        node.set_var = config.get('set_var', False)
+        node.originalConfig = config
+        return node
+
     async def process(self, ctx: Context) -> ResponseContext:
         response: ResponseContext = ResponseContext()
         response.success = True
@@ -27,7 +44,6 @@ class NodeBase(ABC):
         response.error = None
 
         self.originalConfig = ctx.config.copy()
-        ctx.config = self.blueprintMapper(ctx.config, ctx)
 
         response = await self.run(ctx)
         if response.error is not None:
@@ -37,25 +53,42 @@ class NodeBase(ABC):
 
         return response
     
+    async def process_stream(self, ctx: Context) -> AsyncIterator[Any]:
+        self.originalConfig = ctx.config.copy()
+
+        async for chunk in self.run_stream(ctx):
+            yield chunk
+
     def blueprintMapper(self, obj: Dict[str, Any], ctx: Context, data: Dict[str, Any] = None) -> Dict[str, Any]:
         new_obj: Dict[str, Any] = obj
 
         try:
             if isinstance(obj, str):
-                new_obj = mapper.replace_string(obj, ctx, data)
+                new_obj = self.mapper.replace_string(obj, ctx, data)
             else:
-                mapper.replace_object_strings(new_obj, ctx, data)
+                new_obj = self.mapper.map_object(obj, ctx, data)
         except Exception as e:
             print("MAPPER ERROR", e)
 
         return new_obj
 
+    async def shutdown(self) -> None:
+        # Release long-lived resources (sessions, buffers, pools) when the runtime stops
+        pass
+
     @abstractmethod
     async def run(self, ctx: Context) -> ResponseContext:
         pass
 
+    async def run_stream(self, ctx: Context) -> AsyncIterator[Any]:
+        # Nodes without incremental output stream their whole result as one chunk
+        response = await self.run(ctx)
+        if response.error is not None:
+            raise Exception(response.error)
+        yield response.data
+
     def runJs(self, str: str, ctx: Context, data: Dict[str, Any] = {}, func: Dict[str, Any] = {}, vars: Dict[str, Any] = {}) -> Dict[str, Any]:
-        return eval(f"lambda ctx, data, func, vars: ({str})")(ctx, data, func, vars)
+        return evaluate(str, ctx, data, func, vars)
 
     def setVar(self, ctx: Context, vars: Dict[str, Any]) -> None:
         if not hasattr(ctx, 'vars') or ctx.vars is None:
@@ -0,0 +1,26 @@
+import io
+from typing import Optional, Union
+
+class Attachment:
+    # Binary input received out of band (client-streaming upload or shared memory),
+    # handed to nodes without the base64 round trip
+    def __init__(self, name: str, data: Union[bytes, memoryview], content_type: Optional[str] = None):
+        self.name: str = name
+        self.data: Union[bytes, memoryview] = data
+        self.content_type: str = content_type or "application/octet-stream"
+
+    def __len__(self) -> int:
+        return len(self.data)
+
+    def view(self) -> memoryview:
+        return memoryview(self.data)
+
+    def file(self) -> io.BytesIO:
+        # BytesIO shares a bytes buffer until it is written to; shared memory views are copied
+        return io.BytesIO(self.data)
+
+    def __getstate__(self):
+        # Views over shared memory cannot be pickled (process pool nodes)
+        state = self.__dict__.copy()
+        state["data"] = bytes(self.data)
+        return state
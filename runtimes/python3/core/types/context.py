@@ -15,4 +15,5 @@ class Context:
         self.config: Dict[str, Any] = {}
         self.func: Dict[str, Any] = {}
         self.vars: Dict[str, Any] = {}
-        self.env: Dict[str, Any] = {}
\ No newline at end of file
+        self.env: Dict[str, Any] = {}
+        self.attachments: Dict[str, Any] = {}
\ No newline at end of file
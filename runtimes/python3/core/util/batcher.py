@@ -0,0 +1,107 @@
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Any, Callable, Generic, List, Optional, Sequence, Tuple, TypeVar
+
+T = TypeVar("T")
+R = TypeVar("R")
+
+class MicroBatcher(Generic[T, R]):
+    # Collects items submitted concurrently (from pool threads or event loops) and
+    # runs fn once per batch of up to max_size items, waiting at most max_wait
+    # seconds after the first item. fn returns one result per item, in order.
+    # A failed batch is retried item by item unless retry_items is off, which
+    # non-idempotent fn (e.g. inserts) need: then every item gets the batch's error.
+    def __init__(self, fn: Callable[[List[T]], Sequence[R]], max_size: int = 32, max_wait: float = 0.005, name: str = "batcher", retry_items: bool = True):
+        self.fn = fn
+        self.max_size = max(max_size, 1)
+        self.max_wait = max(max_wait, 0)
+        self.name = name
+        self.retry_items = retry_items
+        self.queue: "queue.Queue[Optional[Tuple[T, Future]]]" = queue.Queue()
+        self.thread: Optional[threading.Thread] = None
+        self.lock = threading.Lock()
+        self.closed = False
+
+    def submit(self, item: T) -> "Future[R]":
+        future: "Future[R]" = Future()
+        with self.lock:
+            if self.closed:
+                raise RuntimeError(f"{self.name} is closed")
+            if self.thread is None:
+                self.thread = threading.Thread(target=self.loop, name=self.name, daemon=True)
+                self.thread.start()
+            self.queue.put((item, future))
+        return future
+
+    def __call__(self, item: T) -> R:
+        return self.submit(item).result()
+
+    def collect(self, first: Tuple[T, Future]) -> Tuple[List[Tuple[T, Future]], bool]:
+        batch = [first]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_size:
+            remaining = deadline - time.monotonic()
+            try:
+                entry = self.queue.get(timeout=remaining) if remaining > 0 else self.queue.get_nowait()
+            except queue.Empty:
+                break
+            if entry is None:
+                return batch, True
+            batch.append(entry)
+        return batch, False
+
+    def loop(self) -> None:
+        while True:
+            first = self.queue.get()
+            if first is None:
+                return
+
+            batch, stop = self.collect(first)
+            self.run(batch)
+            if stop:
+                return
+
+    def run(self, batch: List[Tuple[T, Future]]) -> None:
+        # Items whose caller cancelled the future while it was queued are dropped
+        pending = [(item, future) for item, future in batch if future.set_running_or_notify_cancel()]
+        if not pending:
+            return
+        items = [item for item, _ in pending]
+        futures = [future for _, future in pending]
+
+        try:
+            results = self.call(items)
+        except BaseException as e:
+            if len(pending) == 1 or not self.retry_items:
+                for future in futures:
+                    future.set_exception(e)
+                return
+            # One bad item must not fail the others: retry each on its own
+            for item, future in pending:
+                try:
+                    future.set_result(self.call([item])[0])
+                except BaseException as e:
+                    future.set_exception(e)
+            return
+
+        for future, result in zip(futures, results):
+            future.set_result(result)
+
+    def call(self, items: List[T]) -> Sequence[R]:
+        results = self.fn(items)
+        if len(results) != len(items):
+            raise ValueError(f"{self.name} returned {len(results)} results for {len(items)} items")
+        return results
+
+    def close(self) -> None:
+        # Items already submitted are still processed
+        with self.lock:
+            if self.closed:
+                return
+            self.closed = True
+            thread = self.thread
+            self.queue.put(None)
+        if thread is not None:
+            thread.join()
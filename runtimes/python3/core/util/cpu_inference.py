@@ -0,0 +1,111 @@
+import logging
+import math
+import os
+import statistics
+import time
+from typing import Any, Callable, Dict, List, Sequence
+
+# torch is only imported by the ML nodes; these helpers import it lazily so the
+# runtime does not depend on it.
+
+FP32 = "fp32"
+INT8 = "int8"
+CPU_MODES = (FP32, INT8)
+
+CPU_COUNT = os.cpu_count() or 1
+
+def cpu_mode(prefix: str) -> str:
+    # <PREFIX>_CPU_MODE=int8 opts a node into dynamic int8 quantization on CPU
+    mode = os.getenv(f"{prefix}_CPU_MODE", FP32).lower()
+    if mode not in CPU_MODES:
+        raise ValueError(f"Unsupported {prefix}_CPU_MODE: {mode}")
+    return mode
+
+def compile_enabled(prefix: str) -> bool:
+    return os.getenv(f"{prefix}_COMPILE", "") in ("1", "true")
+
+def thread_count() -> int:
+    # Workers of the supervisor share the cores instead of each using all of them
+    value = os.getenv("TORCH_NUM_THREADS")
+    if value:
+        return max(int(value), 1)
+    workers = max(int(os.getenv("SERVER_WORKERS", "1")), 1)
+    return max(CPU_COUNT // workers, 1)
+
+def configure_threads() -> None:
+    import torch # type: ignore
+
+    threads = thread_count()
+    if torch.get_num_threads() != threads:
+        torch.set_num_threads(threads)
+    try:
+        torch.set_num_interop_threads(max(min(threads, 4), 1))
+    except RuntimeError:
+        # Can only be set once, before any inter-op parallel work
+        pass
+
+def quantize(model: Any) -> Any:
+    import torch # type: ignore
+
+    # Weights of nn.Linear layers become int8, activations are quantized per batch
+    return torch.ao.quantization.quantize_dynamic(model, {torch.nn.Linear}, dtype=torch.qint8)
+
+def compile_module(module: Any) -> Any:
+    import torch # type: ignore
+
+    if not hasattr(torch, "compile"):
+        return module
+    return torch.compile(module)
+
+def warm_up(name: str, fn: Callable[[], Any]) -> None:
+    # The first pass allocates buffers (and compiles graphs); do it before serving traffic
+    start = time.time()
+    fn()
+    logging.info(f"Warmed up {name} in {(time.time() - start) * 1000:.2f}ms")
+
+def cosine_similarity(a: Sequence[float], b: Sequence[float]) -> float:
+    dot = sum(x * y for x, y in zip(a, b))
+    norm = math.sqrt(sum(x * x for x in a)) * math.sqrt(sum(y * y for y in b))
+    return dot / norm if norm else 0.0
+
+def latency_stats(samples: List[float]) -> Dict[str, float]:
+    ordered = sorted(samples)
+    return {
+        "mean_ms": statistics.fmean(ordered) * 1000,
+        "p50_ms": ordered[len(ordered) // 2] * 1000,
+        "p95_ms": ordered[min(len(ordered) - 1, math.ceil(len(ordered) * 0.95) - 1)] * 1000,
+    }
+
+def compare(reference: Callable[[Any], Any], candidate: Callable[[Any], Any], inputs: Sequence[Any], repeat: int = 3) -> Dict[str, Any]:
+    # Runs both paths on the same inputs. Vector outputs are compared by cosine
+    # similarity, anything else by exact match.
+    timings: Dict[str, List[float]] = {"reference": [], "candidate": []}
+    similarities: List[float] = []
+    matches = 0
+
+    for item in inputs:
+        outputs = {}
+        for name, fn in (("reference", reference), ("candidate", candidate)):
+            for _ in range(repeat):
+                start = time.perf_counter()
+                outputs[name] = fn(item)
+                timings[name].append(time.perf_counter() - start)
+
+        expected, actual = outputs["reference"], outputs["candidate"]
+        if isinstance(expected, (list, tuple)) and expected and isinstance(expected[0], (int, float)):
+            similarities.append(cosine_similarity(expected, actual))
+        else:
+            matches += int(expected == actual)
+
+    report: Dict[str, Any] = {
+        "samples": len(inputs),
+        "reference": latency_stats(timings["reference"]),
+        "candidate": latency_stats(timings["candidate"]),
+    }
+    report["speedup"] = report["reference"]["mean_ms"] / report["candidate"]["mean_ms"] if report["candidate"]["mean_ms"] else 0.0
+    if similarities:
+        report["cosine_mean"] = statistics.fmean(similarities)
+        report["cosine_min"] = min(similarities)
+    if len(similarities) < len(inputs):
+        report["exact_match"] = matches / (len(inputs) - len(similarities))
+    return report
@@ -0,0 +1,247 @@
+import ast
+import os
+import re
+import types
+from functools import lru_cache
+from typing import Any, Callable, Dict, FrozenSet, List, Optional, Set, Tuple, Union
+from core.types.context import Context
+from core.types.error import ErrorContext
+from core.types.response import ResponseContext
+
+CACHE_SIZE = int(os.getenv("EXPRESSION_CACHE_SIZE", "4096"))
+
+ARGUMENTS = ("ctx", "data", "func", "vars")
+
+SAFE_BUILTINS: Dict[str, Any] = {
+    "abs": abs,
+    "all": all,
+    "any": any,
+    "bool": bool,
+    "dict": dict,
+    "float": float,
+    "int": int,
+    "len": len,
+    "list": list,
+    "max": max,
+    "min": min,
+    "round": round,
+    "set": set,
+    "sorted": sorted,
+    "str": str,
+    "sum": sum,
+    "tuple": tuple,
+}
+
+# Methods are looked up on these builtin types, never on the value itself
+SAFE_METHODS: Dict[type, FrozenSet[str]] = {
+    str: frozenset({
+        "capitalize", "count", "endswith", "find", "index", "join", "lower", "lstrip",
+        "replace", "rstrip", "split", "startswith", "strip", "title", "upper",
+    }),
+    dict: frozenset({"get", "items", "keys", "values"}),
+    list: frozenset({"count", "index"}),
+    tuple: frozenset({"count", "index"}),
+}
+METHOD_NAMES = frozenset(name for names in SAFE_METHODS.values() for name in names)
+
+# Attributes readable on objects that are not dicts; dicts are read by key
+SAFE_ATTRIBUTES: Dict[type, FrozenSet[str]] = {
+    Context: frozenset({
+        "id", "workflow_name", "workflow_path", "request", "response", "error",
+        "config", "func", "vars", "env", "attachments",
+    }),
+    ResponseContext: frozenset({"data", "error", "success", "contentType"}),
+    ErrorContext: frozenset({"message", "code", "json", "stack", "name"}),
+}
+
+# Never readable or callable, whatever path leads to them
+UNSAFE_TYPES = (
+    types.GeneratorType, types.CoroutineType, types.AsyncGeneratorType, types.FrameType,
+    types.CodeType, types.TracebackType, types.FunctionType, types.LambdaType, types.MethodType,
+    types.BuiltinFunctionType, types.ModuleType, type,
+)
+
+ALLOWED_NODES = (
+    ast.Expression, ast.Load, ast.Store, ast.Name, ast.Constant, ast.Attribute, ast.Subscript, ast.Slice,
+    ast.List, ast.Tuple, ast.Dict, ast.Set, ast.BinOp, ast.UnaryOp, ast.BoolOp, ast.Compare, ast.IfExp,
+    ast.Call, ast.keyword, ast.JoinedStr, ast.FormattedValue,
+    ast.ListComp, ast.SetComp, ast.DictComp, ast.GeneratorExp, ast.comprehension,
+    ast.Add, ast.Sub, ast.Mult, ast.Div, ast.FloorDiv, ast.Mod, ast.Pow,
+    ast.UAdd, ast.USub, ast.Not, ast.And, ast.Or,
+    ast.Eq, ast.NotEq, ast.Lt, ast.LtE, ast.Gt, ast.GtE, ast.In, ast.NotIn, ast.Is, ast.IsNot,
+)
+
+# ctx.request.body.items[0].id, data['key'], vars["name"][1]
+PATH_REGEX = re.compile(r"""^([A-Za-z_]\w*)((?:\.[A-Za-z_]\w*|\[(?:-?\d+|'[^'\\]*'|"[^"\\]*")\])*)$""")
+PATH_STEP_REGEX = re.compile(r"""\.([A-Za-z_]\w*)|\[(-?\d+|'[^'\\]*'|"[^"\\]*")\]""")
+
+class ExpressionError(ValueError):
+    pass
+
+def check_value(obj: Any) -> Any:
+    if isinstance(obj, UNSAFE_TYPES):
+        raise ExpressionError(f"Value not allowed: {type(obj).__name__}")
+    return obj
+
+def get_attr(obj: Any, name: str) -> Any:
+    # Workflow configs use JS-style dotted access: dicts are read by key, other
+    # objects only through the attributes allowed for their type
+    check_value(obj)
+    if isinstance(obj, dict):
+        try:
+            return obj[name]
+        except KeyError:
+            raise AttributeError(name) from None
+
+    for cls, names in SAFE_ATTRIBUTES.items():
+        if isinstance(obj, cls) and name in names:
+            return getattr(obj, name)
+    raise AttributeError(f"Attribute not allowed: {type(obj).__name__}.{name}")
+
+def call_method(obj: Any, name: str, *args: Any, **kwargs: Any) -> Any:
+    # The method of the builtin type is called, so a dict value stored under "get" is never called
+    check_value(obj)
+    for cls, names in SAFE_METHODS.items():
+        if isinstance(obj, cls):
+            if name not in names:
+                break
+            return getattr(cls, name)(obj, *args, **kwargs)
+    raise ExpressionError(f"Call not allowed: {type(obj).__name__}.{name}")
+
+def get_field(obj: Any, name: str, default: Any = None) -> Any:
+    if isinstance(obj, dict):
+        return obj.get(name, default)
+    return getattr(obj, name, default)
+
+def get_item(obj: Any, key: Union[int, str]) -> Any:
+    # Plain subscription only: brackets never reach attributes
+    return check_value(obj)[key]
+
+def parse_path(source: str) -> Optional[List[Tuple[bool, Union[int, str]]]]:
+    match = PATH_REGEX.match(source.strip())
+    if match is None or match.group(1) not in ARGUMENTS:
+        return None
+
+    steps: List[Tuple[bool, Union[int, str]]] = []
+    for attr, index in PATH_STEP_REGEX.findall(match.group(2)):
+        if attr:
+            if attr.startswith("_"):
+                return None
+            steps.append((True, attr))
+        elif index[0] in "'\"":
+            # Left to check_tree, which rejects the key
+            if index[1:-1].startswith("_"):
+                return None
+            steps.append((False, index[1:-1]))
+        else:
+            steps.append((False, int(index)))
+    return steps
+
+class SafeTransformer(ast.NodeTransformer):
+    # Routes attribute access through get_attr so dicts can be read with dots,
+    # and method calls through call_method
+    def visit_Call(self, node: ast.Call) -> ast.AST:
+        if not isinstance(node.func, ast.Attribute):
+            return self.generic_visit(node)
+
+        call = ast.Call(
+            func=ast.Name(id="_call_method", ctx=ast.Load()),
+            args=[self.visit(node.func.value), ast.Constant(value=node.func.attr), *[self.visit(arg) for arg in node.args]],
+            keywords=[self.visit(keyword) for keyword in node.keywords],
+        )
+        return ast.copy_location(call, node)
+
+    def visit_Attribute(self, node: ast.Attribute) -> ast.AST:
+        self.generic_visit(node)
+        if isinstance(node.ctx, ast.Load):
+            call = ast.Call(
+                func=ast.Name(id="_get_attr", ctx=ast.Load()),
+                args=[node.value, ast.Constant(value=node.attr)],
+                keywords=[],
+            )
+            return ast.copy_location(call, node)
+        return node
+
+def check_tree(tree: ast.AST) -> None:
+    bound: Set[str] = set()
+    for node in ast.walk(tree):
+        if isinstance(node, ast.comprehension):
+            for target in ast.walk(node.target):
+                if isinstance(target, ast.Name):
+                    # Loop variables must not shadow the callable builtins or the arguments
+                    if target.id in SAFE_BUILTINS or target.id in ARGUMENTS:
+                        raise ExpressionError(f"Name not allowed: {target.id}")
+                    bound.add(target.id)
+
+    for node in ast.walk(tree):
+        if not isinstance(node, ALLOWED_NODES):
+            raise ExpressionError(f"Expression node not allowed: {type(node).__name__}")
+
+        if isinstance(node, ast.Name):
+            if node.id not in ARGUMENTS and node.id not in SAFE_BUILTINS and node.id not in bound:
+                raise ExpressionError(f"Name not allowed: {node.id}")
+            if node.id.startswith("_"):
+                raise ExpressionError(f"Name not allowed: {node.id}")
+        elif isinstance(node, ast.Attribute):
+            if node.attr.startswith("_"):
+                raise ExpressionError(f"Attribute not allowed: {node.attr}")
+        elif isinstance(node, ast.Subscript):
+            key = node.slice
+            if isinstance(key, ast.Constant) and isinstance(key.value, str) and key.value.startswith("_"):
+                raise ExpressionError(f"Key not allowed: {key.value}")
+        elif isinstance(node, ast.Call):
+            if isinstance(node.func, ast.Name) and node.func.id in SAFE_BUILTINS:
+                continue
+            if isinstance(node.func, ast.Attribute) and node.func.attr in METHOD_NAMES:
+                continue
+            raise ExpressionError(f"Call not allowed: {ast.unparse(node.func)}")
+
+def compile_tree(source: str) -> Callable[..., Any]:
+    tree = ast.parse(source.strip(), mode="eval")
+    check_tree(tree)
+    body = SafeTransformer().visit(tree).body
+
+    args = ast.arguments(
+        posonlyargs=[],
+        args=[ast.arg(arg=name) for name in ARGUMENTS],
+        kwonlyargs=[],
+        kw_defaults=[],
+        defaults=[],
+    )
+    fn = ast.fix_missing_locations(ast.Expression(body=ast.Lambda(args=args, body=body)))
+    scope = {"__builtins__": {}, "_get_attr": get_attr, "_call_method": call_method, **SAFE_BUILTINS}
+    return eval(compile(fn, "<expression>", "eval"), scope)
+
+class Expression:
+    # An expression parsed and checked once. Plain paths are resolved by direct
+    # lookups; everything else runs as a compiled lambda over ctx, data, func, vars.
+    def __init__(self, source: str):
+        self.source = source
+        self.path = parse_path(source)
+        self.root = source.strip().split(".", 1)[0].split("[", 1)[0]
+        self.fn: Optional[Callable[..., Any]] = None
+        self.error: Optional[Exception] = None
+
+        if self.path is None:
+            try:
+                self.fn = compile_tree(source)
+            except Exception as e:
+                self.error = e
+
+    def __call__(self, ctx: Any, data: Any = {}, func: Any = {}, vars: Any = {}) -> Any:
+        if self.path is not None:
+            value = (ctx, data, func, vars)[ARGUMENTS.index(self.root)]
+            for is_attr, key in self.path:
+                value = get_attr(value, key) if is_attr else get_item(value, key)
+            return value
+
+        if self.fn is None:
+            raise self.error
+        return self.fn(ctx, data, func, vars)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_expression(source: str) -> Expression:
+    return Expression(source)
+
+def evaluate(source: str, ctx: Any, data: Any = {}, func: Any = {}, vars: Any = {}) -> Any:
+    return compile_expression(source)(ctx, data, func, vars)
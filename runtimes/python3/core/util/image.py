@@ -0,0 +1,33 @@
+import base64
+import io
+from typing import Optional, Union
+from PIL import Image # type: ignore
+
+ImageData = Union[bytes, bytearray, memoryview]
+
+# Modes Image.reduce averages correctly; palette (P, PA), 1-bit and I;16 images are converted first
+REDUCE_MODES = {"L", "LA", "RGB", "RGBA", "CMYK", "YCbCr", "I", "F"}
+
+def decode_data_url(data_url: str) -> bytes:
+    # "data:image/jpeg;base64,...." or plain base64 (which never contains a comma)
+    encoded = data_url.split(",", 1)[-1]
+    return base64.b64decode(encoded)
+
+def decode_image(data: ImageData, size: Optional[int] = None) -> Image.Image:
+    # Decodes an encoded image to RGB. With size set, the image is decoded only as
+    # large as needed for a model whose preprocessing resizes the shorter side to size:
+    # JPEGs are scaled by libjpeg while decoding (draft), other formats are reduced
+    # by an integer factor right after. The shorter side never drops below size.
+    image = Image.open(io.BytesIO(data))
+
+    if size:
+        if image.format == "JPEG":
+            image.draft("RGB", (size, size))
+        else:
+            factor = min(image.size) // size
+            if factor >= 2:
+                if image.mode not in REDUCE_MODES:
+                    image = image.convert("RGB")
+                image = image.reduce(factor)
+
+    return image.convert("RGB")
@@ -0,0 +1,164 @@
+import asyncio
+import hashlib
+import json
+import logging
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Optional, Tuple, Union
+
+# Byte budget of the in-memory tier per cache, 0 disables caching
+INFERENCE_CACHE_BYTES = int(os.getenv("INFERENCE_CACHE_BYTES", str(64 * 1024 * 1024)))
+# When set, results are also kept in <dir>/<name>.sqlite and survive restarts
+INFERENCE_CACHE_DIR = os.getenv("INFERENCE_CACHE_DIR", "")
+# Seconds between stats reports of the caches in use, 0 disables them
+INFERENCE_CACHE_STATS_INTERVAL = float(os.getenv("INFERENCE_CACHE_STATS_INTERVAL", "60"))
+
+Part = Union[str, bytes, bytearray, memoryview]
+
+def cache_key(model: str, *parts: Part) -> str:
+    # Content address of an inference: model id plus the exact input bytes
+    digest = hashlib.sha256()
+    for part in (model, *parts):
+        data = part.encode("utf-8") if isinstance(part, str) else part
+        digest.update(len(data).to_bytes(8, "little"))
+        digest.update(data)
+    return digest.hexdigest()
+
+class InferenceCache:
+    # LRU of JSON-serializable inference results bounded by their encoded size,
+    # with an optional SQLite tier. Results are stored as JSON, never pickled.
+    def __init__(self, name: str, max_bytes: int = INFERENCE_CACHE_BYTES, directory: str = INFERENCE_CACHE_DIR):
+        self.name = name
+        self.max_bytes = max_bytes
+        self.path = os.path.join(directory, f"{name}.sqlite") if directory else ""
+        self.entries: "OrderedDict[str, Tuple[Any, int]]" = OrderedDict()
+        self.size = 0
+        self.hits = 0
+        self.disk_hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.lock = threading.Lock()
+        self.connection: Optional[sqlite3.Connection] = None
+        self.connection_pid = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.max_bytes > 0 or bool(self.path)
+
+    def db(self) -> Optional[sqlite3.Connection]:
+        if not self.path:
+            return None
+        # Connections are not carried across fork; each worker opens its own
+        if self.connection is None or self.connection_pid != os.getpid():
+            os.makedirs(os.path.dirname(self.path), exist_ok=True)
+            self.connection = sqlite3.connect(self.path, check_same_thread=False, isolation_level=None)
+            self.connection.execute("PRAGMA journal_mode=WAL")
+            self.connection.execute("CREATE TABLE IF NOT EXISTS results (key TEXT PRIMARY KEY, value BLOB NOT NULL)")
+            self.connection_pid = os.getpid()
+        return self.connection
+
+    def get(self, key: str) -> Tuple[bool, Any]:
+        with self.lock:
+            entry = self.entries.get(key)
+            if entry is not None:
+                self.entries.move_to_end(key)
+                self.hits += 1
+                return True, entry[0]
+
+            db = self.db()
+            row = db.execute("SELECT value FROM results WHERE key = ?", (key,)).fetchone() if db is not None else None
+            if row is None:
+                self.misses += 1
+                return False, None
+
+            value = json.loads(row[0])
+            self.remember(key, value, len(row[0]))
+            self.disk_hits += 1
+            return True, value
+
+    def put(self, key: str, value: Any) -> None:
+        encoded = json.dumps(value, separators=(",", ":")).encode("utf-8")
+        with self.lock:
+            self.remember(key, value, len(encoded))
+            db = self.db()
+            if db is not None:
+                db.execute("INSERT OR REPLACE INTO results (key, value) VALUES (?, ?)", (key, encoded))
+
+    def remember(self, key: str, value: Any, size: int) -> None:
+        if size > self.max_bytes:
+            return
+
+        previous = self.entries.pop(key, None)
+        if previous is not None:
+            self.size -= previous[1]
+        self.entries[key] = (value, size)
+        self.size += size
+
+        while self.size > self.max_bytes:
+            _, (_, evicted) = self.entries.popitem(last=False)
+            self.size -= evicted
+            self.evictions += 1
+
+    def get_or_compute(self, key: str, compute: Callable[[], Any]) -> Any:
+        if not self.enabled:
+            return compute()
+
+        found, value = self.get(key)
+        if found:
+            return value
+
+        value = compute()
+        self.put(key, value)
+        return value
+
+    def stats(self) -> Dict[str, Any]:
+        with self.lock:
+            lookups = self.hits + self.disk_hits + self.misses
+            return {
+                "name": self.name,
+                "entries": len(self.entries),
+                "bytes": self.size,
+                "max_bytes": self.max_bytes,
+                "hits": self.hits,
+                "disk_hits": self.disk_hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": (self.hits + self.disk_hits) / lookups if lookups else 0.0,
+            }
+
+    def close(self) -> None:
+        logging.info(f"Inference cache stats: {self.stats()}")
+        with self.lock:
+            if self.connection is not None and self.connection_pid == os.getpid():
+                self.connection.close()
+            self.connection = None
+
+caches: Dict[str, InferenceCache] = {}
+caches_lock = threading.Lock()
+
+def get_cache(name: str) -> InferenceCache:
+    with caches_lock:
+        cache = caches.get(name)
+        if cache is None:
+            cache = InferenceCache(name)
+            caches[name] = cache
+        return cache
+
+def cache_stats() -> Dict[str, Dict[str, Any]]:
+    return {name: cache.stats() for name, cache in list(caches.items())}
+
+def format_stats(stats: Dict[str, Any]) -> str:
+    return (
+        f"Inference cache {stats['name']}: {stats['entries']} entries, {stats['bytes']}/{stats['max_bytes']} bytes, "
+        f"{stats['hits']} hits, {stats['disk_hits']} disk hits, {stats['misses']} misses, "
+        f"{stats['evictions']} evictions, {stats['hit_rate']:.1%} hit rate"
+    )
+
+async def report_cache_stats(interval: float = INFERENCE_CACHE_STATS_INTERVAL) -> None:
+    # Runs with the server so the counters can be followed while it serves traffic
+    while True:
+        await asyncio.sleep(interval)
+        for stats in cache_stats().values():
+            print(format_stats(stats))
@@ -1,44 +1,156 @@
+import os
 import re
-from typing import Any, Dict
+from functools import lru_cache
+from typing import Any, Dict, List, Optional, Union
+from core.util.expression import Expression, compile_expression, get_field
 
 ParamsDictionary = Dict[str, Any]
 Context = Dict[str, Any]
 FunctionContext = Dict[str, Any]
 VarsContext = Dict[str, Any]
 
+PLACEHOLDER_REGEX = re.compile(r'\${(.*?)}')
+CACHE_SIZE = int(os.getenv("MAPPER_CACHE_SIZE", "4096"))
+# Longer strings (e.g. base64 payloads) are compiled per call instead of being kept in the cache
+CACHE_MAX_LENGTH = int(os.getenv("MAPPER_CACHE_MAX_LENGTH", "4096"))
+
+class Template:
+    # A config string split into literal parts and precompiled placeholders
+    def __init__(self, source: str):
+        self.source = source
+        self.parts: List[Union[str, Expression]] = []
+
+        tokens = PLACEHOLDER_REGEX.split(source)
+        for index, token in enumerate(tokens):
+            if index % 2 == 0:
+                if token != "":
+                    self.parts.append(token)
+            else:
+                self.parts.append(compile_expression(token))
+
+        self.static = all(isinstance(part, str) for part in self.parts)
+        self.js: Optional[Expression] = None
+        if self.static and source.startswith("js/"):
+            self.js = compile_expression(source.replace("js/", ""))
+
+    def substitute(self, ctx: Context, data: ParamsDictionary) -> str:
+        if self.static:
+            return self.source
+
+        rendered: List[str] = []
+        for part in self.parts:
+            if isinstance(part, str):
+                rendered.append(part)
+                continue
+
+            try:
+                value = data.get(part.source) or part(ctx, data)
+                rendered.append(str(value))
+            except Exception as e:
+                print("Mapper Error 1", e)
+                rendered.append(f"${{{part.source}}}")
+
+        return "".join(rendered)
+
+@lru_cache(maxsize=CACHE_SIZE)
+def compile_cached_template(source: str) -> Template:
+    return Template(source)
+
+def compile_template(source: str) -> Template:
+    if len(source) > CACHE_MAX_LENGTH:
+        return Template(source)
+    return compile_cached_template(source)
+
+def is_constant(str_data: str) -> bool:
+    return "${" not in str_data and not str_data.startswith("js/")
+
 class Mapper:
-    def replace_object_strings(self, obj: ParamsDictionary, ctx: Context, data: ParamsDictionary) -> None:
-        for key, value in obj.items():
+    def compile(self, str_data: str) -> Template:
+        return compile_template(str_data)
+
+    def map_object(self, obj: Any, ctx: Context, data: ParamsDictionary) -> Any:
+        # Returns a mapped copy of obj. Values without placeholders are returned
+        # as-is, so unchanged subtrees are shared with the source instead of copied.
+        if isinstance(obj, str):
+            if is_constant(obj):
+                return obj
+            return self.replace_string(obj, ctx, data)
+
+        if isinstance(obj, dict):
+            mapped_dict: Optional[ParamsDictionary] = None
+            for key, value in obj.items():
+                new_value = self.map_object(value, ctx, data)
+                if new_value is not value:
+                    if mapped_dict is None:
+                        mapped_dict = dict(obj)
+                    mapped_dict[key] = new_value
+            return obj if mapped_dict is None else mapped_dict
+
+        if isinstance(obj, list):
+            mapped_list: Optional[List[Any]] = None
+            for index, value in enumerate(obj):
+                new_value = self.map_object(value, ctx, data)
+                if new_value is not value:
+                    if mapped_list is None:
+                        mapped_list = list(obj)
+                    mapped_list[index] = new_value
+            return obj if mapped_list is None else mapped_list
+
+        return obj
+
+    def replace_object_strings(self, obj: Union[ParamsDictionary, List[Any]], ctx: Context, data: ParamsDictionary) -> None:
+        items = obj.items() if isinstance(obj, dict) else enumerate(obj)
+        for key, value in items:
             if isinstance(value, str):
                 obj[key] = self.replace_string(value, ctx, data)
-            elif isinstance(value, dict):
+            elif isinstance(value, (dict, list)):
                 self.replace_object_strings(value, ctx, data)
 
     def replace_string(self, str_data: str, ctx: Context, data: ParamsDictionary) -> str:
-        str_ = str_data
-        regex = re.compile(r'\${(.*?)}')
-        matches = regex.findall(str_)
-
-        if matches:
-            for match in matches:
-                try:
-                    key = match
-                    value = data.get(key) or self.run_js(key, ctx, data)
-                    str_ = str_.replace(f"${{{match}}}", str(value))
-                except Exception as e:
-                    print("Mapper Error 1", e)
-
-        result = self.js_mapper(str_, ctx, data)
+        template = self.compile(str_data)
+        str_ = template.substitute(ctx, data)
+
+        if template.js is not None:
+            result = self.run_expression(template.js, str_, ctx, data)
+        else:
+            result = self.js_mapper(str_, ctx, data)
         return str(result)
 
     def run_js(self, str_: str, ctx: Context, data: ParamsDictionary = {}, func: FunctionContext = {}, vars: VarsContext = {}) -> ParamsDictionary:
-        return eval(f"lambda ctx, data, func, vars: {str_}")(ctx, data, func, vars)
+        return compile_expression(str_)(ctx, data, func, vars)
 
-    def js_mapper(self, str_: str, ctx: Context, data: ParamsDictionary) -> ParamsDictionary | str:
+    def run_expression(self, expression: Expression, str_: str, ctx: Context, data: ParamsDictionary) -> Any:
         try:
-            if isinstance(str_, str) and str_.startswith("js/"):
-                fn = str_.replace("js/", "")
-                return self.run_js(fn, ctx, data, ctx.get('func', {}), ctx.get('vars', {}))
+            return expression(ctx, data, get_field(ctx, 'func') or {}, get_field(ctx, 'vars') or {})
         except Exception as error:
             print("Mapper Error 2", error)
         return str_
+
+    def js_mapper(self, str_: str, ctx: Context, data: ParamsDictionary) -> ParamsDictionary | str:
+        if isinstance(str_, str) and str_.startswith("js/"):
+            return self.run_expression(compile_expression(str_.replace("js/", "")), str_, ctx, data)
+        return str_
+
+class TemplateMapper(Mapper):
+    # Maps with templates compiled up front for one config (e.g. a registered session
+    # config), so its strings are not recompiled when long or evicted from the cache
+    def __init__(self, templates: Dict[str, Template]):
+        self.templates = templates
+
+    def compile(self, str_data: str) -> Template:
+        template = self.templates.get(str_data)
+        if template is None:
+            return compile_template(str_data)
+        return template
+
+def collect_templates(obj: Any, templates: Dict[str, Template]) -> Dict[str, Template]:
+    if isinstance(obj, str):
+        if not is_constant(obj) and obj not in templates:
+            templates[obj] = Template(obj)
+    elif isinstance(obj, dict):
+        for value in obj.values():
+            collect_templates(value, templates)
+    elif isinstance(obj, list):
+        for value in obj:
+            collect_templates(value, templates)
+    return templates
@@ -0,0 +1,209 @@
+import gc
+import logging
+import os
+import threading
+import time
+from collections import OrderedDict
+from contextlib import contextmanager
+from typing import Any, Callable, Dict, Iterator, List, Optional, Set
+
+# Total size of loaded models before least-recently-used ones are unloaded, 0 means unlimited
+MODEL_MEMORY_BUDGET_MB = int(os.getenv("MODEL_MEMORY_BUDGET_MB", "0"))
+
+def tensor_bytes(value: Any, seen: Set[Any]) -> int:
+    # Packed params of quantized layers are stored as tuples of tensors
+    if isinstance(value, (tuple, list)):
+        return sum(tensor_bytes(item, seen) for item in value)
+    if not (hasattr(value, "numel") and hasattr(value, "element_size")):
+        return 0
+
+    # Tied weights are counted once
+    data_ptr = getattr(value, "data_ptr", None)
+    key = data_ptr() if callable(data_ptr) else id(value)
+    if key in seen:
+        return 0
+    seen.add(key)
+    return value.numel() * value.element_size()
+
+def estimate_size(obj: Any) -> int:
+    # Bytes held by the tensors of a model (or of every model in a tuple/list/dict).
+    # state_dict() also holds the int8 packed weights of dynamically quantized
+    # layers, which parameters() and buffers() leave out.
+    if isinstance(obj, (tuple, list)):
+        return sum(estimate_size(item) for item in obj)
+    if isinstance(obj, dict):
+        return sum(estimate_size(item) for item in obj.values())
+
+    seen: Set[Any] = set()
+    state_dict = getattr(obj, "state_dict", None)
+    if callable(state_dict):
+        try:
+            return sum(tensor_bytes(value, seen) for value in state_dict().values())
+        except Exception:
+            pass
+
+    size = 0
+    for attr in ("parameters", "buffers"):
+        tensors = getattr(obj, attr, None)
+        if callable(tensors):
+            try:
+                size += sum(tensor_bytes(tensor, seen) for tensor in tensors())
+            except Exception:
+                pass
+    return size
+
+def share_memory(model: Any) -> None:
+    # Moves model tensors to shared memory so forked workers map the same pages
+    if isinstance(model, (tuple, list)):
+        for item in model:
+            share_memory(item)
+        return
+    if isinstance(model, dict):
+        for item in model.values():
+            share_memory(item)
+        return
+
+    share = getattr(model, "share_memory", None)
+    if callable(share):
+        try:
+            share()
+        except Exception as e:
+            logging.warning(f"Could not move model to shared memory: {e}")
+
+class LoadedModel:
+    def __init__(self, model: Any, size: int):
+        self.model = model
+        self.size = size
+        self.leases = 0
+
+class ModelRegistry:
+    # Models are registered by id with a loader and only loaded when first used.
+    # Nodes that register the same id share one instance. When the loaded models
+    # exceed the budget, the least recently used ones that are not in use are unloaded.
+    def __init__(self, budget: int = MODEL_MEMORY_BUDGET_MB * 1024 * 1024):
+        self.budget = budget
+        self.loaders: Dict[str, Callable[[], Any]] = {}
+        self.sizes: Dict[str, Optional[int]] = {}
+        self.loaded: "OrderedDict[str, LoadedModel]" = OrderedDict()
+        self.loading: Dict[str, threading.Lock] = {}
+        self.lock = threading.Lock()
+
+    def register(self, id: str, loader: Callable[[], Any], size: Optional[int] = None) -> None:
+        with self.lock:
+            # First registration wins so every node sharing the id gets the same instance
+            if id not in self.loaders:
+                self.loaders[id] = loader
+                self.sizes[id] = size
+
+    def __contains__(self, id: str) -> bool:
+        return id in self.loaders
+
+    def is_loaded(self, id: str) -> bool:
+        return id in self.loaded
+
+    def total_size(self) -> int:
+        return sum(entry.size for entry in self.loaded.values())
+
+    @contextmanager
+    def use(self, id: str) -> Iterator[Any]:
+        # The model is not unloaded while a lease is held
+        entry = self.acquire(id)
+        try:
+            yield entry.model
+        finally:
+            with self.lock:
+                entry.leases -= 1
+            self.enforce_budget()
+
+    def get(self, id: str) -> Any:
+        # Loads the model without holding a lease
+        with self.use(id) as model:
+            return model
+
+    def acquire(self, id: str) -> LoadedModel:
+        with self.lock:
+            entry = self.loaded.get(id)
+            if entry is not None:
+                entry.leases += 1
+                self.loaded.move_to_end(id)
+                return entry
+            if id not in self.loaders:
+                raise KeyError(f"Unknown model: {id}")
+            loading = self.loading.setdefault(id, threading.Lock())
+
+        # Loads run outside the registry lock; concurrent callers wait on the same load
+        with loading:
+            with self.lock:
+                entry = self.loaded.get(id)
+                if entry is not None:
+                    entry.leases += 1
+                    self.loaded.move_to_end(id)
+                    return entry
+
+            start = time.time()
+            model = self.loaders[id]()
+            size = self.sizes[id]
+            entry = LoadedModel(model, size if size is not None else estimate_size(model))
+            logging.info(f"Loaded model {id} ({entry.size / 1024 / 1024:.1f} MB) in {(time.time() - start) * 1000:.2f}ms")
+
+            with self.lock:
+                entry.leases = 1
+                self.loaded[id] = entry
+
+        self.enforce_budget()
+        return entry
+
+    def enforce_budget(self) -> List[str]:
+        if self.budget <= 0:
+            return []
+
+        unloaded: List[str] = []
+        with self.lock:
+            total = self.total_size()
+            for id in list(self.loaded):
+                if total <= self.budget:
+                    break
+                entry = self.loaded[id]
+                if entry.leases > 0:
+                    continue
+                del self.loaded[id]
+                total -= entry.size
+                unloaded.append(id)
+
+        if unloaded:
+            logging.info(f"Unloaded models over the memory budget: {', '.join(unloaded)}")
+            gc.collect()
+        return unloaded
+
+    def unload(self, id: str) -> bool:
+        with self.lock:
+            entry = self.loaded.get(id)
+            if entry is None or entry.leases > 0:
+                return False
+            del self.loaded[id]
+        gc.collect()
+        return True
+
+    def preload(self, ids: List[str], share: bool = False) -> None:
+        for id in ids:
+            model = self.get(id)
+            if share:
+                share_memory(model)
+
+models = ModelRegistry()
+
+def get_models() -> ModelRegistry:
+    return models
+
+def preload_models(ids: Optional[List[str]] = None, share: bool = False) -> List[str]:
+    # PRELOAD_MODELS="clip:ViT-B/32:fp32" loads the listed models, "*" every model registered
+    # by the loaded nodes. Nodes register their models when built, so preload nodes first.
+    if ids is None:
+        value = os.getenv("PRELOAD_MODELS", "").strip()
+        if value == "*":
+            ids = list(models.loaders.keys())
+        else:
+            ids = [id.strip() for id in value.split(",") if id.strip()]
+
+    models.preload(ids, share)
+    return ids
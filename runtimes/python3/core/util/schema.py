@@ -0,0 +1,77 @@
+import hashlib
+import json
+import os
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+from jsonschema import Draft7Validator, ValidationError # type: ignore
+
+CACHE_SIZE = int(os.getenv("SCHEMA_CACHE_SIZE", "256"))
+# Keywords that describe a schema without constraining the instance
+ANNOTATION_KEYWORDS = {"$schema", "$id", "$comment", "title", "description", "examples", "default"}
+
+def is_empty_schema(schema: Any) -> bool:
+    if schema is None or schema is True:
+        return True
+    return isinstance(schema, dict) and all(key in ANNOTATION_KEYWORDS for key in schema)
+
+def schema_key(schema: Any) -> str:
+    content = json.dumps(schema, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+class CompiledSchema:
+    def __init__(self, schema: Any):
+        self.schema = schema
+        self.empty = is_empty_schema(schema)
+        self.validator: Optional[Draft7Validator] = None if self.empty else Draft7Validator(schema)
+
+    def validate(self, obj: Any) -> None:
+        if self.validator is None or self.validator.is_valid(obj):
+            return
+
+        errors: List[str] = []
+        for error in sorted(self.validator.iter_errors(obj), key=str):
+            errors.append(f"{error.path} {error.message}")
+
+        raise ValidationError(", ".join(errors))
+
+class SchemaCache:
+    # Compiled validators keyed by schema content, plus an identity map so the
+    # schema dicts held by nodes are only hashed the first time they are seen.
+    def __init__(self, size: int = CACHE_SIZE):
+        self.size = size
+        self.by_content: "OrderedDict[str, CompiledSchema]" = OrderedDict()
+        self.by_identity: Dict[int, Tuple[Any, CompiledSchema]] = {}
+        self.lock = threading.Lock()
+
+    def get(self, schema: Any) -> CompiledSchema:
+        entry = self.by_identity.get(id(schema))
+        if entry is not None and entry[0] is schema:
+            return entry[1]
+
+        key = schema_key(schema)
+        with self.lock:
+            compiled = self.by_content.get(key)
+            if compiled is None:
+                compiled = CompiledSchema(schema)
+                self.by_content[key] = compiled
+                if len(self.by_content) > self.size:
+                    self.by_content.popitem(last=False)
+            else:
+                self.by_content.move_to_end(key)
+
+            if len(self.by_identity) >= self.size:
+                self.by_identity.clear()
+            self.by_identity[id(schema)] = (schema, compiled)
+
+        return compiled
+
+    def clear(self) -> None:
+        with self.lock:
+            self.by_content.clear()
+            self.by_identity.clear()
+
+schemas = SchemaCache()
+
+def compile_schema(schema: Any) -> CompiledSchema:
+    return schemas.get(schema)
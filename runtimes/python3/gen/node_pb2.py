@@ -24,21 +24,49 @@ _sym_db = _symbol_database.Default()
 
 
 
-DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nnode.proto\x12\x17nanoservice.workflow.v1\"L\n\x0bNodeRequest\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x0f\n\x07Message\x18\x02 \x01(\t\x12\x10\n\x08\x45ncoding\x18\x03 \x01(\t\x12\x0c\n\x04Type\x18\x04 \x01(\t\"?\n\x0cNodeResponse\x12\x0f\n\x07Message\x18\x01 \x01(\t\x12\x10\n\x08\x45ncoding\x18\x02 \x01(\t\x12\x0c\n\x04Type\x18\x03 \x01(\t*)\n\x0fMessageEncoding\x12\n\n\x06\x42\x41SE64\x10\x00\x12\n\n\x06STRING\x10\x01*@\n\x0bMessageType\x12\x08\n\x04TEXT\x10\x00\x12\x08\n\x04JSON\x10\x01\x12\x07\n\x03XML\x10\x02\x12\x08\n\x04HTML\x10\x03\x12\n\n\x06\x42INARY\x10\x04\x32k\n\x0bNodeService\x12\\\n\x0b\x45xecuteNode\x12$.nanoservice.workflow.v1.NodeRequest\x1a%.nanoservice.workflow.v1.NodeResponse\"\x00\x62\x06proto3')
+DESCRIPTOR = _descriptor_pool.Default().AddSerializedFile(b'\n\nnode.proto\x12\x17nanoservice.workflow.v1\"L\n\x0bNodeRequest\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x0f\n\x07Message\x18\x02 \x01(\t\x12\x10\n\x08\x45ncoding\x18\x03 \x01(\t\x12\x0c\n\x04Type\x18\x04 \x01(\t\"?\n\x0cNodeResponse\x12\x0f\n\x07Message\x18\x01 \x01(\t\x12\x10\n\x08\x45ncoding\x18\x02 \x01(\t\x12\x0c\n\x04Type\x18\x03 \x01(\t\"O\n\x0fSharedMemoryRef\x12\x0c\n\x04Kind\x18\x01 \x01(\t\x12\x0e\n\x06Handle\x18\x02 \x01(\t\x12\x0e\n\x06Offset\x18\x03 \x01(\x04\x12\x0e\n\x06Length\x18\x04 \x01(\x04\"\xbc\x01\n\x11NodeBinaryRequest\x12\x0f\n\x07Version\x18\x01 \x01(\r\x12\x0c\n\x04Name\x18\x02 \x01(\t\x12\x0f\n\x07Payload\x18\x03 \x01(\x0c\x12\r\n\x05\x43odec\x18\x04 \x01(\t\x12\x0e\n\x06\x41\x63\x63\x65pt\x18\x05 \x03(\t\x12\x38\n\x06Shared\x18\x06 \x01(\x0b\x32(.nanoservice.workflow.v1.SharedMemoryRef\x12\x1e\n\x16SharedResponseMinBytes\x18\x07 \x01(\x04\"\xa5\x01\n\x12NodeBinaryResponse\x12\x0f\n\x07Version\x18\x01 \x01(\r\x12\x0f\n\x07Payload\x18\x02 \x01(\x0c\x12\r\n\x05\x43odec\x18\x03 \x01(\t\x12\x13\n\x0b\x43ontentType\x18\x04 \x01(\t\x12\x0f\n\x07Success\x18\x05 \x01(\x08\x12\x38\n\x06Shared\x18\x06 \x01(\x0b\x32(.nanoservice.workflow.v1.SharedMemoryRef\"\x80\x01\n\x13NodeAttachmentChunk\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x0c\n\x04\x44\x61ta\x18\x02 \x01(\x0c\x12\x13\n\x0b\x43ontentType\x18\x03 \x01(\t\x12\x38\n\x06Shared\x18\x04 \x01(\x0b\x32(.nanoservice.workflow.v1.SharedMemoryRef\"\x9c\x01\n\x0fNodeUploadChunk\x12=\n\x07Request\x18\x01 \x01(\x0b\x32*.nanoservice.workflow.v1.NodeBinaryRequestH\x00\x12\x42\n\nAttachment\x18\x02 \x01(\x0b\x32,.nanoservice.workflow.v1.NodeAttachmentChunkH\x00\x42\x06\n\x04Part\"q\n\tNodeChunk\x12\x10\n\x08Sequence\x18\x01 \x01(\r\x12\x0f\n\x07Payload\x18\x02 \x01(\x0c\x12\r\n\x05\x43odec\x18\x03 \x01(\t\x12\x13\n\x0b\x43ontentType\x18\x04 \x01(\t\x12\x0f\n\x07Success\x18\x05 \x01(\x08\x12\x0c\n\x04Last\x18\x06 \x01(\x08\"e\n\x10NodeBatchRequest\x12<\n\x08Requests\x18\x01 \x03(\x0b\x32*.nanoservice.workflow.v1.NodeBinaryRequest\x12\x13\n\x0b\x43oncurrency\x18\x02 \x01(\r\"]\n\rNodeBatchItem\x12\r\n\x05Index\x18\x01 \x01(\r\x12=\n\x08Response\x18\x02 \x01(\x0b\x32+.nanoservice.workflow.v1.NodeBinaryResponse\"J\n\x11NodeBatchResponse\x12\x35\n\x05Items\x18\x01 \x03(\x0b\x32&.nanoservice.workflow.v1.NodeBatchItem\"B\n\x13NodeSessionRegister\x12\x0c\n\x04Name\x18\x01 \x01(\t\x12\x0e\n\x06\x43onfig\x18\x02 \x01(\x0c\x12\r\n\x05\x43odec\x18\x03 \x01(\t\"b\n\x11NodeSessionInvoke\x12\x10\n\x08\x43onfigId\x18\x01 \x01(\t\x12;\n\x07Request\x18\x02 \x01(\x0b\x32*.nanoservice.workflow.v1.NodeBinaryRequest\"&\n\x12NodeSessionRelease\x12\x10\n\x08\x43onfigId\x18\x01 \x01(\t\"\xea\x01\n\x12NodeSessionRequest\x12\n\n\x02Id\x18\x01 \x01(\x04\x12@\n\x08Register\x18\x02 \x01(\x0b\x32,.nanoservice.workflow.v1.NodeSessionRegisterH\x00\x12<\n\x06Invoke\x18\x03 \x01(\x0b\x32*.nanoservice.workflow.v1.NodeSessionInvokeH\x00\x12>\n\x07Release\x18\x04 \x01(\x0b\x32+.nanoservice.workflow.v1.NodeSessionReleaseH\x00\x42\x08\n\x06\x41\x63tion\"r\n\x13NodeSessionResponse\x12\n\n\x02Id\x18\x01 \x01(\x04\x12\x10\n\x08\x43onfigId\x18\x02 \x01(\t\x12=\n\x08Response\x18\x03 \x01(\x0b\x32+.nanoservice.workflow.v1.NodeBinaryResponse*)\n\x0fMessageEncoding\x12\n\n\x06\x42\x41SE64\x10\x00\x12\n\n\x06STRING\x10\x01*@\n\x0bMessageType\x12\x08\n\x04TEXT\x10\x00\x12\x08\n\x04JSON\x10\x01\x12\x07\n\x03XML\x10\x02\x12\x08\n\x04HTML\x10\x03\x12\n\n\x06\x42INARY\x10\x04\x32\x81\x06\n\x0bNodeService\x12\\\n\x0b\x45xecuteNode\x12$.nanoservice.workflow.v1.NodeRequest\x1a%.nanoservice.workflow.v1.NodeResponse\"\x00\x12n\n\x11\x45xecuteNodeBinary\x12*.nanoservice.workflow.v1.NodeBinaryRequest\x1a+.nanoservice.workflow.v1.NodeBinaryResponse\"\x00\x12g\n\x11\x45xecuteNodeStream\x12*.nanoservice.workflow.v1.NodeBinaryRequest\x1a\".nanoservice.workflow.v1.NodeChunk\"\x00\x30\x01\x12n\n\x11\x45xecuteNodeUpload\x12(.nanoservice.workflow.v1.NodeUploadChunk\x1a+.nanoservice.workflow.v1.NodeBinaryResponse\"\x00(\x01\x12g\n\x0c\x45xecuteBatch\x12).nanoservice.workflow.v1.NodeBatchRequest\x1a*.nanoservice.workflow.v1.NodeBatchResponse\"\x00\x12k\n\x12\x45xecuteBatchStream\x12).nanoservice.workflow.v1.NodeBatchRequest\x1a&.nanoservice.workflow.v1.NodeBatchItem\"\x00\x30\x01\x12u\n\x12\x45xecuteNodeSession\x12+.nanoservice.workflow.v1.NodeSessionRequest\x1a,.nanoservice.workflow.v1.NodeSessionResponse\"\x00(\x01\x30\x01\x62\x06proto3')
 
 _globals = globals()
 _builder.BuildMessageAndEnumDescriptors(DESCRIPTOR, _globals)
 _builder.BuildTopDescriptorsAndMessages(DESCRIPTOR, 'node_pb2', _globals)
 if not _descriptor._USE_C_DESCRIPTORS:
   DESCRIPTOR._loaded_options = None
-  _globals['_MESSAGEENCODING']._serialized_start=182
-  _globals['_MESSAGEENCODING']._serialized_end=223
-  _globals['_MESSAGETYPE']._serialized_start=225
-  _globals['_MESSAGETYPE']._serialized_end=289
+  _globals['_MESSAGEENCODING']._serialized_start=1862
+  _globals['_MESSAGEENCODING']._serialized_end=1903
+  _globals['_MESSAGETYPE']._serialized_start=1905
+  _globals['_MESSAGETYPE']._serialized_end=1969
   _globals['_NODEREQUEST']._serialized_start=39
   _globals['_NODEREQUEST']._serialized_end=115
   _globals['_NODERESPONSE']._serialized_start=117
   _globals['_NODERESPONSE']._serialized_end=180
-  _globals['_NODESERVICE']._serialized_start=291
-  _globals['_NODESERVICE']._serialized_end=398
+  _globals['_SHAREDMEMORYREF']._serialized_start=182
+  _globals['_SHAREDMEMORYREF']._serialized_end=261
+  _globals['_NODEBINARYREQUEST']._serialized_start=264
+  _globals['_NODEBINARYREQUEST']._serialized_end=452
+  _globals['_NODEBINARYRESPONSE']._serialized_start=455
+  _globals['_NODEBINARYRESPONSE']._serialized_end=620
+  _globals['_NODEATTACHMENTCHUNK']._serialized_start=623
+  _globals['_NODEATTACHMENTCHUNK']._serialized_end=751
+  _globals['_NODEUPLOADCHUNK']._serialized_start=754
+  _globals['_NODEUPLOADCHUNK']._serialized_end=910
+  _globals['_NODECHUNK']._serialized_start=912
+  _globals['_NODECHUNK']._serialized_end=1025
+  _globals['_NODEBATCHREQUEST']._serialized_start=1027
+  _globals['_NODEBATCHREQUEST']._serialized_end=1128
+  _globals['_NODEBATCHITEM']._serialized_start=1130
+  _globals['_NODEBATCHITEM']._serialized_end=1223
+  _globals['_NODEBATCHRESPONSE']._serialized_start=1225
+  _globals['_NODEBATCHRESPONSE']._serialized_end=1299
+  _globals['_NODESESSIONREGISTER']._serialized_start=1301
+  _globals['_NODESESSIONREGISTER']._serialized_end=1367
+  _globals['_NODESESSIONINVOKE']._serialized_start=1369
+  _globals['_NODESESSIONINVOKE']._serialized_end=1467
+  _globals['_NODESESSIONRELEASE']._serialized_start=1469
+  _globals['_NODESESSIONRELEASE']._serialized_end=1507
+  _globals['_NODESESSIONREQUEST']._serialized_start=1510
+  _globals['_NODESESSIONREQUEST']._serialized_end=1744
+  _globals['_NODESESSIONRESPONSE']._serialized_start=1746
+  _globals['_NODESESSIONRESPONSE']._serialized_end=1860
+  _globals['_NODESERVICE']._serialized_start=1972
+  _globals['_NODESERVICE']._serialized_end=2741
 # @@protoc_insertion_point(module_scope)
@@ -39,6 +39,36 @@ class NodeServiceStub(object):
                 request_serializer=node__pb2.NodeRequest.SerializeToString,
                 response_deserializer=node__pb2.NodeResponse.FromString,
                 _registered_method=True)
+        self.ExecuteNodeBinary = channel.unary_unary(
+                '/nanoservice.workflow.v1.NodeService/ExecuteNodeBinary',
+                request_serializer=node__pb2.NodeBinaryRequest.SerializeToString,
+                response_deserializer=node__pb2.NodeBinaryResponse.FromString,
+                _registered_method=True)
+        self.ExecuteNodeStream = channel.unary_stream(
+                '/nanoservice.workflow.v1.NodeService/ExecuteNodeStream',
+                request_serializer=node__pb2.NodeBinaryRequest.SerializeToString,
+                response_deserializer=node__pb2.NodeChunk.FromString,
+                _registered_method=True)
+        self.ExecuteNodeUpload = channel.stream_unary(
+                '/nanoservice.workflow.v1.NodeService/ExecuteNodeUpload',
+                request_serializer=node__pb2.NodeUploadChunk.SerializeToString,
+                response_deserializer=node__pb2.NodeBinaryResponse.FromString,
+                _registered_method=True)
+        self.ExecuteBatch = channel.unary_unary(
+                '/nanoservice.workflow.v1.NodeService/ExecuteBatch',
+                request_serializer=node__pb2.NodeBatchRequest.SerializeToString,
+                response_deserializer=node__pb2.NodeBatchResponse.FromString,
+                _registered_method=True)
+        self.ExecuteBatchStream = channel.unary_stream(
+                '/nanoservice.workflow.v1.NodeService/ExecuteBatchStream',
+                request_serializer=node__pb2.NodeBatchRequest.SerializeToString,
+                response_deserializer=node__pb2.NodeBatchItem.FromString,
+                _registered_method=True)
+        self.ExecuteNodeSession = channel.stream_stream(
+                '/nanoservice.workflow.v1.NodeService/ExecuteNodeSession',
+                request_serializer=node__pb2.NodeSessionRequest.SerializeToString,
+                response_deserializer=node__pb2.NodeSessionResponse.FromString,
+                _registered_method=True)
 
 
 class NodeServiceServicer(object):
@@ -50,6 +80,42 @@ class NodeServiceServicer(object):
         context.set_details('Method not implemented!')
         raise NotImplementedError('Method not implemented!')
 
+    def ExecuteNodeBinary(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ExecuteNodeStream(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ExecuteNodeUpload(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ExecuteBatch(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ExecuteBatchStream(self, request, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
+    def ExecuteNodeSession(self, request_iterator, context):
+        """Missing associated documentation comment in .proto file."""
+        context.set_code(grpc.StatusCode.UNIMPLEMENTED)
+        context.set_details('Method not implemented!')
+        raise NotImplementedError('Method not implemented!')
+
 
 def add_NodeServiceServicer_to_server(servicer, server):
     rpc_method_handlers = {
@@ -58,6 +124,36 @@ def add_NodeServiceServicer_to_server(servicer, server):
                     request_deserializer=node__pb2.NodeRequest.FromString,
                     response_serializer=node__pb2.NodeResponse.SerializeToString,
             ),
+            'ExecuteNodeBinary': grpc.unary_unary_rpc_method_handler(
+                    servicer.ExecuteNodeBinary,
+                    request_deserializer=node__pb2.NodeBinaryRequest.FromString,
+                    response_serializer=node__pb2.NodeBinaryResponse.SerializeToString,
+            ),
+            'ExecuteNodeStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.ExecuteNodeStream,
+                    request_deserializer=node__pb2.NodeBinaryRequest.FromString,
+                    response_serializer=node__pb2.NodeChunk.SerializeToString,
+            ),
+            'ExecuteNodeUpload': grpc.stream_unary_rpc_method_handler(
+                    servicer.ExecuteNodeUpload,
+                    request_deserializer=node__pb2.NodeUploadChunk.FromString,
+                    response_serializer=node__pb2.NodeBinaryResponse.SerializeToString,
+            ),
+            'ExecuteBatch': grpc.unary_unary_rpc_method_handler(
+                    servicer.ExecuteBatch,
+                    request_deserializer=node__pb2.NodeBatchRequest.FromString,
+                    response_serializer=node__pb2.NodeBatchResponse.SerializeToString,
+            ),
+            'ExecuteBatchStream': grpc.unary_stream_rpc_method_handler(
+                    servicer.ExecuteBatchStream,
+                    request_deserializer=node__pb2.NodeBatchRequest.FromString,
+                    response_serializer=node__pb2.NodeBatchItem.SerializeToString,
+            ),
+            'ExecuteNodeSession': grpc.stream_stream_rpc_method_handler(
+                    servicer.ExecuteNodeSession,
+                    request_deserializer=node__pb2.NodeSessionRequest.FromString,
+                    response_serializer=node__pb2.NodeSessionResponse.SerializeToString,
+            ),
     }
     generic_handler = grpc.method_handlers_generic_handler(
             'nanoservice.workflow.v1.NodeService', rpc_method_handlers)
@@ -95,3 +191,165 @@ class NodeService(object):
             timeout,
             metadata,
             _registered_method=True)
+
+    @staticmethod
+    def ExecuteNodeBinary(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nanoservice.workflow.v1.NodeService/ExecuteNodeBinary',
+            node__pb2.NodeBinaryRequest.SerializeToString,
+            node__pb2.NodeBinaryResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ExecuteNodeStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/nanoservice.workflow.v1.NodeService/ExecuteNodeStream',
+            node__pb2.NodeBinaryRequest.SerializeToString,
+            node__pb2.NodeChunk.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ExecuteNodeUpload(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_unary(
+            request_iterator,
+            target,
+            '/nanoservice.workflow.v1.NodeService/ExecuteNodeUpload',
+            node__pb2.NodeUploadChunk.SerializeToString,
+            node__pb2.NodeBinaryResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ExecuteBatch(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_unary(
+            request,
+            target,
+            '/nanoservice.workflow.v1.NodeService/ExecuteBatch',
+            node__pb2.NodeBatchRequest.SerializeToString,
+            node__pb2.NodeBatchResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ExecuteBatchStream(request,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.unary_stream(
+            request,
+            target,
+            '/nanoservice.workflow.v1.NodeService/ExecuteBatchStream',
+            node__pb2.NodeBatchRequest.SerializeToString,
+            node__pb2.NodeBatchItem.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
+
+    @staticmethod
+    def ExecuteNodeSession(request_iterator,
+            target,
+            options=(),
+            channel_credentials=None,
+            call_credentials=None,
+            insecure=False,
+            compression=None,
+            wait_for_ready=None,
+            timeout=None,
+            metadata=None):
+        return grpc.experimental.stream_stream(
+            request_iterator,
+            target,
+            '/nanoservice.workflow.v1.NodeService/ExecuteNodeSession',
+            node__pb2.NodeSessionRequest.SerializeToString,
+            node__pb2.NodeSessionResponse.FromString,
+            options,
+            channel_credentials,
+            insecure,
+            call_credentials,
+            compression,
+            wait_for_ready,
+            timeout,
+            metadata,
+            _registered_method=True)
@@ -3,8 +3,8 @@ from core.types.context import Context
 from core.types.nanoservice_response import NanoServiceResponse
 from core.types.global_error import GlobalError
 from typing import Any, Dict
-import aiohttp # type: ignore
 import traceback
+from util.http_session import HttpSessionPool
 
 class ApiCall(NanoService):
     def __init__(self):
@@ -35,6 +35,10 @@ class ApiCall(NanoService):
             "required": ["url", "method"],
         }
         self.output_schema = {}
+        self.session_pool = HttpSessionPool()
+
+    async def shutdown(self) -> None:
+        await self.session_pool.close()
 
     async def handle(self, ctx: Context, inputs: Dict[str, Any]) -> NanoServiceResponse:
 
@@ -50,29 +54,29 @@ class ApiCall(NanoService):
                 if ctx.response is not None:
                     body = ctx.response.get('data', {})
 
-            async with aiohttp.ClientSession() as session:
-                if method == "GET" or method == "DELETE":
-                    async with session.get(url, headers=headers) as resp:
-                        if responseType == "application/json":
-                            if resp.status != 200:
-                                throw_error = await resp.text()
-                                raise Exception(throw_error)
-                            
-                            result = await resp.json()
-                        else:
-                            result = await resp.text()
-                        response.setSuccess(result)
-                else:
-                    async with session.request(method, url, headers=headers, json=body) as resp:
-                        if responseType == "application/json":
-                            if resp.status != 200:
-                                throw_error = await resp.text()
-                                raise Exception(throw_error)
-                            
-                            result = await resp.json()
-                        else:
-                            result = await resp.text()
-                        response.setSuccess(result)
+            session = await self.session_pool.get()
+            if method == "GET" or method == "DELETE":
+                async with session.get(url, headers=headers) as resp:
+                    if responseType == "application/json":
+                        if resp.status != 200:
+                            throw_error = await resp.text()
+                            raise Exception(throw_error)
+                        
+                        result = await resp.json()
+                    else:
+                        result = await resp.text()
+                    response.setSuccess(result)
+            else:
+                async with session.request(method, url, headers=headers, json=body) as resp:
+                    if responseType == "application/json":
+                        if resp.status != 200:
+                            throw_error = await resp.text()
+                            raise Exception(throw_error)
+                        
+                        result = await resp.json()
+                    else:
+                        result = await resp.text()
+                    response.setSuccess(result)
         except Exception as error:
             err = GlobalError(error)
             err.setCode(500)
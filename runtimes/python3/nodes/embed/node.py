@@ -2,17 +2,68 @@ from core.nanoservice import NanoService
 from core.types.context import Context
 from core.types.nanoservice_response import NanoServiceResponse
 from core.types.global_error import GlobalError
-from typing import Any, Dict
+from core.executor import THREAD
+from core.types.attachment import Attachment
+from core.util.batcher import MicroBatcher
+from core.util.inference_cache import cache_key, get_cache
+from core.util.cpu_inference import INT8, compile_enabled, compile_module, configure_threads, cpu_mode, quantize, warm_up
+from core.util.model_registry import get_models
+from core.util.image import decode_data_url, decode_image
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple, Union
+import os
 import traceback
 
 import torch # type: ignore
 import clip # type: ignore
 from PIL import Image # type: ignore
-import base64
-import io
+
+# Concurrent requests are encoded together: up to CLIP_BATCH_SIZE items, waiting
+# at most CLIP_BATCH_WAIT_MS after the first one
+CLIP_BATCH_SIZE = int(os.getenv("CLIP_BATCH_SIZE", "32"))
+CLIP_BATCH_WAIT_MS = float(os.getenv("CLIP_BATCH_WAIT_MS", "5"))
+CLIP_MODEL = "ViT-B/32"
+# Input resolution of ViT-B/32; images are decoded no larger than needed for it
+CLIP_IMAGE_SIZE = 224
+
+def tokenize(text: str) -> Any:
+    # Raises for texts longer than CLIP's context, so only that caller fails
+    return clip.tokenize([text])[0]
+
+def encode_tokens(model: Any, device: str, tokens: List[Any]) -> List[List[float]]:
+    token_batch = torch.stack(tokens).to(device)
+    with torch.no_grad():
+        return model.encode_text(token_batch).cpu().tolist()
+
+def encode_texts(model: Any, device: str, texts: List[str]) -> List[List[float]]:
+    return encode_tokens(model, device, [tokenize(text) for text in texts])
+
+def encode_images(model: Any, device: str, tensors: List[Any]) -> List[List[float]]:
+    tensor_images = torch.stack(tensors).to(device)
+    with torch.no_grad():
+        return model.encode_image(tensor_images).cpu().tolist()
+
+def load_clip(device: str, mode: str) -> Tuple[Any, Any]:
+    model, preprocess = clip.load(CLIP_MODEL, device=device)
+    model.eval()
+
+    # CLIP_CPU_MODE=int8 and CLIP_COMPILE=1 opt into the CPU inference path
+    if device == "cpu":
+        configure_threads()
+        if mode == INT8:
+            model = quantize(model)
+        if compile_enabled("CLIP"):
+            model.visual = compile_module(model.visual)
+            model.transformer = compile_module(model.transformer)
+
+    warm_up("embedding-clip", lambda: (
+        encode_texts(model, device, ["warm up"]),
+        encode_images(model, device, [preprocess(Image.new("RGB", (CLIP_IMAGE_SIZE, CLIP_IMAGE_SIZE)))]),
+    ))
+    return model, preprocess
 
 class EmbeddingClip(NanoService):
-    def __init__(self):
+    def __init__(self, mode: Optional[str] = None):
         super().__init__()
         self.input_schema = {
             "$schema": "http://json-schema.org/draft-07/schema#",
@@ -25,41 +76,80 @@ class EmbeddingClip(NanoService):
             "required": [],
         }
         self.output_schema = {}
+        self.execution = THREAD
 
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.model, self.preprocess = clip.load("ViT-B/32", device=self.device)
+        self.mode = "cuda" if self.device == "cuda" else (mode or cpu_mode("CLIP"))
+        # The model is loaded on first use and shared with every node using the same id
+        self.model_id = f"clip:{CLIP_MODEL}:{self.mode}"
+        self.models = get_models()
+        self.models.register(self.model_id, partial(load_clip, self.device, self.mode))
+
+        self.text_batcher = MicroBatcher(self.embed_tokens, CLIP_BATCH_SIZE, CLIP_BATCH_WAIT_MS / 1000, "clip-text")
+        self.image_batcher = MicroBatcher(self.embed_images, CLIP_BATCH_SIZE, CLIP_BATCH_WAIT_MS / 1000, "clip-image")
+        # Vectors keyed by the input text or encoded image bytes, so unchanged items skip decoding and inference
+        self.cache = get_cache("embedding-clip")
+
+    def image_bytes(self, inputs: Dict[str, Any]) -> Optional[Union[bytes, memoryview]]:
+        # Uploaded attachments are used as-is, data URLs are decoded from base64
+        attachment = inputs.get("image")
+        if isinstance(attachment, Attachment):
+            return attachment.view()
+
+        image_base64 = inputs.get("image_base64", "")
+        if image_base64 != "":
+            return decode_data_url(image_base64)
+        return None
+
+    def embed_texts(self, texts: List[str]) -> List[List[float]]:
+        return self.embed_tokens([tokenize(text) for text in texts])
+
+    def embed_tokens(self, tokens: List[Any]) -> List[List[float]]:
+        # Tokenization runs per text in the caller's thread, the forward pass once per batch
+        with self.models.use(self.model_id) as (model, _):
+            return encode_tokens(model, self.device, tokens)
+
+    def embed_images(self, tensors: List[Any]) -> List[List[float]]:
+        # Preprocessing runs per image in the caller's thread, the forward pass once per batch
+        with self.models.use(self.model_id) as (model, _):
+            return encode_images(model, self.device, tensors)
+
+    def preprocess_image(self, image: Image.Image) -> Any:
+        with self.models.use(self.model_id) as (_, preprocess):
+            return preprocess(image)
 
-    def decode_base64_image(self, data_url: str) -> Image.Image:
-        header, encoded = data_url.split(",", 1)
-        image_data = base64.b64decode(encoded)
-        return Image.open(io.BytesIO(image_data)).convert("RGB")
+    def embed_text(self, text: str) -> List[float]:
+        return self.text_batcher(tokenize(text))
 
-    def embed_text(self, text: str):
-        tokens = clip.tokenize(text).to(self.device)
-        with torch.no_grad():
-            return self.model.encode_text(tokens).squeeze().cpu().tolist()
+    def embed_image(self, image: Image.Image) -> List[float]:
+        return self.image_batcher(self.preprocess_image(image))
 
-    def embed_image(self, image: Image.Image):
-        tensor_image = self.preprocess(image).unsqueeze(0).to(self.device)
-        with torch.no_grad():
-            return self.model.encode_image(tensor_image).squeeze().cpu().tolist()
+    async def shutdown(self) -> None:
+        self.text_batcher.close()
+        self.image_batcher.close()
+        self.cache.close()
 
     async def handle(self, ctx: Context, inputs: Dict[str, Any]) -> NanoServiceResponse:
         response = NanoServiceResponse()
 
         try:
             description = inputs.get("description", "")
-            image_base64 = inputs.get("image_base64", "")
 
-            text_vector = self.embed_text(description)
+            text_vector = self.cache.get_or_compute(
+                cache_key(self.model_id, "text", description),
+                lambda: self.embed_text(description),
+            )
 
             model = {
                 "text_vector": text_vector,
             }
 
-            if image_base64 != "":
-                image = self.decode_base64_image(image_base64)
-                image_vector = self.embed_image(image)
+            data = self.image_bytes(inputs)
+            if data is not None:
+                image_vector = self.cache.get_or_compute(
+                    cache_key(self.model_id, "image", data),
+                    lambda: self.embed_image(decode_image(data, CLIP_IMAGE_SIZE)),
+                )
                 model["image_vector"] = image_vector
             
             response.setSuccess(model)
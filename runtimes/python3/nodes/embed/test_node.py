@@ -1,9 +1,11 @@
 import unittest
-from unittest.mock import MagicMock
+from concurrent.futures import ThreadPoolExecutor
+from unittest.mock import MagicMock, patch
 from PIL import Image  # type: ignore
 from io import BytesIO
 import base64
 
+from core.util.batcher import MicroBatcher
 from nodes.embed.node import EmbeddingClip
 from core.types.context import Context
 
@@ -36,5 +38,30 @@ class TestEmbeddingClip(unittest.IsolatedAsyncioTestCase):
         self.assertEqual(response.data["text_vector"], [0.1, 0.2, 0.3])
         self.assertEqual(response.data["image_vector"], [0.4, 0.5, 0.6])
 
+    def test_long_text_only_fails_its_caller(self):
+        def tokenize(text):
+            if len(text) > 20:
+                raise RuntimeError(f"Input {text} is too long for context length 77")
+            return len(text)
+
+        node = EmbeddingClip()
+        batches = []
+        def embed_tokens(tokens):
+            batches.append(list(tokens))
+            return [[float(token)] for token in tokens]
+        node.text_batcher = MicroBatcher(embed_tokens, max_size=8, max_wait=0.2)
+
+        with patch("nodes.embed.node.tokenize", side_effect=tokenize):
+            with ThreadPoolExecutor(max_workers=3) as pool:
+                futures = [pool.submit(node.embed_text, text) for text in ("short", "x" * 100, "other")]
+                results = [future.exception() or future.result() for future in futures]
+        node.text_batcher.close()
+
+        self.assertEqual(results[0], [5.0])
+        self.assertIsInstance(results[1], RuntimeError)
+        self.assertEqual(results[2], [5.0])
+        # The long text never reached the batch
+        self.assertEqual(sorted(token for batch in batches for token in batch), [5, 5])
+
 if __name__ == "__main__":
     unittest.main()
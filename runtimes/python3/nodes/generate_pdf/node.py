@@ -1,11 +1,18 @@
+import asyncio
 import base64
+import os
 from core.nanoservice import NanoService
 from core.types.context import Context
 from core.types.nanoservice_response import NanoServiceResponse
 from core.types.global_error import GlobalError
-from typing import Any, Dict
+from core.executor import PROCESS, THREAD, executors
+from core.nanoservice import STREAM_CHUNK_SIZE
+from typing import Any, AsyncIterator, Dict
 import traceback
-from fpdf import FPDF # type: ignore
+from nodes.generate_pdf.report import SalesReport, render_report
+
+# Tables with more rows than this are rendered in the process pool, smaller ones in the node's thread
+PDF_PROCESS_ROWS = int(os.getenv("PDF_PROCESS_ROWS", "1000"))
 
 class GeneratePDF(NanoService):
     def __init__(self):
@@ -33,50 +40,41 @@ class GeneratePDF(NanoService):
             "required": ["title", "sales_data"]
         }
         self.output_schema = {}
+        self.execution = THREAD
         self.contentType = "application/pdf"
+        self.report = SalesReport()
+        self.process_rows = PDF_PROCESS_ROWS
 
-    async def handle(self, ctx: Context, inputs: Dict[str, Any]) -> NanoServiceResponse:
+    async def render(self, inputs: Dict[str, Any], thread: bool = False) -> bytes:
+        title = inputs["title"]
+        sales_data = inputs["sales_data"]
 
-        response = NanoServiceResponse()
+        loop = asyncio.get_running_loop()
+        if len(sales_data) > self.process_rows:
+            return await loop.run_in_executor(executors.get(PROCESS), render_report, title, sales_data)
+        if thread:
+            return await loop.run_in_executor(executors.get(THREAD), self.report.render, title, sales_data)
+        return self.report.render(title, sales_data)
 
-        try:
-            title = inputs["title"]
-            sales_data = inputs["sales_data"]
-            pdf = FPDF()
-            pdf.set_auto_page_break(auto=True, margin=15)
-            pdf.add_page()
-            pdf.set_font("Arial", "B", 16)
-            pdf.cell(200, 10, title, ln=True, align="C")
-            
-            # Table Headers
-            pdf.set_font("Arial", "B", 12)
-            pdf.cell(50, 10, "Product", 1)
-            pdf.cell(30, 10, "Quantity", 1)
-            pdf.cell(30, 10, "Price", 1)
-            pdf.cell(30, 10, "Total", 1)
-            pdf.ln()
+    async def stream(self, ctx: Context, inputs: Dict[str, Any]) -> AsyncIterator[Any]:
+        # Streams send the raw document in slices with the application/pdf content type,
+        # without the base64 copy, so large reports are not limited by the message size.
+        # stream() runs on the event loop, so small tables go to the thread pool here.
+        view = memoryview(await self.render(inputs, thread=True))
+        for offset in range(0, len(view), STREAM_CHUNK_SIZE):
+            yield view[offset:offset + STREAM_CHUNK_SIZE]
 
-            # Table Data
-            pdf.set_font("Arial", "", 12)
-            for item in sales_data:
-                pdf.cell(50, 10, item["product"], 1)
-                pdf.cell(30, 10, str(item["quantity"]), 1)
-                pdf.cell(30, 10, f"${item['price']:.2f}", 1)
-                pdf.cell(30, 10, f"${item['total']:.2f}", 1)
-                pdf.ln()
+    async def handle(self, ctx: Context, inputs: Dict[str, Any]) -> NanoServiceResponse:
 
-            # Save PDF File
-            file_path = "sales_report.pdf"
-            pdf.output(file_path)
+        response = NanoServiceResponse()
 
-            # Read PDF File
-            with open(file_path, "rb") as file:
-                pdf_data = file.read()
+        try:
+            pdf_data = await self.render(inputs)
 
             # Transformation to Base64
             pdf_data = base64.b64encode(pdf_data).decode("utf-8")
 
-            # Return File URL
+            # Return the document
             response.setSuccess({ "pdf_base64": pdf_data })
         except Exception as error:
             err = GlobalError(error)
@@ -0,0 +1,56 @@
+from typing import Any, Callable, Dict, List, Optional, Sequence, Tuple
+from fpdf import FPDF # type: ignore
+
+Column = Tuple[str, str, float, Callable[[Any], str]]
+
+# (header, field, width, format) of the sales table
+COLUMNS: Sequence[Column] = (
+    ("Product", "product", 50, str),
+    ("Quantity", "quantity", 30, str),
+    ("Price", "price", 30, lambda value: f"${value:.2f}"),
+    ("Total", "total", 30, lambda value: f"${value:.2f}"),
+)
+
+class SalesReport:
+    # The table layout is prepared once; each render only lays out the rows.
+    # Documents are built in memory and returned as bytes, never written to disk.
+    def __init__(self, columns: Sequence[Column] = COLUMNS, font: str = "Arial"):
+        self.columns = columns
+        self.font = font
+        self.row_height = 10
+        # fpdf loads the metric files of core fonts on first use and keeps them per process
+        pdf = FPDF()
+        for style in ("", "B"):
+            pdf.set_font(font, style, 12)
+
+    def render(self, title: str, rows: List[Dict[str, Any]]) -> bytes:
+        height = self.row_height
+        pdf = FPDF()
+        pdf.set_auto_page_break(auto=True, margin=15)
+        pdf.add_page()
+        pdf.set_font(self.font, "B", 16)
+        pdf.cell(200, height, title, ln=True, align="C")
+
+        pdf.set_font(self.font, "B", 12)
+        for header, _, width, _ in self.columns:
+            pdf.cell(width, height, header, 1)
+        pdf.ln()
+
+        pdf.set_font(self.font, "", 12)
+        cell = pdf.cell
+        for row in rows:
+            for _, field, width, format in self.columns:
+                cell(width, height, format(row[field]), 1)
+            pdf.ln()
+
+        # fpdf 1.7 keeps the document as a latin-1 str
+        return pdf.output(dest="S").encode("latin-1")
+
+report: Optional[SalesReport] = None
+
+def render_report(title: str, rows: List[Dict[str, Any]]) -> bytes:
+    # Entry point of the process pool: one prepared report per pool process
+    global report
+    if report is None:
+        report = SalesReport()
+    return report.render(title, rows)
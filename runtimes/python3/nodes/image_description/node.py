@@ -2,58 +2,155 @@ from core.nanoservice import NanoService
 from core.types.context import Context
 from core.types.nanoservice_response import NanoServiceResponse
 from core.types.global_error import GlobalError
-from typing import Any, Dict
+from core.executor import THREAD
+from core.types.attachment import Attachment
+from core.util.batcher import MicroBatcher
+from core.util.inference_cache import cache_key, get_cache
+from core.util.cpu_inference import INT8, compile_enabled, compile_module, configure_threads, cpu_mode, quantize, warm_up
+from core.util.model_registry import get_models
+from core.util.image import decode_data_url, decode_image
+from functools import partial
+from typing import Any, Dict, List, Optional, Tuple, Union
+import os
 import traceback
 
 from transformers import BlipProcessor, BlipForConditionalGeneration
 from PIL import Image # type: ignore
-import base64
-import io
 import torch # type: ignore
 
 import warnings
 warnings.filterwarnings("ignore", category=FutureWarning)
 
+# Pending images are captioned together: up to BLIP_BATCH_SIZE images, waiting at
+# most BLIP_BATCH_WAIT_MS after the first one
+BLIP_BATCH_SIZE = int(os.getenv("BLIP_BATCH_SIZE", "8"))
+BLIP_BATCH_WAIT_MS = float(os.getenv("BLIP_BATCH_WAIT_MS", "10"))
+def optional_int(name: str) -> Optional[int]:
+    value = os.getenv(name)
+    return int(value) if value else None
+
+# Defaults for the per-node generation options; unset options keep the model's generation config
+BLIP_MAX_NEW_TOKENS = optional_int("BLIP_MAX_NEW_TOKENS")
+BLIP_NUM_BEAMS = optional_int("BLIP_NUM_BEAMS")
+
+BLIP_MODEL = "Salesforce/blip-image-captioning-base"
+# Input resolution of the BLIP base model; images are decoded no larger than needed for it
+BLIP_IMAGE_SIZE = 384
+
+GenerationOptions = Tuple[Optional[int], Optional[int]]
+
+def generate_captions(processor: Any, model: Any, device: str, images: List[Image.Image], options: GenerationOptions) -> List[str]:
+    max_new_tokens, num_beams = options
+    inputs_blip = processor(images=images, return_tensors="pt").to(device)
+
+    # Only options that were set are passed, the rest come from the model's generation config
+    kwargs: Dict[str, int] = {}
+    if max_new_tokens is not None:
+        kwargs["max_new_tokens"] = max_new_tokens
+    if num_beams is not None:
+        kwargs["num_beams"] = num_beams
+
+    with torch.no_grad():
+        out = model.generate(**inputs_blip, **kwargs)
+
+    return processor.batch_decode(out, skip_special_tokens=True)
+
+def load_blip(device: str, mode: str) -> Tuple[Any, Any]:
+    processor = BlipProcessor.from_pretrained(BLIP_MODEL)
+    model = BlipForConditionalGeneration.from_pretrained(BLIP_MODEL)
+    model.to(device)
+    model.eval()
+
+    # BLIP_CPU_MODE=int8 and BLIP_COMPILE=1 opt into the CPU inference path
+    if device == "cpu":
+        configure_threads()
+        if mode == INT8:
+            model = quantize(model)
+        if compile_enabled("BLIP"):
+            model.vision_model = compile_module(model.vision_model)
+
+    warm_up("image-description", lambda: generate_captions(processor, model, device, [Image.new("RGB", (BLIP_IMAGE_SIZE, BLIP_IMAGE_SIZE))], (5, 1)))
+    return processor, model
+
 class GenerateCaption(NanoService):
-    def __init__(self):
+    def __init__(self, mode: Optional[str] = None):
         super().__init__()
         self.input_schema = {
             "$schema": "http://json-schema.org/draft-07/schema#",
             "title": "Generated schema for Root",
             "type": "object",
             "properties": { 
-                "image_base64": { "type": "string" }
+                "image_base64": { "type": "string" },
+                "max_new_tokens": { "type": "integer", "minimum": 1 },
+                "num_beams": { "type": "integer", "minimum": 1 }
             },
-            "required": [ "image_base64" ],
+            "required": [],
         }
         self.output_schema = {}
+        self.execution = THREAD
 
-        # Load BLIP model
         self.device = "cuda" if torch.cuda.is_available() else "cpu"
-        self.processor = BlipProcessor.from_pretrained("Salesforce/blip-image-captioning-base")
-        self.model = BlipForConditionalGeneration.from_pretrained("Salesforce/blip-image-captioning-base")
-        self.model.to(self.device)
+        self.mode = "cuda" if self.device == "cuda" else (mode or cpu_mode("BLIP"))
+        # The model is loaded on first use and shared with every node using the same id
+        self.model_id = f"{BLIP_MODEL}:{self.mode}"
+        self.models = get_models()
+        self.models.register(self.model_id, partial(load_blip, self.device, self.mode))
 
-    def decode_base64_image(self, base64_str: str) -> Image.Image:
-        header, encoded = base64_str.split(",", 1)
-        image_data = base64.b64decode(encoded)
-        image = Image.open(io.BytesIO(image_data)).convert("RGB")
-        return image
+        self.batcher = MicroBatcher(self.caption_batch, BLIP_BATCH_SIZE, BLIP_BATCH_WAIT_MS / 1000, "blip-caption")
+        # Captions keyed by the encoded image bytes and generation options
+        self.cache = get_cache("image-description")
+
+    def image_bytes(self, inputs: Dict[str, Any]) -> Union[bytes, memoryview]:
+        # Uploaded attachments are used as-is, data URLs are decoded from base64
+        attachment = inputs.get("image")
+        if isinstance(attachment, Attachment):
+            return attachment.view()
+
+        base64_image = inputs.get("image_base64")
+        if not base64_image:
+            raise ValueError("Missing 'image_base64' or 'image' in inputs.")
+        return decode_data_url(base64_image)
+
+    def generation_options(self, inputs: Dict[str, Any]) -> GenerationOptions:
+        max_new_tokens = inputs.get("max_new_tokens") or BLIP_MAX_NEW_TOKENS
+        num_beams = inputs.get("num_beams") or BLIP_NUM_BEAMS
+        return (
+            int(max_new_tokens) if max_new_tokens is not None else None,
+            int(num_beams) if num_beams is not None else None,
+        )
+
+    def caption_batch(self, items: List[Tuple[Image.Image, GenerationOptions]]) -> List[str]:
+        # One processor and one generate call per distinct set of generation options
+        groups: Dict[GenerationOptions, List[int]] = {}
+        for index, (_, options) in enumerate(items):
+            groups.setdefault(options, []).append(index)
+
+        captions: List[str] = [""] * len(items)
+        with self.models.use(self.model_id) as (processor, model):
+            for options, indexes in groups.items():
+                images = [items[index][0] for index in indexes]
+                for index, caption in zip(indexes, generate_captions(processor, model, self.device, images, options)):
+                    captions[index] = caption
+
+        return captions
+
+    def caption(self, image: Image.Image, options: GenerationOptions) -> str:
+        return self.batcher((image, options))
+
+    async def shutdown(self) -> None:
+        self.batcher.close()
+        self.cache.close()
 
     async def handle(self, ctx: Context, inputs: Dict[str, Any]) -> NanoServiceResponse:
         response = NanoServiceResponse()
 
         try:
-            base64_image = inputs.get("image_base64")
-            if not base64_image:
-                raise ValueError("Missing 'image_base64' in inputs.")
-
-            image = self.decode_base64_image(base64_image)
-            inputs_blip = self.processor(image, return_tensors="pt").to(self.device)
-
-            with torch.no_grad():
-                out = self.model.generate(**inputs_blip)
-                caption = self.processor.decode(out[0], skip_special_tokens=True)
+            data = self.image_bytes(inputs)
+            options = self.generation_options(inputs)
+            caption = self.cache.get_or_compute(
+                cache_key(self.model_id, *map(str, options), data),
+                lambda: self.caption(decode_image(data, BLIP_IMAGE_SIZE), options),
+            )
 
             response.setSuccess({
                 "description": caption
@@ -70,5 +167,7 @@ class GenerateCaption(NanoService):
         return response
 # This code is a NanoService that generates captions for images using the BLIP model.
 # It takes a base64 encoded image as input and returns a description of the image.
+# Concurrent requests are captioned in batches off the event loop; max_new_tokens and
+# num_beams can be set per node to trade caption quality against latency.
 # The service handles errors and returns a structured response.
 # The BLIP model is loaded using the Hugging Face Transformers library, and the image is processed using PIL.
\ No newline at end of file
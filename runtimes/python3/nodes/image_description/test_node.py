@@ -0,0 +1,92 @@
+import base64
+import unittest
+from io import BytesIO
+from unittest.mock import patch
+from jsonschema import ValidationError # type: ignore
+from PIL import Image # type: ignore
+
+from core.types.context import Context
+from core.util.model_registry import get_models
+from nodes.image_description.node import BLIP_MAX_NEW_TOKENS, BLIP_MODEL, BLIP_NUM_BEAMS, GenerateCaption
+
+class FakeInputs(dict):
+    def to(self, device):
+        return self
+
+class FakeProcessor:
+    def __call__(self, images, return_tensors):
+        return FakeInputs(pixel_values=images)
+
+    def batch_decode(self, out, skip_special_tokens):
+        return out
+
+class FakeModel:
+    def __init__(self):
+        self.calls = []
+
+    def generate(self, pixel_values, max_new_tokens="default", num_beams="default"):
+        self.calls.append((len(pixel_values), max_new_tokens, num_beams))
+        return [f"{image.width} {max_new_tokens} {num_beams}" for image in pixel_values]
+
+def encode_image(width: int) -> str:
+    buffer = BytesIO()
+    Image.new("RGB", (width, 20), color="blue").save(buffer, format="PNG")
+    return "data:image/png;base64," + base64.b64encode(buffer.getvalue()).decode()
+
+class TestGenerateCaption(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.model = FakeModel()
+        # The node registers its loader second, so it shares the fake models
+        get_models().register(f"{BLIP_MODEL}:test", lambda: (FakeProcessor(), self.model))
+        with patch("nodes.image_description.node.torch.cuda.is_available", return_value=False):
+            self.node = GenerateCaption("test")
+
+    async def asyncTearDown(self):
+        await self.node.shutdown()
+        get_models().loaders.pop(self.node.model_id, None)
+        get_models().unload(self.node.model_id)
+
+    def test_generation_options_defaults(self):
+        # Unset unless BLIP_MAX_NEW_TOKENS / BLIP_NUM_BEAMS are configured
+        self.assertEqual(self.node.generation_options({}), (BLIP_MAX_NEW_TOKENS, BLIP_NUM_BEAMS))
+        self.assertEqual(self.node.generation_options({"max_new_tokens": 5, "num_beams": 3}), (5, 3))
+        self.assertEqual(self.node.generation_options({"num_beams": 2}), (BLIP_MAX_NEW_TOKENS, 2))
+        with patch("nodes.image_description.node.BLIP_MAX_NEW_TOKENS", 40):
+            self.assertEqual(self.node.generation_options({"num_beams": 2}), (40, 2))
+
+    @patch("nodes.image_description.node.BLIP_NUM_BEAMS", None)
+    @patch("nodes.image_description.node.BLIP_MAX_NEW_TOKENS", None)
+    def test_unset_options_use_model_defaults(self):
+        options = self.node.generation_options({})
+        captions = self.node.caption_batch([(Image.new("RGB", (10, 10)), options)])
+
+        # Nothing is passed to generate, as in the plain model.generate(**inputs) call
+        self.assertEqual(options, (None, None))
+        self.assertEqual(self.model.calls, [(1, "default", "default")])
+        self.assertEqual(captions, ["10 default default"])
+
+    def test_input_schema(self):
+        self.node.validate({"image_base64": "x", "max_new_tokens": 10, "num_beams": 2}, self.node.input_schema)
+        for inputs in ({"max_new_tokens": 0}, {"num_beams": 1.5}, {"max_new_tokens": "10"}):
+            with self.assertRaises(ValidationError, msg=inputs):
+                self.node.validate(inputs, self.node.input_schema)
+
+    def test_caption_batch_groups_by_options(self):
+        images = [Image.new("RGB", (width, 10)) for width in (10, 20, 30, 40)]
+        options = [(30, 1), (10, 2), (30, 1), (10, 2)]
+
+        captions = self.node.caption_batch(list(zip(images, options)))
+
+        # One generate per distinct options, captions back in submission order
+        self.assertEqual(sorted(self.model.calls), [(2, 10, 2), (2, 30, 1)])
+        self.assertEqual(captions, ["10 30 1", "20 10 2", "30 30 1", "40 10 2"])
+
+    async def test_handle_applies_options(self):
+        response = await self.node.handle(Context(), {"image_base64": encode_image(64), "max_new_tokens": 12, "num_beams": 3})
+
+        self.assertTrue(response.success)
+        self.assertEqual(response.data["description"], "64 12 3")
+        self.assertEqual(self.model.calls, [(1, 12, 3)])
+
+if __name__ == "__main__":
+    unittest.main()
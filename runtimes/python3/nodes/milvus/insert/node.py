@@ -2,12 +2,23 @@ from core.nanoservice import NanoService
 from core.types.context import Context
 from core.types.nanoservice_response import NanoServiceResponse
 from core.types.global_error import GlobalError
-from typing import Any, Dict
+from core.executor import INLINE
+from core.util.batcher import MicroBatcher
+from typing import Any, Dict, List, Sequence
+import asyncio
+import os
 import traceback
 
 from pymilvus import connections, Collection, FieldSchema, CollectionSchema, DataType # type: ignore
 from pymilvus import list_collections # type: ignore
 
+# Rows from concurrent calls are inserted together: up to MILVUS_INSERT_BATCH_SIZE rows,
+# waiting at most MILVUS_INSERT_WAIT_MS after the first one
+MILVUS_INSERT_BATCH_SIZE = int(os.getenv("MILVUS_INSERT_BATCH_SIZE", "256"))
+MILVUS_INSERT_WAIT_MS = float(os.getenv("MILVUS_INSERT_WAIT_MS", "20"))
+
+FIELDS = ("description", "image_url", "text_vector", "image_vector")
+
 class StoreInMilvus(NanoService):
     def __init__(self):
         super().__init__()
@@ -24,10 +35,15 @@ class StoreInMilvus(NanoService):
             "required": ["description", "image_url", "text_vector", "image_vector"],
         }
         self.output_schema = {}
+        # Calls only wait on the insert buffer, whose thread does the blocking inserts
+        self.execution = INLINE
 
         connections.connect(alias="default", host="localhost", port="19530")
         self.collection_name = "multimodal_index"
         self.ensure_collection_exists()
+        self.collection = Collection(self.collection_name)
+        # Inserts are not idempotent: a failed batch may be partly written, so it is never retried
+        self.buffer = MicroBatcher(self.insert_rows, MILVUS_INSERT_BATCH_SIZE, MILVUS_INSERT_WAIT_MS / 1000, "milvus-insert", retry_items=False)
 
     def ensure_collection_exists(self):
         if self.collection_name in list_collections():
@@ -46,24 +62,20 @@ class StoreInMilvus(NanoService):
         collection.create_index(field_name="image_vector", index_params={"metric_type": "COSINE", "index_type": "IVF_FLAT", "params": {"nlist": 1024}})
         collection.load()
 
+    def insert_rows(self, rows: List[Dict[str, Any]]) -> Sequence[Any]:
+        # One columnar insert for the whole batch; Milvus returns the primary keys in row order
+        result = self.collection.insert([[row[field] for row in rows] for field in FIELDS])
+        return list(result.primary_keys)
+
     async def handle(self, ctx: Context, inputs: Dict[str, Any]) -> NanoServiceResponse:
         response = NanoServiceResponse()
 
         try:
-            description = inputs["description"]
-            image_url = inputs["image_url"]
-            text_vector = inputs["text_vector"]
-            image_vector = inputs["image_vector"]
+            row = {field: inputs[field] for field in FIELDS}
+            # Resolves once the batch holding this row is inserted
+            id = await asyncio.wrap_future(self.buffer.submit(row))
 
-            collection = Collection(self.collection_name)
-            collection.insert([
-                [description],
-                [image_url],
-                [text_vector],
-                [image_vector]
-            ])
-
-            response.setSuccess({"inserted": True})
+            response.setSuccess({"inserted": True, "id": id})
 
         except Exception as error:
             err = GlobalError(error)
@@ -74,3 +86,7 @@ class StoreInMilvus(NanoService):
             response.setError(err)
 
         return response
+
+    async def shutdown(self) -> None:
+        # Rows still buffered are inserted before the node goes away
+        self.buffer.close()
@@ -1,7 +1,19 @@
+import asyncio
 import unittest
 from unittest.mock import patch, MagicMock
 from core.types.context import Context
 
+def row(index: int = 0):
+    return {
+        "description": f"A photo of mountains {index}",
+        "image_url": f"https://miweb.com/img{index}.jpg",
+        "text_vector": [0.1] * 512,
+        "image_vector": [0.2] * 512
+    }
+
+def insert_result(columns):
+    return MagicMock(primary_keys=[100 + i for i in range(len(columns[0]))])
+
 class TestStoreEmbeddings(unittest.IsolatedAsyncioTestCase):
 
     @patch("nodes.milvus.insert.node.list_collections", return_value=["multimodal_index"])
@@ -9,24 +21,61 @@ class TestStoreEmbeddings(unittest.IsolatedAsyncioTestCase):
     @patch("nodes.milvus.insert.node.connections.connect")
     async def test_handle_success(self, mock_connect, mock_collection_cls, mock_list_collections):
         mock_collection = MagicMock()
+        mock_collection.insert.side_effect = insert_result
         mock_collection_cls.return_value = mock_collection
 
         from nodes.milvus.insert.node import StoreInMilvus
         node = StoreInMilvus()
 
-        inputs = {
-            "description": "A photo of mountains",
-            "image_url": "https://miweb.com/img.jpg",
-            "text_vector": [0.1] * 512,
-            "image_vector": [0.2] * 512
-        }
-
         ctx = Context()
-        response = await node.handle(ctx, inputs)
+        response = await node.handle(ctx, row())
+        await node.shutdown()
 
         self.assertTrue(response.success)
         self.assertEqual(response.data["inserted"], True)
+        self.assertEqual(response.data["id"], 100)
+        mock_collection.insert.assert_called_once()
+
+    @patch("nodes.milvus.insert.node.list_collections", return_value=["multimodal_index"])
+    @patch("nodes.milvus.insert.node.Collection")
+    @patch("nodes.milvus.insert.node.connections.connect")
+    async def test_concurrent_rows_are_inserted_together(self, mock_connect, mock_collection_cls, mock_list_collections):
+        mock_collection = MagicMock()
+        mock_collection.insert.side_effect = insert_result
+        mock_collection_cls.return_value = mock_collection
+
+        from nodes.milvus.insert.node import StoreInMilvus
+        node = StoreInMilvus()
+
+        responses = await asyncio.gather(*[node.handle(Context(), row(i)) for i in range(5)])
+        await node.shutdown()
+
+        self.assertEqual(sorted(response.data["id"] for response in responses), [100, 101, 102, 103, 104])
+        # One columnar insert: a list per field, rows in submission order
+        mock_collection.insert.assert_called_once()
+        columns = mock_collection.insert.call_args[0][0]
+        self.assertEqual(columns[0], [f"A photo of mountains {i}" for i in range(5)])
+        self.assertEqual(len(columns[2]), 5)
+
+    @patch("nodes.milvus.insert.node.list_collections", return_value=["multimodal_index"])
+    @patch("nodes.milvus.insert.node.Collection")
+    @patch("nodes.milvus.insert.node.connections.connect")
+    async def test_insert_error_reaches_every_caller(self, mock_connect, mock_collection_cls, mock_list_collections):
+        mock_collection = MagicMock()
+        mock_collection.insert.side_effect = RuntimeError("milvus unavailable")
+        mock_collection_cls.return_value = mock_collection
+
+        from nodes.milvus.insert.node import StoreInMilvus
+        node = StoreInMilvus()
+
+        responses = await asyncio.gather(*[node.handle(Context(), row(i)) for i in range(3)])
+        await node.shutdown()
+
+        self.assertEqual([response.success for response in responses], [False, False, False])
+        # The failed batch is not retried row by row, so nothing is inserted twice
         mock_collection.insert.assert_called_once()
+        self.assertEqual(len(mock_collection.insert.call_args[0][0][0]), 3)
+        self.assertTrue(all("milvus unavailable" in str(response.error.to_dict()) for response in responses))
 
 if __name__ == "__main__":
     unittest.main()
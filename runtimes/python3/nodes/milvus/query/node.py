@@ -2,7 +2,9 @@ from core.nanoservice import NanoService
 from core.types.context import Context
 from core.types.nanoservice_response import NanoServiceResponse
 from core.types.global_error import GlobalError
-from typing import Any, Dict
+from core.executor import THREAD, executors
+from typing import Any, AsyncIterator, Dict, List
+import asyncio
 import traceback
 from pymilvus import connections, Collection  # type: ignore
 
@@ -21,6 +23,8 @@ class SearchInMilvus(NanoService):
             "required": [],
         }
         self.output_schema = {}
+        self.execution = THREAD
+        self.page_size = 100
 
         connections.connect(alias="default", host="localhost", port="19530")
         self.collection = Collection("multimodal_index")
@@ -30,52 +34,7 @@ class SearchInMilvus(NanoService):
         response = NanoServiceResponse()
 
         try:
-            text_vector = inputs.get("text_vector")
-            image_vector = inputs.get("image_vector")
-            top_k = inputs.get("top_k", 5)
-
-            if not text_vector and not image_vector:
-                raise ValueError("At least 'text_vector' or 'image_vector' must be provided.")
-
-            combined_results = []
-
-            if text_vector:
-                res_text = self.collection.search(
-                    data=[text_vector],
-                    anns_field="text_vector",
-                    param={"metric_type": "COSINE", "params": {"nprobe": 10}},
-                    limit=top_k,
-                    output_fields=["description", "image_url"]
-                )
-                res_img = self.collection.search(
-                    data=[text_vector],
-                    anns_field="image_vector",
-                    param={"metric_type": "COSINE", "params": {"nprobe": 10}},
-                    limit=top_k,
-                    output_fields=["description", "image_url"]
-                )
-
-                combined_results = self._merge_results(res_text[0], res_img[0], top_k)
-
-            elif image_vector:
-                res_img = self.collection.search(
-                    data=[image_vector],
-                    anns_field="image_vector",
-                    param={"metric_type": "COSINE", "params": {"nprobe": 10}},
-                    limit=top_k,
-                    output_fields=["description", "image_url"]
-                )
-                combined_results = res_img[0]
-
-            formatted = [
-                {
-                    "description": hit.entity.get("description"),
-                    "image_url": hit.entity.get("image_url"),
-                    "score": float(hit.distance)
-                }
-                for hit in combined_results
-            ]
-
+            formatted = self.search(inputs)
             response.setSuccess({"results": formatted})
 
         except Exception as error:
@@ -88,6 +47,73 @@ class SearchInMilvus(NanoService):
 
         return response
 
+    async def stream(self, ctx: Context, inputs: Dict[str, Any]) -> AsyncIterator[Dict[str, Any]]:
+        loop = asyncio.get_running_loop()
+        text_vector = inputs.get("text_vector")
+        image_vector = inputs.get("image_vector")
+        top_k = inputs.get("top_k", 5)
+        self.check_vectors(text_vector, image_vector)
+
+        if text_vector:
+            # Text hits are ranked by their score averaged over both vector fields, which
+            # needs both full hit lists: only the response is paged
+            formatted = await loop.run_in_executor(executors.get(THREAD), self.search, inputs)
+            for offset in range(0, len(formatted), self.page_size):
+                yield {"results": formatted[offset:offset + self.page_size]}
+            return
+
+        # Image hits are fetched page by page and forwarded as each page arrives
+        offset = 0
+        while offset < top_k:
+            limit = min(self.page_size, top_k - offset)
+            hits = await loop.run_in_executor(executors.get(THREAD), self.search_field, image_vector, "image_vector", limit, offset)
+            if hits:
+                yield {"results": self.format_hits(hits)}
+            if len(hits) < limit:
+                return
+            offset += limit
+
+    def check_vectors(self, text_vector: Any, image_vector: Any) -> None:
+        if not text_vector and not image_vector:
+            raise ValueError("At least 'text_vector' or 'image_vector' must be provided.")
+
+    def search_field(self, vector: List[float], field: str, limit: int, offset: int = 0) -> Any:
+        param: Dict[str, Any] = {"metric_type": "COSINE", "params": {"nprobe": 10}}
+        if offset:
+            param["offset"] = offset
+        return self.collection.search(
+            data=[vector],
+            anns_field=field,
+            param=param,
+            limit=limit,
+            output_fields=["description", "image_url"]
+        )[0]
+
+    def format_hits(self, hits: Any) -> List[Dict[str, Any]]:
+        return [
+            {
+                "description": hit.entity.get("description"),
+                "image_url": hit.entity.get("image_url"),
+                "score": float(hit.distance)
+            }
+            for hit in hits
+        ]
+
+    def search(self, inputs: Dict[str, Any]) -> List[Dict[str, Any]]:
+        text_vector = inputs.get("text_vector")
+        image_vector = inputs.get("image_vector")
+        top_k = inputs.get("top_k", 5)
+        self.check_vectors(text_vector, image_vector)
+
+        if text_vector:
+            res_text = self.search_field(text_vector, "text_vector", top_k)
+            res_img = self.search_field(text_vector, "image_vector", top_k)
+            combined_results = self._merge_results(res_text, res_img, top_k)
+        else:
+            combined_results = self.search_field(image_vector, "image_vector", top_k)
+
+        return self.format_hits(combined_results)
+
     def _merge_results(self, r1, r2, top_k):
         merged = {}
         for hit in r1 + r2:
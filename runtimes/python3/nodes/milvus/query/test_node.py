@@ -0,0 +1,53 @@
+import unittest
+from unittest.mock import patch, MagicMock
+from core.types.context import Context
+
+class FakeHit:
+    def __init__(self, index: int):
+        self.id = index
+        self.entity = {"description": f"image {index}", "image_url": f"https://miweb.com/img{index}.jpg"}
+        self.distance = index / 100
+
+def search(data, anns_field, param, limit, output_fields):
+    # 250 stored images, returned from param["offset"]
+    offset = param.get("offset", 0)
+    return [[FakeHit(index) for index in range(offset, min(offset + limit, 250))]]
+
+class TestSearchInMilvus(unittest.IsolatedAsyncioTestCase):
+
+    @patch("nodes.milvus.query.node.Collection")
+    @patch("nodes.milvus.query.node.connections.connect")
+    async def test_stream_fetches_image_hits_in_pages(self, mock_connect, mock_collection_cls):
+        mock_collection = MagicMock()
+        mock_collection.search.side_effect = search
+        mock_collection_cls.return_value = mock_collection
+
+        from nodes.milvus.query.node import SearchInMilvus
+        node = SearchInMilvus()
+
+        pages = [page async for page in node.stream(Context(), {"image_vector": [0.2] * 512, "top_k": 300})]
+
+        self.assertEqual([len(page["results"]) for page in pages], [100, 100, 50])
+        self.assertEqual(pages[1]["results"][0]["description"], "image 100")
+        # One search per page, never one for the whole result
+        self.assertEqual([call.kwargs["limit"] for call in mock_collection.search.call_args_list], [100, 100, 100])
+        self.assertEqual([call.kwargs["param"].get("offset", 0) for call in mock_collection.search.call_args_list], [0, 100, 200])
+
+    @patch("nodes.milvus.query.node.Collection")
+    @patch("nodes.milvus.query.node.connections.connect")
+    async def test_handle_merges_text_hits(self, mock_connect, mock_collection_cls):
+        mock_collection = MagicMock()
+        mock_collection.search.side_effect = search
+        mock_collection_cls.return_value = mock_collection
+
+        from nodes.milvus.query.node import SearchInMilvus
+        node = SearchInMilvus()
+
+        response = await node.handle(Context(), {"text_vector": [0.1] * 512, "top_k": 3})
+
+        self.assertTrue(response.success)
+        self.assertEqual([hit["description"] for hit in response.data["results"]], ["image 0", "image 1", "image 2"])
+        self.assertEqual(mock_collection.search.call_count, 2)
+
+if __name__ == "__main__":
+    unittest.main()
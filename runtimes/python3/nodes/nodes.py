@@ -1,16 +1,81 @@
-from nodes.api_call.node import ApiCall
-from nodes.sentiment.node import Sentiment
-from nodes.generate_pdf.node import GeneratePDF
-# from nodes.embed.node import EmbeddingClip
-# from nodes.milvus.insert.node import StoreInMilvus
-# from nodes.milvus.query.node import SearchInMilvus
-# from nodes.image_description.node import GenerateCaption
-
-nodes = {
-    "api_call": ApiCall(),
-    "generate-sentiment": Sentiment(),
-    "generate-pdf": GeneratePDF()
-}
-
-def get_nodes():
+import importlib
+import os
+import threading
+from typing import Dict, List, Optional
+from core.node_base import NodeBase
+
+class NodeRegistry:
+    def __init__(self, entries: Dict[str, str]):
+        # Node name -> "module.path:ClassName". Modules are only imported the
+        # first time the node is requested, so unused nodes never pay their import cost.
+        self.entries: Dict[str, str] = dict(entries)
+        self.instances: Dict[str, NodeBase] = {}
+        self.lock = threading.Lock()
+
+    def register(self, name: str, path: str) -> None:
+        with self.lock:
+            self.entries[name] = path
+            self.instances.pop(name, None)
+
+    def __contains__(self, name: str) -> bool:
+        return name in self.entries
+
+    def __getitem__(self, name: str) -> NodeBase:
+        node = self.instances.get(name)
+        if node is None:
+            node = self.load(name)
+        return node
+
+    def load(self, name: str) -> NodeBase:
+        with self.lock:
+            node = self.instances.get(name)
+            if node is not None:
+                return node
+
+            module_name, class_name = self.entries[name].split(":", 1)
+            node_class = getattr(importlib.import_module(module_name), class_name)
+            node = node_class()
+            self.instances[name] = node
+            return node
+
+    def loaded(self) -> List[str]:
+        return list(self.instances.keys())
+
+    def preload(self, names: List[str]) -> None:
+        for name in names:
+            self.load(name)
+
+    async def shutdown(self) -> None:
+        for name, node in list(self.instances.items()):
+            try:
+                await node.shutdown()
+            except Exception as e:
+                print(f"Error shutting down node {name}: {e}")
+
+nodes = NodeRegistry({
+    "api_call": "nodes.api_call.node:ApiCall",
+    "generate-sentiment": "nodes.sentiment.node:Sentiment",
+    "generate-pdf": "nodes.generate_pdf.node:GeneratePDF",
+    # "embedding-clip": "nodes.embed.node:EmbeddingClip",
+    # "store-in-milvus": "nodes.milvus.insert.node:StoreInMilvus",
+    # "search-in-milvus": "nodes.milvus.query.node:SearchInMilvus",
+    # "image-description": "nodes.image_description.node:GenerateCaption",
+})
+
+def get_nodes() -> NodeRegistry:
     return nodes
+
+async def shutdown_nodes() -> None:
+    await nodes.shutdown()
+
+def preload_nodes(names: Optional[List[str]] = None) -> List[str]:
+    # PRELOAD_NODES="api_call,generate-pdf" warms up the listed nodes, "*" warms up all of them
+    if names is None:
+        value = os.getenv("PRELOAD_NODES", "").strip()
+        if value == "*":
+            names = list(nodes.entries.keys())
+        else:
+            names = [name.strip() for name in value.split(",") if name.strip()]
+
+    nodes.preload(names)
+    return names
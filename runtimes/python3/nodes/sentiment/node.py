@@ -2,9 +2,12 @@ from core.nanoservice import NanoService
 from core.types.context import Context
 from core.types.nanoservice_response import NanoServiceResponse
 from core.types.global_error import GlobalError
-from typing import Any, Dict
+from core.executor import PROCESS
+from typing import Any, Dict, List
 import traceback
-from textblob import TextBlob # type: ignore
+from nodes.sentiment.scorer import PolarityScorer, label
+
+FEEDBACK_FIELDS = ("id", "title", "comment", "sentiment", "createdAt")
 
 class Sentiment(NanoService):
     def __init__(self):
@@ -14,6 +17,18 @@ class Sentiment(NanoService):
             "title": "Generated schema for Root",
             "type": "object",
             "properties": {
+                # Batch form: many feedback items scored in one call
+                "items": {
+                    "type": "array",
+                    "items": {
+                        "type": "object",
+                        "properties": {
+                            "title": { "type": "string" },
+                            "comment": { "type": "string" },
+                        },
+                        "required": ["title", "comment"],
+                    },
+                },
                 "id": {
                     "type": "string",
                 },
@@ -30,31 +45,34 @@ class Sentiment(NanoService):
                     "type": "string",
                 },
             },
-            "required": ["id", "title", "comment", "sentiment", "createdAt"],
+            "anyOf": [
+                { "required": ["id", "title", "comment", "sentiment", "createdAt"] },
+                { "required": ["items"] },
+            ],
         }
         self.output_schema = {}
+        self.execution = PROCESS
+        self.scorer = PolarityScorer()
+
+    def score(self, items: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+        # Same scores as TextBlob(title + ": " + comment).sentiment.polarity, for the whole batch at once
+        polarities = self.scorer.score([item["title"] + ": " + item["comment"] for item in items])
+        return [
+            {**item, "sentiment": label(polarity)}
+            for item, polarity in zip(items, polarities)
+        ]
 
     async def handle(self, ctx: Context, inputs: Dict[str, Any]) -> NanoServiceResponse:
 
         response = NanoServiceResponse()
 
         try:
-            feedback = {
-                "id": inputs["id"],
-                "title": inputs["title"],
-                "comment": inputs["comment"],
-                "sentiment": inputs["sentiment"],
-                "createdAt": inputs["createdAt"],
-            }
-
-            analysis = TextBlob(feedback["title"] + ": " + feedback["comment"])
-            polarity = analysis.sentiment.polarity
+            if "items" in inputs:
+                response.setSuccess({"items": self.score(inputs["items"])})
+                return response
 
-            feedback["sentiment"] = ""
-            if polarity > 0:
-                feedback["sentiment"] = "+"
-            elif polarity < 0:
-                feedback["sentiment"] = "-"
+            feedback = {field: inputs[field] for field in FEEDBACK_FIELDS}
+            feedback = self.score([feedback])[0]
 
             response.setSuccess(feedback)
         except Exception as error:
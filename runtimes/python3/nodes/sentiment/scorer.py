@@ -0,0 +1,102 @@
+from typing import Dict, List, Optional, Sequence
+import numpy as np # type: ignore
+from textblob.en import sentiment as pattern_sentiment # type: ignore
+from textblob._text import EMOTICONS, PUNCTUATION # type: ignore
+
+# Token ids of the polarity table: everything outside the table is a plain unknown word
+UNKNOWN = 0
+
+class PolarityScorer:
+    # Scores many texts with the same result as TextBlob(text).sentiment.polarity.
+    #
+    # TextBlob averages the polarity of the lexicon words found in a text, but
+    # negations ("not good"), modifiers ("very good"), "!" and emoticons change
+    # the scores of neighbouring words. Texts without any of these are scored
+    # with one NumPy pass over the whole batch using a precomputed polarity table;
+    # the others go through TextBlob's own scorer.
+    def __init__(self, analyzer=pattern_sentiment):
+        self.analyzer = analyzer
+        self.ids: Optional[Dict[str, int]] = None
+        self.polarity = np.zeros(1)
+        self.known = np.zeros(1, dtype=bool)
+        self.contextual = np.zeros(1, dtype=bool)
+
+    def load(self) -> None:
+        analyzer = self.analyzer
+        if dict.__len__(analyzer) == 0:
+            analyzer.load()
+
+        ids: Dict[str, int] = {}
+        polarity: List[float] = [0.0]
+        known: List[bool] = [False]
+        contextual: List[bool] = [False]
+
+        def add(token: str, score: float, is_known: bool, is_contextual: bool) -> None:
+            if token in ids:
+                contextual[ids[token]] = contextual[ids[token]] or is_contextual
+                return
+            ids[token] = len(polarity)
+            polarity.append(score)
+            known.append(is_known)
+            contextual.append(is_contextual)
+
+        for word, scores in dict.items(analyzer):
+            if None not in scores:
+                continue
+            # Known adverbs modify the next known word
+            modifier = any(pos in scores for pos in analyzer.modifiers)
+            add(word, scores[None][0], True, modifier or word in analyzer.negations)
+
+        for word in analyzer.negations:
+            add(word, 0.0, False, True)
+        add("!", 0.0, False, True)
+        add("(!)", 0.0, False, True)
+        for emoticons in EMOTICONS.values():
+            for emoticon in emoticons:
+                token = emoticon.lower()
+                if token.isalpha() is False and len(token) <= 5 and token not in PUNCTUATION:
+                    add(token, 0.0, False, True)
+
+        self.polarity = np.array(polarity, dtype=np.float64)
+        self.known = np.array(known, dtype=bool)
+        self.contextual = np.array(contextual, dtype=bool)
+        self.ids = ids
+
+    def tokenize(self, text: str) -> List[str]:
+        # Same tokens TextBlob scores for a plain string
+        return [token.lower() for token in " ".join(self.analyzer.tokenizer(text)).split()]
+
+    def score(self, texts: Sequence[str]) -> np.ndarray:
+        if self.ids is None:
+            self.load()
+        ids = self.ids
+
+        token_ids: List[int] = []
+        owners: List[int] = []
+        for index, text in enumerate(texts):
+            tokens = [ids.get(token, UNKNOWN) for token in self.tokenize(text)]
+            token_ids.extend(tokens)
+            owners.extend([index] * len(tokens))
+
+        count = len(texts)
+        token_ids_array = np.array(token_ids, dtype=np.int64)
+        owners_array = np.array(owners, dtype=np.int64)
+
+        known = self.known[token_ids_array]
+        # bincount adds the weights of each text in token order, like TextBlob's average
+        sums = np.bincount(owners_array[known], weights=self.polarity[token_ids_array[known]], minlength=count)
+        counts = np.bincount(owners_array[known], minlength=count)
+        polarity = sums / np.maximum(counts, 1)
+
+        contextual = np.bincount(owners_array, weights=self.contextual[token_ids_array], minlength=count) > 0
+        for index in np.flatnonzero(contextual):
+            polarity[index] = self.analyzer(texts[index])[0]
+
+        return polarity
+
+def label(polarity: float) -> str:
+    if polarity > 0:
+        return "+"
+    if polarity < 0:
+        return "-"
+    return ""
@@ -1,27 +1,33 @@
-from typing import Any, Dict
+from typing import Any, AsyncIterator, Dict, Optional
 from nodes.nodes import get_nodes
 from core.node_base import NodeBase
 from core.types.context import Context
+from core.util.mapper import Mapper
 
 class Runner:
-    def __init__(self, node_name: str, ctx: Dict[str, Any]):
+    def __init__(self, node_name: str, ctx: Dict[str, Any], mapper: Optional[Mapper] = None):
         self.nodes = get_nodes()
         self.ctx = self.create_context(ctx)
         self.node_name = node_name
+        self.content_type = ""
+        self.mapper = mapper
 
     async def run(self):
         node: NodeBase = self.node_resolver(self.node_name, self.ctx.config)
         model = await node.process(self.ctx)
+        self.content_type = node.contentType
         return model.data
     
+    async def stream(self) -> AsyncIterator[Any]:
+        node: NodeBase = self.node_resolver(self.node_name, self.ctx.config)
+        self.content_type = node.contentType
+        async for chunk in node.process_stream(self.ctx):
+            yield chunk
+
     def node_resolver(self, node_name: str, config: Dict[str, Any]) -> NodeBase:
-        node: NodeBase = self.nodes[node_name]
-        node.node = config.get('node')
-        node.name = config.get('name')
-        node.active = config.get('active', True)
-        node.stop = config.get('stop', False)
-        node.set_var = config.get('set_var', False)
-        node.originalConfig = config
+        node = self.nodes[node_name].invocation(config)
+        if self.mapper is not None:
+            node.mapper = self.mapper
         return node
     
     def create_context(self, ctx: Dict[str, Any]) -> Context:
@@ -2,12 +2,32 @@ import json
 import grpc.aio # type: ignore
 import asyncio
 import os
+import signal
+import sys
+from typing import Optional
 import gen.node_pb2 as node_pb2
 import gen.node_pb2_grpc as node_pb2_grpc
-from util.message_manager import decode_message, encode_message
+from util.codecs import get_codec
+from util.message_manager import BINARY_MESSAGE_VERSION, decode_binary_message, decode_message, encode_binary_message, encode_message
 from runner import Runner
+from nodes.nodes import shutdown_nodes
+from core.executor import executors
 import traceback
 from core.types.context import Context
+from core.types.attachment import Attachment
+from util.shared_memory import SHM, open_segment, write_segment
+from util.session import SESSION_CONCURRENCY, SessionConfigs
+from util.lifecycle import preload as preload_runtime
+from util.memory import format_memory, memory_usage
+from core.util.inference_cache import INFERENCE_CACHE_STATS_INTERVAL, report_cache_stats
+
+BATCH_CONCURRENCY = int(os.getenv("BATCH_CONCURRENCY", "16"))
+BATCH_MAX_CONCURRENCY = int(os.getenv("BATCH_MAX_CONCURRENCY", "64"))
+# Per-message gRPC limit; large inputs go through ExecuteNodeUpload in chunks below it
+GRPC_MAX_MESSAGE_BYTES = int(os.getenv("GRPC_MAX_MESSAGE_BYTES", str(4 * 1024 * 1024)))
+UPLOAD_MAX_BYTES = int(os.getenv("UPLOAD_MAX_BYTES", str(64 * 1024 * 1024)))
+# Seconds in-flight calls get to finish on shutdown
+SERVER_GRACE = float(os.getenv("SERVER_GRACE", "3"))
 
 # Implement the service
 class NodeService(node_pb2_grpc.NodeServiceServicer):
@@ -25,32 +45,303 @@ class NodeService(node_pb2_grpc.NodeServiceServicer):
 
             return node_pb2.NodeResponse(Message=encode_response, Encoding="BASE64", Type="JSON")
         except Exception as e:
-            stack_trace = traceback.format_exc()
+            encode_error = encode_message(self.error_message(e), "JSON")
+            return node_pb2.NodeResponse(Message=encode_error, Encoding="BASE64", Type="JSON")
+
+    async def ExecuteNodeBinary(self, request, context):
+        return await self.execute_binary(request)
+
+    async def ExecuteNodeUpload(self, request_iterator, context):
+        request = None
+        parts = {}
+        content_types = {}
+        segments = []
+        shared = {}
+        size = 0
+        try:
+            try:
+                async for chunk in request_iterator:
+                    if chunk.HasField("Request"):
+                        request = chunk.Request
+                        continue
+
+                    attachment = chunk.Attachment
+                    if attachment.HasField("Shared"):
+                        segment = open_segment(attachment.Shared)
+                        segments.append(segment)
+                        shared[attachment.Name] = segment.view
+                        size += len(segment.view)
+                    else:
+                        parts.setdefault(attachment.Name, []).append(attachment.Data)
+                        size += len(attachment.Data)
+
+                    if size > UPLOAD_MAX_BYTES:
+                        raise ValueError(f"Upload exceeds the {UPLOAD_MAX_BYTES} bytes limit")
+                    if attachment.ContentType:
+                        content_types[attachment.Name] = attachment.ContentType
 
-            error_message = {
-                "error": str(e),
-                "stack": stack_trace
+                if request is None:
+                    raise ValueError("Upload stream did not include a request")
+            except Exception as e:
+                return self.binary_error(e, request)
+
+            attachments = {
+                name: Attachment(name, b"".join(chunks), content_types.get(name))
+                for name, chunks in parts.items()
             }
+            for name, view in shared.items():
+                attachments[name] = Attachment(name, view, content_types.get(name))
 
-            # Check if the exception message is a valid JSON
-            if isinstance(e, Exception):
-                try:
-                    error_message = json.loads(str(e))
-                except json.JSONDecodeError:
-                    pass
+            return await self.execute_binary(request, attachments)
+        finally:
+            for segment in segments:
+                segment.close()
 
-            encode_error = encode_message(error_message, "JSON")
-            return node_pb2.NodeResponse(Message=encode_error, Encoding="BASE64", Type="JSON")
+    async def ExecuteNodeStream(self, request, context):
+        accept = list(request.Accept)
+        sequence = 0
+        try:
+            runner = Runner(request.Name, self.binary_context(request))
+            async for chunk in runner.stream():
+                payload, codec = encode_binary_message(chunk, accept, request.Codec)
+                yield node_pb2.NodeChunk(
+                    Sequence=sequence,
+                    Payload=payload,
+                    Codec=codec.name,
+                    ContentType=self.content_type(runner, codec),
+                    Success=True,
+                )
+                sequence += 1
+
+            yield node_pb2.NodeChunk(Sequence=sequence, Success=True, Last=True)
+        except Exception as e:
+            payload, codec = self.encode_error(e, accept, request.Codec)
+            yield node_pb2.NodeChunk(
+                Sequence=sequence,
+                Payload=payload,
+                Codec=codec.name,
+                ContentType=codec.content_type,
+                Success=False,
+                Last=True,
+            )
+
+    async def ExecuteBatch(self, request, context):
+        items = [item async for item in self.execute_batch(request)]
+        items.sort(key=lambda item: item.Index)
+        return node_pb2.NodeBatchResponse(Items=items)
+
+    async def ExecuteBatchStream(self, request, context):
+        async for item in self.execute_batch(request):
+            yield item
+
+    async def execute_batch(self, request):
+        # Runs every request with bounded concurrency and yields results as they complete
+        concurrency = min(request.Concurrency or BATCH_CONCURRENCY, BATCH_MAX_CONCURRENCY)
+        semaphore = asyncio.Semaphore(max(concurrency, 1))
+
+        async def run(index, item):
+            async with semaphore:
+                return node_pb2.NodeBatchItem(Index=index, Response=await self.execute_binary(item))
+
+        tasks = [asyncio.create_task(run(index, item)) for index, item in enumerate(request.Requests)]
+        try:
+            for task in asyncio.as_completed(tasks):
+                yield await task
+        finally:
+            for task in tasks:
+                task.cancel()
+
+    async def ExecuteNodeSession(self, request_iterator, context):
+        configs = SessionConfigs()
+        semaphore = asyncio.Semaphore(max(SESSION_CONCURRENCY, 1))
+        responses = asyncio.Queue()
+        tasks = set()
+
+        async def invoke(message, registered):
+            async with semaphore:
+                response = await self.execute_binary(message.Invoke.Request, registered=registered)
+            await responses.put(node_pb2.NodeSessionResponse(Id=message.Id, ConfigId=message.Invoke.ConfigId, Response=response))
+
+        async def read():
+            # Registrations are handled in order, invocations run concurrently
+            try:
+                async for message in request_iterator:
+                    action = message.WhichOneof("Action")
+                    if action == "Invoke":
+                        # The config is resolved on arrival so a later Release does not affect it
+                        try:
+                            registered = configs.get(message.Invoke.ConfigId)
+                        except Exception as e:
+                            await responses.put(node_pb2.NodeSessionResponse(
+                                Id=message.Id,
+                                ConfigId=message.Invoke.ConfigId,
+                                Response=self.binary_error(e, message.Invoke.Request),
+                            ))
+                            continue
+                        task = asyncio.create_task(invoke(message, registered))
+                        tasks.add(task)
+                        task.add_done_callback(tasks.discard)
+                    elif action == "Register":
+                        await responses.put(self.session_register(configs, message))
+                    elif action == "Release":
+                        configs.release(message.Release.ConfigId)
+                if tasks:
+                    await asyncio.gather(*tasks)
+            finally:
+                await responses.put(None)
+
+        reader = asyncio.create_task(read())
+        try:
+            while True:
+                response = await responses.get()
+                if response is None:
+                    break
+                yield response
+            await reader
+        finally:
+            reader.cancel()
+            for task in list(tasks):
+                task.cancel()
+
+    def session_register(self, configs: SessionConfigs, message):
+        register = message.Register
+        try:
+            config = get_codec(register.Codec).decode(register.Config)
+            registered = configs.register(register.Name, config)
+        except Exception as e:
+            return node_pb2.NodeSessionResponse(Id=message.Id, Response=self.binary_error(e))
+
+        return node_pb2.NodeSessionResponse(
+            Id=message.Id,
+            ConfigId=registered.id,
+            Response=node_pb2.NodeBinaryResponse(Version=BINARY_MESSAGE_VERSION, Success=True),
+        )
+
+    async def execute_binary(self, request, attachments=None, registered=None):
+        accept = list(request.Accept)
+        try:
+            ctx = self.binary_context(request)
+            name = request.Name
+            mapper = None
+            if registered is not None:
+                # Session invocations only carry the per-request context
+                name = registered.name
+                ctx["config"] = registered.config
+                mapper = registered.mapper
+            runner = Runner(name, ctx, mapper)
+            if attachments:
+                runner.ctx.attachments = attachments
+            response = await runner.run()
+            payload, codec = encode_binary_message(response, accept, request.Codec)
+
+            if request.SharedResponseMinBytes and len(payload) >= request.SharedResponseMinBytes:
+                segment = write_segment(payload)
+                return node_pb2.NodeBinaryResponse(
+                    Version=BINARY_MESSAGE_VERSION,
+                    Shared=node_pb2.SharedMemoryRef(Kind=SHM, Handle=segment.name, Offset=0, Length=len(payload)),
+                    Codec=codec.name,
+                    ContentType=self.content_type(runner, codec),
+                    Success=True,
+                )
+
+            return node_pb2.NodeBinaryResponse(
+                Version=BINARY_MESSAGE_VERSION,
+                Payload=payload,
+                Codec=codec.name,
+                ContentType=self.content_type(runner, codec),
+                Success=True,
+            )
+        except Exception as e:
+            return self.binary_error(e, request)
+
+    def encode_error(self, e: Exception, accept, fallback):
+        # Errors are always deliverable: JSON when no accepted codec can encode them (e.g. raw only)
+        message = self.error_message(e)
+        try:
+            return encode_binary_message(message, accept, fallback)
+        except ValueError:
+            return encode_binary_message(message, [], None)
+
+    def binary_error(self, e: Exception, request=None):
+        accept = list(request.Accept) if request is not None else []
+        payload, codec = self.encode_error(e, accept, request.Codec if request is not None else None)
+        return node_pb2.NodeBinaryResponse(
+            Version=BINARY_MESSAGE_VERSION,
+            Payload=payload,
+            Codec=codec.name,
+            ContentType=codec.content_type,
+            Success=False,
+        )
+
+    def binary_context(self, request):
+        ctx = decode_binary_message(request)
+        if not isinstance(ctx, dict):
+            raise ValueError(f"{request.Codec or 'json'} payload must decode to an object")
+        return ctx
+
+    def content_type(self, runner: Runner, codec) -> str:
+        # Raw payloads carry the node's own content type, encoded payloads the codec's
+        if codec.name == "raw" and runner.content_type:
+            return runner.content_type
+        return codec.content_type
+
+    def error_message(self, e: Exception):
+        stack_trace = traceback.format_exc()
+
+        error_message = {
+            "error": str(e),
+            "stack": stack_trace
+        }
+
+        # Check if the exception message is a valid JSON
+        if isinstance(e, Exception):
+            try:
+                error_message = json.loads(str(e))
+            except json.JSONDecodeError:
+                pass
+
+        return error_message
 
 # Start the server
-async def serve():
-    server = grpc.aio.server()
+async def serve(preload: bool = True, worker: Optional[int] = None):
+    if preload:
+        preload_runtime()
+
+    options = [
+        ("grpc.max_receive_message_length", GRPC_MAX_MESSAGE_BYTES),
+        ("grpc.max_send_message_length", GRPC_MAX_MESSAGE_BYTES),
+    ]
+    if worker is not None:
+        # Worker processes of the supervisor all bind the same port
+        options.append(("grpc.so_reuseport", 1))
+
+    server = grpc.aio.server(options=options)
     node_pb2_grpc.add_NodeServiceServicer_to_server(NodeService(), server)
 
     port = os.getenv("SERVER_PORT", "50051")
     server.add_insecure_port(f"0.0.0.0:{port}")
 
-    print(f"Server started on port {port}...")
+    # Same-host callers (e.g. the runner in the same pod) can skip the TCP loopback.
+    # Unix sockets cannot be shared, so each worker listens on its own path.
+    socket_path = os.getenv("SERVER_SOCKET")
+    if socket_path:
+        if worker is not None:
+            socket_path = f"{socket_path}.{worker}"
+        if os.path.exists(socket_path):
+            os.unlink(socket_path)
+        server.add_insecure_port(f"unix:{socket_path}")
+        print(f"Server listening on unix:{socket_path}...")
+
+    if worker is None:
+        print(f"Server started on port {port}...")
+    else:
+        print(f"Worker {worker} ({os.getpid()}) started on port {port}, {format_memory(memory_usage())}")
+
+    # SIGTERM drains in-flight calls for up to SERVER_GRACE seconds before stopping
+    loop = asyncio.get_running_loop()
+    loop.add_signal_handler(signal.SIGTERM, lambda: asyncio.ensure_future(server.stop(grace=SERVER_GRACE)))
+
+    stats_task = asyncio.ensure_future(report_cache_stats()) if INFERENCE_CACHE_STATS_INTERVAL > 0 else None
 
     try:
         await server.start()
@@ -58,10 +349,20 @@ async def serve():
     except asyncio.CancelledError:
         print("\nServer shutdown requested...")
     finally:
-        await server.stop(grace=3)  # Graceful shutdown
+        if stats_task is not None:
+            stats_task.cancel()
+        loop.remove_signal_handler(signal.SIGTERM)
+        await server.stop(grace=SERVER_GRACE)  # Graceful shutdown
+        await shutdown_nodes()
+        executors.shutdown()
         print("Server stopped cleanly.")
 
 if __name__ == "__main__":
+    workers = int(os.getenv("SERVER_WORKERS", "1"))
+    if workers > 1:
+        from supervisor import Supervisor
+        sys.exit(Supervisor(workers, serve).run())
+
     try:
         asyncio.run(serve())
     except KeyboardInterrupt:
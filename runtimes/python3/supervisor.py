@@ -0,0 +1,197 @@
+import asyncio
+import gc
+import os
+import select
+import signal
+import time
+import traceback
+from typing import Any, Callable, Coroutine, Dict, Optional
+from util.lifecycle import preload
+from util.memory import memory_report
+
+# Workers write to their heartbeat pipe from the event loop, so a blocked loop
+# is detected the same way as a hung process
+HEARTBEAT_INTERVAL = float(os.getenv("WORKER_HEARTBEAT_INTERVAL", "1"))
+HEARTBEAT_TIMEOUT = float(os.getenv("WORKER_HEARTBEAT_TIMEOUT", "30"))
+# Workers that crash sooner than this after starting are restarted with a delay
+MIN_UPTIME = float(os.getenv("WORKER_MIN_UPTIME", "5"))
+RESTART_DELAY = float(os.getenv("WORKER_RESTART_DELAY", "1"))
+DRAIN_TIMEOUT = float(os.getenv("WORKER_DRAIN_TIMEOUT", str(float(os.getenv("SERVER_GRACE", "3")) + 5)))
+# Seconds between memory reports of all workers, 0 only reports on SIGUSR1
+MEMORY_REPORT_INTERVAL = float(os.getenv("WORKER_MEMORY_REPORT_INTERVAL", "0"))
+
+Serve = Callable[..., Coroutine[Any, Any, None]]
+
+class Worker:
+    def __init__(self, index: int, pid: int, fd: int):
+        self.index = index
+        self.pid = pid
+        self.fd = fd
+        self.started = time.monotonic()
+        self.last_seen = self.started
+
+async def heartbeat(fd: int) -> None:
+    while True:
+        try:
+            os.write(fd, b".")
+        except BrokenPipeError:
+            # The supervisor is gone: drain and exit instead of running orphaned
+            os.kill(os.getpid(), signal.SIGTERM)
+            return
+        await asyncio.sleep(HEARTBEAT_INTERVAL)
+
+async def run_worker(serve: Serve, index: int, fd: int) -> None:
+    task = asyncio.ensure_future(heartbeat(fd))
+    try:
+        await serve(preload=False, worker=index)
+    finally:
+        task.cancel()
+
+class Supervisor:
+    # Forks the gRPC server into N workers sharing the port through SO_REUSEPORT.
+    # Nodes and models are loaded before the fork, with model tensors in shared
+    # memory, so workers map the same pages instead of holding a copy each.
+    def __init__(self, workers: int, serve: Serve):
+        self.workers = workers
+        self.serve = serve
+        self.processes: Dict[int, Worker] = {}
+        self.restarts: Dict[int, float] = {}
+        self.stopping = False
+        self.deadline: Optional[float] = None
+        self.report_requested = False
+        self.reported_at = time.monotonic()
+
+    def run(self) -> int:
+        # No collections while models load, so nothing is left half-collected at the fork
+        gc.disable()
+        preload(share=True)
+
+        signal.signal(signal.SIGTERM, lambda *args: self.stop())
+        signal.signal(signal.SIGINT, lambda *args: self.stop())
+        signal.signal(signal.SIGUSR1, lambda *args: self.request_report())
+
+        print(f"Supervisor {os.getpid()} starting {self.workers} workers...")
+        for index in range(self.workers):
+            self.spawn(index)
+        gc.enable()
+
+        while self.processes or (self.restarts and not self.stopping):
+            self.poll(HEARTBEAT_INTERVAL)
+
+        print("Supervisor stopped cleanly.")
+        return 0
+
+    def spawn(self, index: int) -> None:
+        read_fd, write_fd = os.pipe()
+        pid = os.fork()
+        if pid == 0:
+            os.close(read_fd)
+            code = 0
+            try:
+                for worker in self.processes.values():
+                    os.close(worker.fd)
+                signal.signal(signal.SIGTERM, signal.SIG_DFL)
+                signal.signal(signal.SIGUSR1, signal.SIG_DFL)
+                gc.enable()
+                # Ctrl+C reaches the whole process group; the supervisor decides how workers stop
+                signal.signal(signal.SIGINT, signal.SIG_IGN)
+                asyncio.run(run_worker(self.serve, index, write_fd))
+            except BaseException:
+                traceback.print_exc()
+                code = 1
+            finally:
+                os._exit(code)
+
+        os.close(write_fd)
+        os.set_blocking(read_fd, False)
+        self.processes[pid] = Worker(index, pid, read_fd)
+
+    def poll(self, timeout: float) -> None:
+        fds = {worker.fd: worker for worker in self.processes.values()}
+        try:
+            readable, _, _ = select.select(list(fds), [], [], timeout) if fds else ([], [], [])
+        except InterruptedError:
+            readable = []
+        if not fds:
+            time.sleep(timeout)
+
+        now = time.monotonic()
+        for fd in readable:
+            try:
+                if os.read(fd, 4096):
+                    fds[fd].last_seen = now
+            except BlockingIOError:
+                pass
+
+        self.reap()
+        self.check(now)
+
+        if self.report_requested or (MEMORY_REPORT_INTERVAL > 0 and now - self.reported_at >= MEMORY_REPORT_INTERVAL):
+            self.report(now)
+
+    def reap(self) -> None:
+        while self.processes:
+            try:
+                pid, status = os.waitpid(-1, os.WNOHANG)
+            except ChildProcessError:
+                return
+            if pid == 0:
+                return
+
+            worker = self.processes.pop(pid, None)
+            if worker is None:
+                continue
+            os.close(worker.fd)
+
+            if self.stopping:
+                continue
+
+            uptime = time.monotonic() - worker.started
+            print(f"Worker {worker.index} ({pid}) exited with status {os.waitstatus_to_exitcode(status)} after {uptime:.1f}s, restarting...")
+            self.restarts[worker.index] = time.monotonic() + (RESTART_DELAY if uptime < MIN_UPTIME else 0)
+
+    def check(self, now: float) -> None:
+        if self.stopping:
+            if self.deadline is not None and now > self.deadline:
+                for pid in self.processes:
+                    print(f"Worker {self.processes[pid].index} ({pid}) did not drain in time, killing...")
+                    self.kill(pid, signal.SIGKILL)
+                self.deadline = None
+            return
+
+        for pid, worker in list(self.processes.items()):
+            if now - worker.last_seen > HEARTBEAT_TIMEOUT:
+                print(f"Worker {worker.index} ({pid}) missed its heartbeat for {now - worker.last_seen:.1f}s, killing...")
+                self.kill(pid, signal.SIGKILL)
+                # Reaped and restarted on the next poll
+                worker.last_seen = now
+
+        for index, restart_at in list(self.restarts.items()):
+            if now >= restart_at:
+                del self.restarts[index]
+                self.spawn(index)
+
+    def request_report(self) -> None:
+        self.report_requested = True
+
+    def report(self, now: float) -> None:
+        self.report_requested = False
+        self.reported_at = now
+        for line in memory_report({worker.index: pid for pid, worker in self.processes.items()}):
+            print(line)
+
+    def stop(self) -> None:
+        if self.stopping:
+            return
+        print("Supervisor draining workers...")
+        self.stopping = True
+        self.restarts.clear()
+        self.deadline = time.monotonic() + DRAIN_TIMEOUT
+        for pid in list(self.processes):
+            self.kill(pid, signal.SIGTERM)
+
+    def kill(self, pid: int, sig: int) -> None:
+        try:
+            os.kill(pid, sig)
+        except ProcessLookupError:
+            pass
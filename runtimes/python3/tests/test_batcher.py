@@ -0,0 +1,96 @@
+import threading
+import unittest
+from concurrent.futures import ThreadPoolExecutor
+from core.util.batcher import MicroBatcher
+
+class TestMicroBatcher(unittest.TestCase):
+    def test_batches_concurrent_items(self):
+        batches = []
+        def double(items):
+            batches.append(list(items))
+            return [item * 2 for item in items]
+
+        batcher = MicroBatcher(double, max_size=8, max_wait=0.2)
+        barrier = threading.Barrier(8)
+        def submit(item):
+            barrier.wait()
+            return batcher(item)
+
+        with ThreadPoolExecutor(max_workers=8) as pool:
+            results = list(pool.map(submit, range(8)))
+        batcher.close()
+
+        self.assertEqual(results, [item * 2 for item in range(8)])
+        self.assertLess(len(batches), 8)
+        self.assertEqual(sorted(item for batch in batches for item in batch), list(range(8)))
+
+    def test_max_size(self):
+        batches = []
+        def identity(items):
+            batches.append(len(items))
+            return items
+
+        batcher = MicroBatcher(identity, max_size=2, max_wait=0.05)
+        futures = [batcher.submit(item) for item in range(5)]
+        self.assertEqual([future.result() for future in futures], list(range(5)))
+        batcher.close()
+
+        self.assertTrue(all(size <= 2 for size in batches))
+
+    def test_error_propagates_to_batch(self):
+        def fail(items):
+            raise RuntimeError("model failed")
+
+        batcher = MicroBatcher(fail, max_size=4, max_wait=0.01)
+        with self.assertRaises(RuntimeError):
+            batcher(1)
+        batcher.close()
+
+    def test_failing_item_only_fails_its_caller(self):
+        batches = []
+        def check(items):
+            batches.append(len(items))
+            if "bad" in items:
+                raise ValueError("bad item")
+            return [item.upper() for item in items]
+
+        batcher = MicroBatcher(check, max_size=4, max_wait=0.2)
+        futures = [batcher.submit(item) for item in ("a", "bad", "b")]
+        batcher.close()
+
+        self.assertEqual(futures[0].result(), "A")
+        self.assertEqual(futures[2].result(), "B")
+        with self.assertRaises(ValueError):
+            futures[1].result()
+        # The batch failed once, then each item ran alone
+        self.assertEqual(batches, [3, 1, 1, 1])
+
+    def test_failed_batch_without_item_retries(self):
+        batches = []
+        def insert(items):
+            batches.append(list(items))
+            raise TimeoutError("insert timed out")
+
+        batcher = MicroBatcher(insert, max_size=4, max_wait=0.2, retry_items=False)
+        futures = [batcher.submit(item) for item in ("a", "b", "c")]
+        batcher.close()
+
+        for future in futures:
+            with self.assertRaises(TimeoutError):
+                future.result()
+        self.assertEqual(batches, [["a", "b", "c"]])
+
+    def test_result_count_mismatch(self):
+        batcher = MicroBatcher(lambda items: [], max_size=4, max_wait=0.01)
+        with self.assertRaises(ValueError):
+            batcher(1)
+        batcher.close()
+
+    def test_closed(self):
+        batcher = MicroBatcher(lambda items: items)
+        batcher.close()
+        with self.assertRaises(RuntimeError):
+            batcher.submit(1)
+
+if __name__ == '__main__':
+    unittest.main()
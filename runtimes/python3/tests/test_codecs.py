@@ -0,0 +1,45 @@
+import unittest
+from core.types.response import ResponseContext
+from util.codecs import codecs, get_codec, negotiate
+
+class TestCodecs(unittest.TestCase):
+    def test_json_round_trip(self):
+        codec = get_codec("json")
+        message = {"name": "café", "url": "https://example.com/a", "items": [1, 2.5, None, True]}
+        self.assertEqual(codec.decode(codec.encode(message)), message)
+
+    def test_json_to_dict(self):
+        codec = get_codec("JSON")
+        payload = codec.encode(ResponseContext(data={"a": 1}, success=True))
+        self.assertEqual(codec.decode(payload)["data"], {"a": 1})
+
+    @unittest.skipUnless("msgpack" in codecs, "msgpack is not installed")
+    def test_msgpack_round_trip(self):
+        codec = get_codec("msgpack")
+        message = {"pdf": b"%PDF-1.4", "name": "report"}
+        self.assertEqual(codec.decode(codec.encode(message)), message)
+
+    def test_raw_passthrough(self):
+        codec = get_codec("raw")
+        self.assertEqual(codec.encode(memoryview(b"abc")), b"abc")
+        with self.assertRaises(TypeError):
+            codec.encode({"a": 1})
+
+    def test_unsupported_codec(self):
+        with self.assertRaises(ValueError):
+            get_codec("xml")
+
+    def test_negotiate(self):
+        self.assertEqual(negotiate(b"%PDF", ["raw", "json"]).name, "raw")
+        self.assertEqual(negotiate({"a": 1}, ["raw", "json"]).name, "json")
+        self.assertEqual(negotiate({"a": 1}, ["unknown"]).name, "json")
+        self.assertEqual(negotiate(b"%PDF", []).name, "raw")
+        self.assertEqual(negotiate({"a": 1}, ["unknown", "msgpack"], "json").name, "msgpack" if "msgpack" in codecs else "json")
+
+    def test_negotiate_binary_json_only(self):
+        # Bytes cannot be sent as JSON, and raw was not accepted
+        with self.assertRaises(ValueError):
+            negotiate(b"%PDF", ["json"])
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,38 @@
+import unittest
+from unittest.mock import patch
+from core.util.cpu_inference import compare, cosine_similarity, cpu_mode, thread_count
+
+class TestCpuInference(unittest.TestCase):
+    def test_cpu_mode(self):
+        with patch.dict("os.environ", {"CLIP_CPU_MODE": "INT8"}):
+            self.assertEqual(cpu_mode("CLIP"), "int8")
+        with patch.dict("os.environ", {}, clear=True):
+            self.assertEqual(cpu_mode("CLIP"), "fp32")
+        with patch.dict("os.environ", {"CLIP_CPU_MODE": "fp16"}):
+            with self.assertRaises(ValueError):
+                cpu_mode("CLIP")
+
+    def test_thread_count_per_worker(self):
+        with patch("core.util.cpu_inference.CPU_COUNT", 8), patch.dict("os.environ", {"SERVER_WORKERS": "4"}, clear=True):
+            self.assertEqual(thread_count(), 2)
+        with patch.dict("os.environ", {"TORCH_NUM_THREADS": "3"}):
+            self.assertEqual(thread_count(), 3)
+
+    def test_compare_vectors(self):
+        report = compare(lambda x: [x, 1.0], lambda x: [x, 1.0], [1.0, 2.0], repeat=1)
+
+        self.assertEqual(report["samples"], 2)
+        self.assertAlmostEqual(report["cosine_min"], 1.0)
+        self.assertNotIn("exact_match", report)
+
+    def test_compare_captions(self):
+        report = compare(lambda x: f"caption {x}", lambda x: "caption 1", [1, 2], repeat=1)
+
+        self.assertEqual(report["exact_match"], 0.5)
+
+    def test_cosine_similarity(self):
+        self.assertAlmostEqual(cosine_similarity([1, 0], [0, 1]), 0.0)
+        self.assertAlmostEqual(cosine_similarity([1, 2], [2, 4]), 1.0)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,53 @@
+import os
+import threading
+import unittest
+from typing import Any, Dict
+from core.types.context import Context
+from core.types.nanoservice_response import NanoServiceResponse
+from core.nanoservice import NanoService
+from core.executor import INLINE, PROCESS, THREAD, NodeExecutors, execute, executors
+
+class WhereNode(NanoService):
+    async def handle(self, ctx: Context, inputs: Dict[str, Any]) -> NanoServiceResponse:
+        response = NanoServiceResponse()
+        response.setSuccess({
+            "name": self.name,
+            "pid": os.getpid(),
+            "thread": threading.get_ident(),
+            "inputs": inputs,
+        })
+        return response
+
+class TestExecutor(unittest.IsolatedAsyncioTestCase):
+    @classmethod
+    def tearDownClass(cls):
+        executors.shutdown()
+
+    def node(self, execution: str) -> WhereNode:
+        node = WhereNode().invocation({"name": "where", "node": "where"})
+        node.originalConfig = {"name": "where", "node": "where"}
+        node.execution = execution
+        return node
+
+    async def test_inline(self):
+        result = await execute(self.node(INLINE), Context(), {"a": 1})
+        self.assertEqual(result.data["thread"], threading.get_ident())
+
+    async def test_thread(self):
+        result = await execute(self.node(THREAD), Context(), {"a": 1})
+        self.assertEqual(result.data["pid"], os.getpid())
+        self.assertNotEqual(result.data["thread"], threading.get_ident())
+        self.assertEqual(result.data["inputs"], {"a": 1})
+
+    async def test_process(self):
+        result = await execute(self.node(PROCESS), Context(), {"a": 1})
+        self.assertNotEqual(result.data["pid"], os.getpid())
+        self.assertEqual(result.data["name"], "where")
+        self.assertEqual(result.data["inputs"], {"a": 1})
+
+    def test_unsupported_execution_class(self):
+        with self.assertRaises(ValueError):
+            NodeExecutors().get("gpu")
+
+if __name__ == '__main__':
+    unittest.main()
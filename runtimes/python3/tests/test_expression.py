@@ -0,0 +1,85 @@
+import unittest
+from core.types.context import Context
+from core.util.expression import ExpressionError, compile_expression, evaluate
+from core.util.mapper import Mapper
+
+ESCAPES = [
+    "[list(g) for a in [0] for g in [({'get': g.gi_frame.f_back.f_back.f_back.f_globals['os'].system}.get('echo PWNED') for z in [1])]]",
+    "[g.gi_frame.f_globals for g in [(x for x in [1])]]",
+    "[g.gi_code for g in [(x for x in [1])]]",
+    "(x for x in [1]).gi_frame",
+    "{'get': len}.get('get')('abc')",
+    "[len for len in [ctx]]",
+    "[f(1) for f in [data]]",
+    "data.get.__self__",
+    "ctx.logger",
+    "ctx.request.get",
+    "'{0.__class__}'.format(ctx)",
+    "ctx.handle()",
+]
+
+class TestExpression(unittest.TestCase):
+    def setUp(self):
+        self.ctx = Context()
+        self.ctx.request = {"body": {"items": [{"id": "a1"}, {"id": "b2"}]}}
+        self.ctx.vars = {"step": {"count": 2}}
+
+    def test_path_fast_path(self):
+        expression = compile_expression("ctx.request.body.items[1].id")
+        self.assertIsNotNone(expression.path)
+        self.assertIsNone(expression.fn)
+        self.assertEqual(expression(self.ctx), "b2")
+        self.assertEqual(evaluate("ctx.vars['step'][\"count\"]", self.ctx), 2)
+        self.assertEqual(evaluate("data['key']", self.ctx, {"key": 1}), 1)
+
+    def test_compiled_expression(self):
+        self.assertEqual(evaluate("data['key'] + 1", self.ctx, {"key": 1}), 2)
+        self.assertEqual(evaluate("len(ctx.request.body.items)", self.ctx), 2)
+        self.assertEqual(evaluate("[item.id.upper() for item in ctx.request.body.items]", self.ctx), ["A1", "B2"])
+        self.assertEqual(evaluate("'yes' if ctx.vars.step['count'] > 1 else 'no'", self.ctx), "yes")
+
+    def test_cached(self):
+        self.assertIs(compile_expression("data['key'] * 2"), compile_expression("data['key'] * 2"))
+
+    def test_rejects_unsafe_expressions(self):
+        for source in [
+            "__import__('os').system('id')",
+            "open('/etc/passwd')",
+            "ctx.__class__.__mro__",
+            "(lambda: 1)()",
+            "data['key'].format(ctx)",
+            "[c for c in ().__class__.__bases__]",
+            "ctx['__init__']['__globals__']['__builtins__']['__import__']",
+            "ctx['__init__']['__globals__']['__builtins__']['open']",
+            "ctx.request[\"__class__\"]",
+        ]:
+            with self.assertRaises(ExpressionError, msg=source):
+                evaluate(source, self.ctx, {"key": "{0}"})
+
+    def test_rejects_sandbox_escapes(self):
+        mapper = Mapper()
+        for source in ESCAPES:
+            with self.assertRaises(Exception, msg=source) as raised:
+                evaluate(source, self.ctx, {"get": len})
+            self.assertIsInstance(raised.exception, (ExpressionError, AttributeError, TypeError), source)
+            # Failing placeholders are left as written, never executed
+            self.assertEqual(mapper.replace_string("${" + source + "}", self.ctx, {}), "${" + source + "}")
+            self.assertEqual(mapper.replace_string("js/" + source, self.ctx, {}), "js/" + source)
+
+    def test_methods_resolve_on_builtin_types(self):
+        # A dict value stored under a method name is data, not a method
+        self.assertIsNone(evaluate("data.get('missing')", self.ctx, {"get": len}))
+        self.assertEqual(evaluate("data['get']", self.ctx, {"get": 1}), 1)
+        self.assertEqual(evaluate("ctx.request.get('body')['items'][0].get('id')", self.ctx), "a1")
+        self.assertEqual(evaluate("','.join(data['names']).upper()", self.ctx, {"names": ["a", "b"]}), "A,B")
+        self.assertEqual(evaluate("sorted(data.keys())", self.ctx, {"b": 1, "a": 2}), ["a", "b"])
+        self.assertEqual(evaluate("sum(x for x in data['values'])", self.ctx, {"values": [1, 2]}), 3)
+
+    def test_missing_path_raises(self):
+        with self.assertRaises(AttributeError):
+            evaluate("ctx.request.body.missing", self.ctx)
+        with self.assertRaises(KeyError):
+            evaluate("ctx.request['missing']", self.ctx)
+
+if __name__ == '__main__':
+    unittest.main()
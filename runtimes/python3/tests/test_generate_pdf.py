@@ -0,0 +1,76 @@
+import asyncio
+import base64
+import os
+import tempfile
+import unittest
+from unittest.mock import patch
+from core.executor import executors
+from core.types.context import Context
+from nodes.generate_pdf.node import GeneratePDF
+from nodes.generate_pdf.report import SalesReport
+
+def sales(count: int):
+    return [{"product": f"Product {i}", "quantity": i, "price": 2.5, "total": 2.5 * i} for i in range(count)]
+
+def decode(response) -> bytes:
+    return base64.b64decode(response.data["pdf_base64"])
+
+class TestGeneratePDF(unittest.TestCase):
+    def setUp(self):
+        self.cwd = os.getcwd()
+        self.dir = tempfile.TemporaryDirectory()
+        os.chdir(self.dir.name)
+
+    def tearDown(self):
+        os.chdir(self.cwd)
+        self.dir.cleanup()
+
+    def test_render_in_memory(self):
+        data = SalesReport().render("Sales", sales(3))
+
+        self.assertTrue(data.startswith(b"%PDF"))
+        self.assertEqual(os.listdir(self.dir.name), [])
+
+    def test_concurrent_calls_do_not_share_output(self):
+        node = GeneratePDF()
+
+        async def run():
+            return await asyncio.gather(*[
+                node.handle(Context(), {"title": f"Report {i}", "sales_data": sales(i + 1)})
+                for i in range(4)
+            ])
+
+        documents = [decode(response) for response in asyncio.run(run())]
+
+        self.assertEqual(len(set(documents)), 4)
+        self.assertEqual(os.listdir(self.dir.name), [])
+
+    def test_large_table_in_process_pool(self):
+        node = GeneratePDF()
+        node.process_rows = 10
+        rows = sales(50)
+
+        try:
+            response = asyncio.run(node.handle(Context(), {"title": "Sales", "sales_data": rows}))
+        finally:
+            executors.shutdown()
+
+        self.assertTrue(response.success)
+        # Same document as the in-thread path, up to the creation date
+        self.assertEqual(len(decode(response)), len(SalesReport().render("Sales", rows)))
+
+    def test_stream_raw_slices(self):
+        node = GeneratePDF()
+        rows = sales(200)
+
+        async def collect():
+            return [bytes(chunk) async for chunk in node.stream(Context(), {"title": "Sales", "sales_data": rows})]
+
+        with patch("nodes.generate_pdf.node.STREAM_CHUNK_SIZE", 1024):
+            chunks = asyncio.run(collect())
+
+        self.assertGreater(len(chunks), 1)
+        self.assertTrue(all(len(chunk) <= 1024 for chunk in chunks))
+        document = b"".join(chunks)
+        self.assertTrue(document.startswith(b"%PDF"))
+        self.assertEqual(len(document), len(SalesReport().render("Sales", rows)))
@@ -0,0 +1,24 @@
+import unittest
+from util.http_session import HttpSessionPool
+
+class TestHttpSessionPool(unittest.IsolatedAsyncioTestCase):
+    async def test_session_is_reused(self):
+        pool = HttpSessionPool(limit=10, limit_per_host=2, keepalive_timeout=5, dns_ttl=60)
+        session = await pool.get()
+        self.assertIs(await pool.get(), session)
+        self.assertEqual(session.connector.limit, 10)
+        self.assertEqual(session.connector.limit_per_host, 2)
+        await pool.close()
+        self.assertTrue(session.closed)
+
+    async def test_session_is_recreated_after_close(self):
+        pool = HttpSessionPool()
+        first = await pool.get()
+        await pool.close()
+        second = await pool.get()
+        self.assertIsNot(first, second)
+        self.assertFalse(second.closed)
+        await pool.close()
+
+if __name__ == '__main__':
+    unittest.main()
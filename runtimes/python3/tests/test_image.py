@@ -0,0 +1,59 @@
+import base64
+import io
+import unittest
+from PIL import Image # type: ignore
+from core.util.image import decode_data_url, decode_image
+
+def encode(size, format: str, mode: str = "RGB") -> bytes:
+    buffer = io.BytesIO()
+    Image.new(mode, size, "blue" if mode == "RGB" else 128).save(buffer, format=format)
+    return buffer.getvalue()
+
+class TestImage(unittest.TestCase):
+    def test_jpeg_draft(self):
+        image = decode_image(encode((4000, 3000), "JPEG"), 224)
+
+        self.assertEqual(image.mode, "RGB")
+        # libjpeg scales by 1/2, 1/4 or 1/8 and never below the requested size
+        self.assertEqual(image.size, (500, 375))
+
+    def test_png_reduce(self):
+        image = decode_image(encode((2000, 1000), "PNG"), 384)
+
+        self.assertEqual(image.size, (1000, 500))
+        self.assertGreaterEqual(min(image.size), 384)
+
+    def test_reduce_unsupported_modes(self):
+        for mode in ("P", "1", "I;16"):
+            image = decode_image(encode((1000, 800), "PNG", mode), 224)
+
+            self.assertEqual(image.mode, "RGB", mode)
+            self.assertEqual(image.size, (334, 267), mode)
+
+    def test_palette_colors_survive_reduce(self):
+        buffer = io.BytesIO()
+        Image.new("RGB", (1000, 800), (200, 30, 40)).convert("P", palette=Image.ADAPTIVE).save(buffer, format="GIF")
+
+        image = decode_image(buffer.getvalue(), 224)
+
+        self.assertEqual(image.getpixel((10, 10)), (200, 30, 40))
+
+    def test_small_images_are_not_scaled(self):
+        self.assertEqual(decode_image(encode((300, 200), "JPEG"), 224).size, (300, 200))
+        self.assertEqual(decode_image(encode((300, 200), "PNG"), 224).size, (300, 200))
+
+    def test_full_resolution(self):
+        image = decode_image(memoryview(encode((640, 480), "PNG", "L")))
+
+        self.assertEqual(image.size, (640, 480))
+        self.assertEqual(image.mode, "RGB")
+
+    def test_decode_data_url(self):
+        data = encode((10, 10), "PNG")
+        encoded = base64.b64encode(data).decode()
+
+        self.assertEqual(decode_data_url(f"data:image/png;base64,{encoded}"), data)
+        self.assertEqual(decode_data_url(encoded), data)
+
+if __name__ == '__main__':
+    unittest.main()
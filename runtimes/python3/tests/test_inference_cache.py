@@ -0,0 +1,87 @@
+import asyncio
+import io
+import os
+import tempfile
+import unittest
+from contextlib import redirect_stdout
+from core.util.inference_cache import InferenceCache, cache_key, cache_stats, get_cache, report_cache_stats
+
+class TestInferenceCache(unittest.TestCase):
+    def test_cache_key(self):
+        self.assertEqual(cache_key("clip", "text", b"abc"), cache_key("clip", "text", memoryview(b"abc")))
+        self.assertNotEqual(cache_key("clip", "text", "abc"), cache_key("blip", "text", "abc"))
+        # Parts are length-prefixed, so boundaries are part of the key
+        self.assertNotEqual(cache_key("clip", "ab", "c"), cache_key("clip", "a", "bc"))
+
+    def test_hits_and_misses(self):
+        cache = InferenceCache("test", max_bytes=1024)
+        calls = []
+        compute = lambda: calls.append(1) or [0.1, 0.2]
+
+        self.assertEqual(cache.get_or_compute("key", compute), [0.1, 0.2])
+        self.assertEqual(cache.get_or_compute("key", compute), [0.1, 0.2])
+
+        self.assertEqual(len(calls), 1)
+        stats = cache.stats()
+        self.assertEqual((stats["hits"], stats["misses"]), (1, 1))
+        self.assertEqual(stats["hit_rate"], 0.5)
+
+    def test_byte_budget(self):
+        cache = InferenceCache("test", max_bytes=20)
+        cache.put("a", "x" * 8)
+        cache.put("b", "y" * 8)
+        cache.get("a")
+        cache.put("c", "z" * 8)
+
+        self.assertEqual(list(cache.entries), ["a", "c"])
+        self.assertLessEqual(cache.size, 20)
+        self.assertEqual(cache.stats()["evictions"], 1)
+
+        cache.put("large", "x" * 100)
+        self.assertNotIn("large", cache.entries)
+
+    def test_disk_tier(self):
+        with tempfile.TemporaryDirectory() as directory:
+            cache = InferenceCache("test", max_bytes=1024, directory=directory)
+            cache.put("key", {"caption": "a red bicycle"})
+            cache.close()
+
+            self.assertTrue(os.path.exists(os.path.join(directory, "test.sqlite")))
+
+            reopened = InferenceCache("test", max_bytes=1024, directory=directory)
+            self.assertEqual(reopened.get("key"), (True, {"caption": "a red bicycle"}))
+            self.assertEqual(reopened.stats()["disk_hits"], 1)
+            self.assertEqual(reopened.get("key"), (True, {"caption": "a red bicycle"}))
+            self.assertEqual(reopened.stats()["hits"], 1)
+            reopened.close()
+
+    def test_disabled(self):
+        cache = InferenceCache("test", max_bytes=0)
+        calls = []
+        cache.get_or_compute("key", lambda: calls.append(1))
+        cache.get_or_compute("key", lambda: calls.append(1))
+        self.assertEqual(len(calls), 2)
+
+
+    def test_report_cache_stats(self):
+        cache = get_cache("test-report")
+        cache.get_or_compute(cache_key("m", "a"), lambda: 1)
+        before = cache_stats()["test-report"]
+        cache.get_or_compute(cache_key("m", "a"), lambda: 1)
+
+        # Counters change while the cache is in use and are reported periodically
+        self.assertEqual(cache_stats()["test-report"]["hits"], before["hits"] + 1)
+
+        async def report():
+            task = asyncio.ensure_future(report_cache_stats(0.01))
+            await asyncio.sleep(0.05)
+            task.cancel()
+
+        output = io.StringIO()
+        with redirect_stdout(output):
+            asyncio.run(report())
+        self.assertIn("Inference cache test-report: 1 entries", output.getvalue())
+        self.assertIn("1 hits, 0 disk hits, 1 misses", output.getvalue())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -1,5 +1,7 @@
 import unittest
-from core.util.mapper import Mapper
+from unittest.mock import patch
+from core.util.mapper import Mapper, TemplateMapper, collect_templates
+from core.types.context import Context
 
 class TestMapper(unittest.TestCase):
     def setUp(self):
@@ -19,6 +21,30 @@ class TestMapper(unittest.TestCase):
         self.assertEqual(obj["key2"], "replaced_value")
         self.assertEqual(obj["nested"]["key3"], "nested_replaced_value")
 
+    def test_replace_object_strings_lists(self):
+        obj = {"items": ["${replace_me}", {"key": "${replace_me}"}]}
+        self.mapper.replace_object_strings(obj, {}, {"replace_me": "replaced_value"})
+        self.assertEqual(obj["items"][0], "replaced_value")
+        self.assertEqual(obj["items"][1]["key"], "replaced_value")
+
+    def test_map_object(self):
+        static = {"a": [1, 2, {"b": "c"}]}
+        obj = {
+            "static": static,
+            "items": ["plain", "${replace_me}"],
+            "nested": {"key": "nested_${replace_me}"}
+        }
+        result = self.mapper.map_object(obj, {}, {"replace_me": "replaced_value"})
+        self.assertEqual(result["items"], ["plain", "replaced_value"])
+        self.assertEqual(result["nested"]["key"], "nested_replaced_value")
+        self.assertIs(result["static"], static)
+        self.assertEqual(obj["items"][1], "${replace_me}")
+        self.assertEqual(obj["nested"]["key"], "nested_${replace_me}")
+
+    def test_map_object_without_placeholders(self):
+        obj = {"a": ["b", {"c": 1}]}
+        self.assertIs(self.mapper.map_object(obj, {}, {}), obj)
+
     def test_replace_string(self):
         str_data = "This is a ${replace_me} string"
         ctx = {}
@@ -47,5 +73,45 @@ class TestMapper(unittest.TestCase):
         result = self.mapper.js_mapper(str_, ctx, data)
         self.assertEqual(result, "no_js_prefix")
 
+    def test_compile_is_cached(self):
+        template = self.mapper.compile("Hello ${data['name']}!")
+        self.assertIs(self.mapper.compile("Hello ${data['name']}!"), template)
+        self.assertFalse(template.static)
+        self.assertEqual(template.substitute({}, {"name": "Ada"}), "Hello Ada!")
+        self.assertEqual(template.substitute({}, {"name": "Bob"}), "Hello Bob!")
+
+    def test_compile_static_string(self):
+        template = self.mapper.compile("no placeholders")
+        self.assertTrue(template.static)
+        self.assertEqual(self.mapper.replace_string("no placeholders", {}, {}), "no placeholders")
+
+    def test_replace_string_keeps_failing_placeholder(self):
+        result = self.mapper.replace_string("a ${missing[} b ${key}", {}, {"key": "k"})
+        self.assertEqual(result, "a ${missing[} b k")
+
+    def test_replace_string_context_path(self):
+        ctx = Context()
+        ctx.request = {"body": {"name": "Ada"}}
+        self.assertEqual(self.mapper.replace_string("Hi ${ctx.request.body.name}", ctx, {}), "Hi Ada")
+        self.assertEqual(self.mapper.replace_string("js/ctx.request.body.name", ctx, {}), "Ada")
+
+    def test_replace_string_keeps_unsafe_placeholder(self):
+        source = "${ctx['__init__']['__globals__']['__builtins__']['__import__']}"
+        self.assertEqual(self.mapper.replace_string(source, Context(), {}), source)
+
+    def test_template_mapper_uses_precompiled_templates(self):
+        config = {"greeting": "Hi ${data['name']}", "items": ["plain", "js/data['n'] + 1"]}
+        templates = collect_templates(config, {})
+        self.assertEqual(set(templates), {"Hi ${data['name']}", "js/data['n'] + 1"})
+
+        with patch("core.util.mapper.compile_template", side_effect=AssertionError("compiled per call")):
+            result = TemplateMapper(templates).map_object(config, {}, {"name": "Ada", "n": 1})
+
+        self.assertEqual(result, {"greeting": "Hi Ada", "items": ["plain", "2"]})
+
+    def test_replace_string_js(self):
+        result = self.mapper.replace_string("js/data['key'] * 2", {}, {"key": 2})
+        self.assertEqual(result, "4")
+
 if __name__ == '__main__':
     unittest.main()
\ No newline at end of file
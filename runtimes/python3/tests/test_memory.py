@@ -0,0 +1,19 @@
+import os
+import unittest
+from util.memory import format_memory, memory_report, memory_usage
+
+class TestMemory(unittest.TestCase):
+    def test_memory_usage(self):
+        usage = memory_usage()
+        self.assertGreater(usage["rss_mb"], 0)
+
+    def test_memory_report(self):
+        lines = memory_report({0: os.getpid()})
+        self.assertEqual(len(lines), 1)
+        self.assertTrue(lines[0].startswith(f"Worker 0 ({os.getpid()}): rss="))
+
+    def test_format_memory(self):
+        self.assertEqual(format_memory({"rss_mb": 1.5, "pss_mb": 0.25}), "rss=1.5MB pss=0.2MB")
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,140 @@
+import threading
+import unittest
+from unittest.mock import patch
+from core.util.model_registry import ModelRegistry, estimate_size, preload_models, share_memory
+
+class FakeTensor:
+    def __init__(self, count: int):
+        self.count = count
+
+    def numel(self):
+        return self.count
+
+    def element_size(self):
+        return 4
+
+class FakeModel:
+    def __init__(self):
+        self.shared = False
+
+    def share_memory(self):
+        self.shared = True
+
+    def parameters(self):
+        return [FakeTensor(10), FakeTensor(5)]
+
+    def buffers(self):
+        return [FakeTensor(1)]
+
+class QuantizedModel(FakeModel):
+    def __init__(self):
+        super().__init__()
+        self.embedding = FakeTensor(10)
+
+    def parameters(self):
+        # Quantized Linear weights are not parameters
+        return [self.embedding]
+
+    def state_dict(self):
+        packed = (FakeInt8Tensor(100), FakeTensor(5))
+        # Tied weights show up under two keys
+        return {"embedding": self.embedding, "head": self.embedding, "linear._packed_params": packed, "scale": 1.0}
+
+class FakeInt8Tensor(FakeTensor):
+    def element_size(self):
+        return 1
+
+class TestModelRegistry(unittest.TestCase):
+    def setUp(self):
+        self.loads = []
+        self.registry = ModelRegistry(budget=100)
+
+    def loader(self, id: str):
+        def load():
+            self.loads.append(id)
+            return {"id": id}
+        return load
+
+    def test_lazy_and_shared(self):
+        self.registry.register("clip", self.loader("clip"), size=10)
+        self.registry.register("clip", self.loader("other"), size=10)
+        self.assertEqual(self.loads, [])
+
+        first = self.registry.get("clip")
+        second = self.registry.get("clip")
+
+        self.assertIs(first, second)
+        self.assertEqual(self.loads, ["clip"])
+
+    def test_unknown_model(self):
+        with self.assertRaises(KeyError):
+            self.registry.get("missing")
+
+    def test_lru_unloading(self):
+        for id in ("a", "b", "c"):
+            self.registry.register(id, self.loader(id), size=40)
+
+        self.registry.get("a")
+        self.registry.get("b")
+        self.registry.get("a")
+        self.registry.get("c")
+
+        self.assertTrue(self.registry.is_loaded("a"))
+        self.assertFalse(self.registry.is_loaded("b"))
+        self.assertTrue(self.registry.is_loaded("c"))
+        self.assertLessEqual(self.registry.total_size(), 100)
+
+        self.registry.get("b")
+        self.assertEqual(self.loads, ["a", "b", "c", "b"])
+
+    def test_leased_models_are_kept(self):
+        for id in ("a", "b"):
+            self.registry.register(id, self.loader(id), size=80)
+
+        with self.registry.use("a"):
+            # "a" is older but in use, so "b" is unloaded as soon as it is released
+            self.registry.get("b")
+            self.assertTrue(self.registry.is_loaded("a"))
+            self.assertFalse(self.registry.is_loaded("b"))
+
+        self.registry.get("b")
+        self.assertFalse(self.registry.is_loaded("a"))
+        self.assertTrue(self.registry.is_loaded("b"))
+
+    def test_concurrent_load_once(self):
+        self.registry.register("clip", self.loader("clip"))
+        threads = [threading.Thread(target=self.registry.get, args=("clip",)) for _ in range(8)]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(self.loads, ["clip"])
+
+    def test_estimate_size(self):
+        self.assertEqual(estimate_size(FakeModel()), 64)
+        self.assertEqual(estimate_size((FakeModel(), object())), 64)
+
+    def test_estimate_size_quantized(self):
+        # embedding (40) + int8 packed weight (100) + bias (20)
+        self.assertEqual(estimate_size(QuantizedModel()), 160)
+
+    def test_share_memory(self):
+        model = FakeModel()
+        share_memory((model, {"processor": object()}))
+        self.assertTrue(model.shared)
+
+    def test_preload_models(self):
+        model = FakeModel()
+        self.registry.register("clip", lambda: model)
+        self.registry.register("blip", self.loader("blip"))
+
+        with patch("core.util.model_registry.models", self.registry), patch.dict("os.environ", {"PRELOAD_MODELS": "clip"}):
+            self.assertEqual(preload_models(share=True), ["clip"])
+
+        self.assertTrue(self.registry.is_loaded("clip"))
+        self.assertFalse(self.registry.is_loaded("blip"))
+        self.assertTrue(model.shared)
+
+if __name__ == '__main__':
+    unittest.main()
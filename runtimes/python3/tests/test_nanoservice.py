@@ -46,7 +46,7 @@ class TestNanoServiceMethods(unittest.TestCase):
 
     def test_run_validation_error(self):
         self.service.name = "test_service"
-        self.service.blueprintMapper = MagicMock(return_value={})
+        self.service.blueprintMapper = MagicMock(return_value={"name": 123})
         self.service.setSchemas({"type": "object", "properties": {"name": {"type": "string"}}}, {"type": "object"})
 
         self.ctx.request['body'] = {"name": 123}  # Invalid input
@@ -54,6 +54,19 @@ class TestNanoServiceMethods(unittest.TestCase):
         with self.assertRaises(ValidationError):
             asyncio.run(self.service.run(self.ctx))
 
+    def test_run_validates_output_data(self):
+        self.service.name = "test_service"
+        self.service.blueprintMapper = MagicMock(return_value={})
+        self.service.setSchemas({}, {"type": "object", "required": ["result"]})
+
+        response = asyncio.run(self.service.run(self.ctx))
+        self.assertTrue(response.success)
+        self.assertEqual(response.data, {"result": "test"})
+
+        self.service.setSchemas({}, {"type": "object", "required": ["missing"]})
+        with self.assertRaises(ValidationError):
+            asyncio.run(self.service.run(self.ctx))
+
     def test_validate_success(self):
         schema = {"type": "object", "properties": {"name": {"type": "string"}}}
         obj = {"name": "test"}
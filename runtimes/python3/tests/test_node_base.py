@@ -41,6 +41,17 @@ class NodeBaseTest(unittest.TestCase):
             asyncio.run(self.node.process(self.ctx))
         self.assertEqual(str(context.exception), "Error occurred")
 
+    def test_invocation_isolated(self):
+        self.node.model = object()
+        first = self.node.invocation({'name': 'first', 'node': 'test', 'stop': True})
+        second = self.node.invocation({'name': 'second', 'node': 'test'})
+        self.assertEqual(first.name, 'first')
+        self.assertEqual(second.name, 'second')
+        self.assertTrue(first.stop)
+        self.assertFalse(second.stop)
+        self.assertEqual(self.node.name, '')
+        self.assertIs(first.model, self.node.model)
+
     def test_blueprintMapper_string(self):
         self.node.name = 'test_node'
         with patch('core.util.mapper.Mapper.replace_string', return_value="replaced_value") as mock_replace_string:
@@ -51,10 +62,10 @@ class NodeBaseTest(unittest.TestCase):
     def test_blueprintMapper_object(self):
         self.node.name = 'test_node'
         obj = {'key': 'value'}
-        with patch('core.util.mapper.Mapper.replace_object_strings') as mock_replace_object_strings:
+        with patch('core.util.mapper.Mapper.map_object', return_value={'key': 'mapped'}) as mock_map_object:
             result = self.node.blueprintMapper(obj, self.ctx)
-            self.assertEqual(result, obj)
-            mock_replace_object_strings.assert_called_once_with(obj, self.ctx, None)
+            self.assertEqual(result, {'key': 'mapped'})
+            mock_map_object.assert_called_once_with(obj, self.ctx, None)
 
     def test_run_js(self):
         self.node.name = 'test_node'
@@ -0,0 +1,43 @@
+import unittest
+from typing import Any, Dict
+from core.types.context import Context
+from core.types.nanoservice_response import NanoServiceResponse
+from core.nanoservice import NanoService
+from nodes.nodes import NodeRegistry
+
+class CountingNode(NanoService):
+    created = 0
+
+    def __init__(self):
+        NanoService.__init__(self)
+        CountingNode.created += 1
+
+    async def handle(self, ctx: Context, inputs: Dict[str, Any]) -> NanoServiceResponse:
+        return NanoServiceResponse()
+
+class TestNodeRegistry(unittest.TestCase):
+    def setUp(self):
+        CountingNode.created = 0
+        self.registry = NodeRegistry({"counting": "tests.test_node_registry:CountingNode"})
+
+    def test_node_is_built_on_first_access(self):
+        self.assertEqual(CountingNode.created, 0)
+        self.assertEqual(self.registry.loaded(), [])
+
+        node = self.registry["counting"]
+        self.assertIsInstance(node, CountingNode)
+        self.assertIs(self.registry["counting"], node)
+        self.assertEqual(CountingNode.created, 1)
+
+    def test_preload(self):
+        self.registry.preload(["counting"])
+        self.assertEqual(self.registry.loaded(), ["counting"])
+        self.assertEqual(CountingNode.created, 1)
+
+    def test_unknown_node(self):
+        self.assertNotIn("missing", self.registry)
+        with self.assertRaises(KeyError):
+            self.registry["missing"]
+
+if __name__ == '__main__':
+    unittest.main()
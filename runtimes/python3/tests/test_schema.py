@@ -0,0 +1,32 @@
+import unittest
+from jsonschema import ValidationError # type: ignore
+from core.util.schema import SchemaCache, is_empty_schema
+
+class TestSchemaCache(unittest.TestCase):
+    def setUp(self):
+        self.cache = SchemaCache()
+        self.schema = {"type": "object", "properties": {"name": {"type": "string"}}, "required": ["name"]}
+
+    def test_compiled_once_per_content(self):
+        compiled = self.cache.get(self.schema)
+        self.assertIs(self.cache.get(self.schema), compiled)
+        self.assertIs(self.cache.get(dict(self.schema)), compiled)
+
+    def test_validate(self):
+        compiled = self.cache.get(self.schema)
+        compiled.validate({"name": "test"})
+        with self.assertRaises(ValidationError) as context:
+            compiled.validate({"name": 123})
+        self.assertIn("123 is not of type 'string'", str(context.exception))
+
+    def test_empty_schema_skips_validation(self):
+        self.assertTrue(is_empty_schema({}))
+        self.assertTrue(is_empty_schema({"$schema": "http://json-schema.org/draft-07/schema#", "title": "Root"}))
+        self.assertFalse(is_empty_schema(self.schema))
+
+        compiled = self.cache.get({})
+        self.assertIsNone(compiled.validator)
+        compiled.validate(object())
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,51 @@
+import asyncio
+import unittest
+from textblob import TextBlob # type: ignore
+from core.types.context import Context
+from nodes.sentiment.node import Sentiment
+from nodes.sentiment.scorer import PolarityScorer, label
+
+TEXTS = [
+    "Great product: works perfectly and the support was helpful",
+    "Terrible: the app crashes every time, awful experience",
+    "Shipping: arrived on a Tuesday",
+    "Not good: the battery is not great",
+    "Very happy: extremely fast delivery",
+    "Love it!: best purchase this year!!",
+    "Meh :( : it broke after a week :-)",
+    "",
+]
+
+class TestSentiment(unittest.TestCase):
+    def test_scores_match_textblob(self):
+        scores = PolarityScorer().score(TEXTS)
+
+        for text, score in zip(TEXTS, scores):
+            self.assertEqual(score, TextBlob(text).sentiment.polarity, text)
+
+    def test_label(self):
+        self.assertEqual(label(0.5), "+")
+        self.assertEqual(label(-0.1), "-")
+        self.assertEqual(label(0.0), "")
+
+    def test_batch_items(self):
+        items = [
+            {"id": 1, "title": "Great product", "comment": "works perfectly", "createdAt": "2024-01-01"},
+            {"id": 2, "title": "Terrible", "comment": "it crashes", "createdAt": "2024-01-02"},
+            {"id": 3, "title": "Shipping", "comment": "arrived on a Tuesday", "createdAt": "2024-01-03"},
+        ]
+        response = asyncio.run(Sentiment().handle(Context(), {"items": items}))
+
+        self.assertTrue(response.success)
+        self.assertEqual([item["sentiment"] for item in response.data["items"]], ["+", "-", ""])
+        self.assertEqual([item["id"] for item in response.data["items"]], [1, 2, 3])
+
+    def test_single_feedback(self):
+        inputs = {"id": 1, "title": "Not good", "comment": "very slow", "sentiment": "", "createdAt": "2024-01-01"}
+        response = asyncio.run(Sentiment().handle(Context(), inputs))
+
+        self.assertTrue(response.success)
+        self.assertEqual(response.data["sentiment"], label(TextBlob("Not good: very slow").sentiment.polarity))
+
+if __name__ == "__main__":
+    unittest.main()
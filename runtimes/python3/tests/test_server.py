@@ -0,0 +1,315 @@
+import base64
+import json
+import unittest
+from unittest.mock import patch
+from typing import Any, Dict
+import gen.node_pb2 as node_pb2
+from core.types.context import Context
+from core.types.nanoservice_response import NanoServiceResponse
+from core.nanoservice import NanoService
+from nodes.nodes import get_nodes
+from server import NodeService
+from util.codecs import get_codec
+from util.session import config_id
+from util.shared_memory import SHM, unlink_segment, write_segment
+from multiprocessing import shared_memory
+
+class EchoNode(NanoService):
+    async def handle(self, ctx: Context, inputs: Dict[str, Any]) -> NanoServiceResponse:
+        response = NanoServiceResponse()
+        response.setSuccess({"name": self.name, "inputs": inputs})
+        return response
+
+class BinaryNode(NanoService):
+    def __init__(self):
+        NanoService.__init__(self)
+        self.contentType = "application/pdf"
+
+    async def handle(self, ctx: Context, inputs: Dict[str, Any]) -> NanoServiceResponse:
+        response = NanoServiceResponse()
+        response.setSuccess(b"%PDF-1.4")
+        return response
+
+class StreamingNode(NanoService):
+    async def handle(self, ctx: Context, inputs: Dict[str, Any]) -> NanoServiceResponse:
+        response = NanoServiceResponse()
+        response.setSuccess({"part": "all"})
+        return response
+
+    async def stream(self, ctx: Context, inputs: Dict[str, Any]):
+        for part in range(3):
+            yield {"part": part}
+
+class AttachmentNode(NanoService):
+    async def handle(self, ctx: Context, inputs: Dict[str, Any]) -> NanoServiceResponse:
+        response = NanoServiceResponse()
+        image = inputs["image"]
+        response.setSuccess({"size": len(image), "content_type": image.content_type, "head": bytes(image.view()[:2]).hex()})
+        return response
+
+get_nodes().register("test-echo", "tests.test_server:EchoNode")
+get_nodes().register("test-binary", "tests.test_server:BinaryNode")
+get_nodes().register("test-streaming", "tests.test_server:StreamingNode")
+get_nodes().register("test-attachment", "tests.test_server:AttachmentNode")
+
+async def upload_stream(request, chunks):
+    yield node_pb2.NodeUploadChunk(Request=request)
+    for chunk in chunks:
+        yield node_pb2.NodeUploadChunk(Attachment=node_pb2.NodeAttachmentChunk(Name="image", Data=chunk, ContentType="image/jpeg"))
+
+def node_context(name: str, **config: Any) -> Dict[str, Any]:
+    return {
+        "request": {"body": {"value": 1}},
+        "response": {},
+        "config": {"name": name, "node": name, **config},
+    }
+
+class TestNodeService(unittest.IsolatedAsyncioTestCase):
+    def setUp(self):
+        self.service = NodeService()
+
+    async def test_execute_node(self):
+        message = base64.b64encode(json.dumps(node_context("test-echo")).encode("utf-8")).decode("utf-8")
+        request = node_pb2.NodeRequest(Name="test-echo", Message=message, Encoding="BASE64", Type="JSON")
+
+        response = await self.service.ExecuteNode(request, None)
+
+        result = json.loads(base64.b64decode(response.Message))
+        self.assertEqual(result["name"], "test-echo")
+
+    async def test_execute_node_binary_json(self):
+        request = node_pb2.NodeBinaryRequest(
+            Version=1,
+            Name="test-echo",
+            Payload=get_codec("json").encode(node_context("test-echo", value="${value}")),
+            Codec="json",
+        )
+
+        response = await self.service.ExecuteNodeBinary(request, None)
+
+        self.assertTrue(response.Success)
+        self.assertEqual(response.Codec, "json")
+        self.assertEqual(get_codec("json").decode(response.Payload)["inputs"]["value"], "1")
+
+    async def test_execute_node_binary_raw_result(self):
+        request = node_pb2.NodeBinaryRequest(
+            Version=1,
+            Name="test-binary",
+            Payload=get_codec("json").encode(node_context("test-binary")),
+            Codec="json",
+            Accept=["raw", "json"],
+        )
+
+        response = await self.service.ExecuteNodeBinary(request, None)
+
+        self.assertTrue(response.Success)
+        self.assertEqual(response.Codec, "raw")
+        self.assertEqual(response.ContentType, "application/pdf")
+        self.assertEqual(response.Payload, b"%PDF-1.4")
+
+    async def test_execute_node_binary_error(self):
+        request = node_pb2.NodeBinaryRequest(Version=1, Name="missing-node", Payload=b"{}", Codec="json")
+
+        response = await self.service.ExecuteNodeBinary(request, None)
+
+        self.assertFalse(response.Success)
+        self.assertIn("error", get_codec("json").decode(response.Payload))
+
+    def binary_request(self, name: str, accept=None):
+        return node_pb2.NodeBinaryRequest(
+            Version=1,
+            Name=name,
+            Payload=get_codec("json").encode(node_context(name)),
+            Codec="json",
+            Accept=accept or [],
+        )
+
+    async def test_execute_node_stream(self):
+        chunks = [chunk async for chunk in self.service.ExecuteNodeStream(self.binary_request("test-streaming"), None)]
+
+        self.assertEqual([chunk.Sequence for chunk in chunks], [0, 1, 2, 3])
+        self.assertEqual([get_codec("json").decode(chunk.Payload) for chunk in chunks[:3]], [{"part": 0}, {"part": 1}, {"part": 2}])
+        self.assertTrue(chunks[-1].Last)
+        self.assertTrue(chunks[-1].Success)
+
+    async def test_execute_node_stream_default(self):
+        request = self.binary_request("test-binary", accept=["raw"])
+        chunks = [chunk async for chunk in self.service.ExecuteNodeStream(request, None)]
+
+        self.assertEqual(len(chunks), 2)
+        self.assertEqual(chunks[0].Payload, b"%PDF-1.4")
+        self.assertEqual(chunks[0].ContentType, "application/pdf")
+
+    async def test_execute_node_stream_pdf(self):
+        context = node_context("generate-pdf", title="Sales", sales_data=[{"product": "A", "quantity": 1, "price": 2.0, "total": 2.0}])
+        request = node_pb2.NodeBinaryRequest(Version=1, Name="generate-pdf", Payload=get_codec("json").encode(context), Codec="json", Accept=["raw"])
+        chunks = [chunk async for chunk in self.service.ExecuteNodeStream(request, None)]
+
+        self.assertTrue(chunks[-1].Success)
+        self.assertTrue(chunks[0].Payload.startswith(b"%PDF"))
+        self.assertEqual(chunks[0].ContentType, "application/pdf")
+
+    async def test_execute_node_binary_json_only(self):
+        response = await self.service.ExecuteNodeBinary(self.binary_request("test-binary", accept=["json"]), None)
+
+        self.assertFalse(response.Success)
+        self.assertEqual(response.Codec, "json")
+        self.assertIn("No accepted codec", get_codec("json").decode(response.Payload)["error"])
+
+    async def test_execute_node_error_raw_only(self):
+        response = await self.service.ExecuteNodeBinary(self.binary_request("missing-node", accept=["raw"]), None)
+
+        self.assertFalse(response.Success)
+        self.assertEqual(response.Codec, "json")
+
+    async def test_execute_node_stream_error(self):
+        chunks = [chunk async for chunk in self.service.ExecuteNodeStream(self.binary_request("missing-node"), None)]
+
+        self.assertEqual(len(chunks), 1)
+        self.assertTrue(chunks[0].Last)
+        self.assertFalse(chunks[0].Success)
+
+    async def test_execute_node_upload(self):
+        chunks = [b"\xff\xd8\xff\xe0", b"a" * 1000, b"b" * 1000]
+        response = await self.service.ExecuteNodeUpload(upload_stream(self.binary_request("test-attachment"), chunks), None)
+
+        self.assertTrue(response.Success)
+        result = get_codec("json").decode(response.Payload)
+        self.assertEqual(result["size"], 2004)
+        self.assertEqual(result["content_type"], "image/jpeg")
+        self.assertEqual(result["head"], "ffd8")
+
+    async def test_execute_node_upload_limit(self):
+        with patch("server.UPLOAD_MAX_BYTES", 10):
+            response = await self.service.ExecuteNodeUpload(upload_stream(self.binary_request("test-attachment"), [b"a" * 8, b"b" * 8]), None)
+
+        self.assertFalse(response.Success)
+        self.assertIn("limit", get_codec("json").decode(response.Payload)["error"])
+
+    async def test_execute_node_binary_shared_memory(self):
+        payload = get_codec("json").encode(node_context("test-echo", value="${value}"))
+        segment = write_segment(payload)
+        try:
+            request = node_pb2.NodeBinaryRequest(
+                Version=1,
+                Name="test-echo",
+                Codec="json",
+                Shared=node_pb2.SharedMemoryRef(Kind=SHM, Handle=segment.name, Offset=0, Length=len(payload)),
+                SharedResponseMinBytes=1,
+            )
+            response = await self.service.ExecuteNodeBinary(request, None)
+        finally:
+            unlink_segment(segment)
+
+        self.assertTrue(response.Success)
+        self.assertEqual(response.Payload, b"")
+        result_segment = shared_memory.SharedMemory(name=response.Shared.Handle)
+        try:
+            result = get_codec("json").decode(bytes(result_segment.buf[:response.Shared.Length]))
+            self.assertEqual(result["inputs"]["value"], "1")
+        finally:
+            result_segment.close()
+            result_segment.unlink()
+
+    async def test_execute_node_upload_shared_memory(self):
+        segment = write_segment(b"\xff\xd8" + b"a" * 98)
+        try:
+            async def chunks():
+                yield node_pb2.NodeUploadChunk(Request=self.binary_request("test-attachment"))
+                yield node_pb2.NodeUploadChunk(Attachment=node_pb2.NodeAttachmentChunk(
+                    Name="image",
+                    ContentType="image/jpeg",
+                    Shared=node_pb2.SharedMemoryRef(Kind=SHM, Handle=segment.name, Offset=0, Length=100),
+                ))
+
+            response = await self.service.ExecuteNodeUpload(chunks(), None)
+        finally:
+            unlink_segment(segment)
+
+        self.assertTrue(response.Success)
+        result = get_codec("json").decode(response.Payload)
+        self.assertEqual(result["size"], 100)
+        self.assertEqual(result["head"], "ffd8")
+
+    def batch_request(self, names, concurrency=0):
+        return node_pb2.NodeBatchRequest(
+            Requests=[
+                node_pb2.NodeBinaryRequest(
+                    Version=1,
+                    Name=name,
+                    Payload=get_codec("json").encode(node_context(name, value=f"{index}")),
+                    Codec="json",
+                )
+                for index, name in enumerate(names)
+            ],
+            Concurrency=concurrency,
+        )
+
+    async def test_execute_batch(self):
+        request = self.batch_request(["test-echo", "missing-node", "test-echo"], concurrency=2)
+
+        response = await self.service.ExecuteBatch(request, None)
+
+        self.assertEqual([item.Index for item in response.Items], [0, 1, 2])
+        self.assertEqual([item.Response.Success for item in response.Items], [True, False, True])
+        self.assertEqual(get_codec("json").decode(response.Items[2].Response.Payload)["inputs"]["value"], "2")
+
+    async def test_execute_batch_stream(self):
+        request = self.batch_request(["test-echo"] * 5)
+
+        items = [item async for item in self.service.ExecuteBatchStream(request, None)]
+
+        self.assertEqual(sorted(item.Index for item in items), [0, 1, 2, 3, 4])
+        self.assertTrue(all(item.Response.Success for item in items))
+
+    async def test_execute_node_session(self):
+        json_codec = get_codec("json")
+        # Longer than MAPPER_CACHE_MAX_LENGTH, so only the registered templates avoid recompiling it
+        config = {"name": "echo", "node": "test-echo", "value": "${value}", "long": "x" * 5000 + "${value}"}
+        id = config_id("test-echo", config)
+
+        async def messages():
+            yield node_pb2.NodeSessionRequest(Id=1, Register=node_pb2.NodeSessionRegister(
+                Name="test-echo",
+                Config=json_codec.encode(config),
+                Codec="json",
+            ))
+            for value in (2, 3):
+                # Invocations only carry the per-request context
+                payload = json_codec.encode({"request": {"body": {"value": value}}, "response": {}})
+                yield node_pb2.NodeSessionRequest(Id=value, Invoke=node_pb2.NodeSessionInvoke(
+                    ConfigId=id,
+                    Request=node_pb2.NodeBinaryRequest(Version=1, Payload=payload, Codec="json"),
+                ))
+            yield node_pb2.NodeSessionRequest(Id=4, Release=node_pb2.NodeSessionRelease(ConfigId=id))
+            yield node_pb2.NodeSessionRequest(Id=5, Invoke=node_pb2.NodeSessionInvoke(
+                ConfigId=id,
+                Request=node_pb2.NodeBinaryRequest(Version=1, Payload=b"{}", Codec="json"),
+            ))
+
+        responses = {}
+        # Invocations map with the templates compiled at registration, never through the global cache
+        with patch("core.util.mapper.compile_template", side_effect=AssertionError("template compiled per call")):
+            async for response in self.service.ExecuteNodeSession(messages(), None):
+                responses[response.Id] = response
+
+        self.assertTrue(responses[1].Response.Success)
+        self.assertEqual(responses[1].ConfigId, id)
+        self.assertEqual(json_codec.decode(responses[2].Response.Payload)["inputs"]["value"], "2")
+        self.assertEqual(json_codec.decode(responses[3].Response.Payload)["inputs"]["value"], "3")
+        self.assertEqual(json_codec.decode(responses[3].Response.Payload)["inputs"]["long"], "x" * 5000 + "3")
+        self.assertFalse(responses[5].Response.Success)
+        self.assertIn("Unknown session config", json_codec.decode(responses[5].Response.Payload)["error"])
+
+    async def test_execute_node_session_register_error(self):
+        async def messages():
+            yield node_pb2.NodeSessionRequest(Id=1, Register=node_pb2.NodeSessionRegister(Name="missing-node", Config=b"{}", Codec="json"))
+
+        responses = [response async for response in self.service.ExecuteNodeSession(messages(), None)]
+
+        self.assertEqual(len(responses), 1)
+        self.assertFalse(responses[0].Response.Success)
+        self.assertEqual(responses[0].ConfigId, "")
+
+if __name__ == '__main__':
+    unittest.main()
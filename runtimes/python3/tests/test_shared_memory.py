@@ -0,0 +1,58 @@
+import os
+import tempfile
+import unittest
+from multiprocessing import shared_memory
+from unittest.mock import patch
+import gen.node_pb2 as node_pb2
+from util.shared_memory import FILE, SHM, open_segment, unlink_segment, untrack, write_segment
+
+class TestSharedMemory(unittest.TestCase):
+    def test_read_shm_segment(self):
+        shm = shared_memory.SharedMemory(create=True, size=16)
+        untrack(shm)
+        try:
+            shm.buf[:11] = b"hello world"
+            ref = node_pb2.SharedMemoryRef(Kind=SHM, Handle=shm.name, Offset=6, Length=5)
+            with open_segment(ref) as segment:
+                self.assertIsInstance(segment.view, memoryview)
+                self.assertEqual(bytes(segment.view), b"world")
+        finally:
+            shm.close()
+            unlink_segment(shm)
+
+    def test_read_file_segment(self):
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "payload")
+            with open(path, "wb") as file:
+                file.write(b"0123456789")
+
+            with patch("util.shared_memory.SHARED_MEMORY_DIR", os.path.realpath(directory)):
+                ref = node_pb2.SharedMemoryRef(Kind=FILE, Handle=path, Offset=2, Length=3)
+                with open_segment(ref) as segment:
+                    self.assertEqual(bytes(segment.view), b"234")
+
+    def test_rejects_files_outside_directory(self):
+        ref = node_pb2.SharedMemoryRef(Kind=FILE, Handle="/etc/passwd", Offset=0, Length=1)
+        with self.assertRaises(ValueError):
+            open_segment(ref)
+
+    def test_rejects_out_of_bounds(self):
+        segment = write_segment(b"abc")
+        try:
+            ref = node_pb2.SharedMemoryRef(Kind=SHM, Handle=segment.name, Offset=0, Length=1024 * 1024)
+            with self.assertRaises(ValueError):
+                open_segment(ref)
+        finally:
+            unlink_segment(segment)
+
+    def test_write_segment(self):
+        segment = write_segment(b"payload")
+        try:
+            ref = node_pb2.SharedMemoryRef(Kind=SHM, Handle=segment.name, Offset=0, Length=7)
+            with open_segment(ref) as opened:
+                self.assertEqual(bytes(opened.view), b"payload")
+        finally:
+            unlink_segment(segment)
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,60 @@
+import asyncio
+import os
+import signal
+import time
+import unittest
+from unittest.mock import patch
+from supervisor import Supervisor
+
+async def idle_serve(preload: bool = True, worker=None):
+    while True:
+        await asyncio.sleep(1)
+
+def poll_until(supervisor: Supervisor, condition, timeout: float = 10) -> bool:
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        supervisor.poll(0.05)
+        if condition():
+            return True
+    return False
+
+@unittest.skipUnless(hasattr(os, "fork"), "requires fork")
+class TestSupervisor(unittest.TestCase):
+    def setUp(self):
+        self.supervisor = Supervisor(2, idle_serve)
+
+    def tearDown(self):
+        self.supervisor.stop()
+        poll_until(self.supervisor, lambda: not self.supervisor.processes)
+
+    def test_heartbeat(self):
+        self.supervisor.spawn(0)
+        worker = next(iter(self.supervisor.processes.values()))
+        started = worker.last_seen
+
+        self.assertTrue(poll_until(self.supervisor, lambda: worker.last_seen > started))
+
+    @patch("supervisor.RESTART_DELAY", 0)
+    def test_restart_crashed_worker(self):
+        self.supervisor.spawn(0)
+        self.supervisor.spawn(1)
+        crashed = next(pid for pid, worker in self.supervisor.processes.items() if worker.index == 0)
+
+        os.kill(crashed, signal.SIGKILL)
+
+        def restarted():
+            indexes = sorted(worker.index for worker in self.supervisor.processes.values())
+            return crashed not in self.supervisor.processes and indexes == [0, 1]
+        self.assertTrue(poll_until(self.supervisor, restarted))
+
+    def test_stop_drains_workers(self):
+        self.supervisor.spawn(0)
+        self.supervisor.spawn(1)
+
+        self.supervisor.stop()
+
+        self.assertTrue(poll_until(self.supervisor, lambda: not self.supervisor.processes))
+        self.assertEqual(self.supervisor.restarts, {})
+
+if __name__ == '__main__':
+    unittest.main()
@@ -0,0 +1,115 @@
+import json
+from typing import Any, Dict, List, Optional
+
+try:
+    import ujson # type: ignore
+except ImportError:
+    ujson = None
+
+try:
+    import msgpack # type: ignore
+except ImportError:
+    msgpack = None
+
+def to_plain(message: Any) -> Any:
+    if hasattr(message, 'to_dict'):
+        return message.to_dict()
+    return message
+
+def json_dumps(message: Any) -> str:
+    message = to_plain(message)
+    if ujson is not None:
+        try:
+            return ujson.dumps(message, ensure_ascii=False, escape_forward_slashes=False)
+        except (TypeError, OverflowError, ValueError):
+            pass
+    return json.dumps(message)
+
+def json_loads(message: Any) -> Any:
+    if ujson is not None:
+        try:
+            return ujson.loads(message)
+        except (OverflowError, ValueError):
+            pass
+    return json.loads(message)
+
+class Codec:
+    name = ""
+    content_type = ""
+
+    def encode(self, message: Any) -> bytes:
+        raise NotImplementedError()
+
+    def decode(self, payload: bytes) -> Any:
+        raise NotImplementedError()
+
+    def can_encode(self, message: Any) -> bool:
+        return True
+
+class JsonCodec(Codec):
+    name = "json"
+    content_type = "application/json"
+
+    def encode(self, message: Any) -> bytes:
+        return json_dumps(message).encode("utf-8")
+
+    def decode(self, payload: bytes) -> Any:
+        return json_loads(bytes(payload))
+
+    def can_encode(self, message: Any) -> bool:
+        return not isinstance(message, (bytes, bytearray, memoryview))
+
+class MsgpackCodec(Codec):
+    name = "msgpack"
+    content_type = "application/msgpack"
+
+    def encode(self, message: Any) -> bytes:
+        return msgpack.packb(to_plain(message), use_bin_type=True, default=to_plain)
+
+    def decode(self, payload: bytes) -> Any:
+        return msgpack.unpackb(payload, raw=False)
+
+class RawCodec(Codec):
+    # Binary passthrough: the payload is the node result itself
+    name = "raw"
+    content_type = "application/octet-stream"
+
+    def encode(self, message: Any) -> bytes:
+        if isinstance(message, (bytes, bytearray, memoryview)):
+            return bytes(message)
+        if isinstance(message, str):
+            return message.encode("utf-8")
+        raise TypeError(f"Raw codec cannot encode {type(message).__name__}")
+
+    def decode(self, payload: bytes) -> Any:
+        return bytes(payload)
+
+    def can_encode(self, message: Any) -> bool:
+        return isinstance(message, (bytes, bytearray, memoryview, str))
+
+codecs: Dict[str, Codec] = {
+    JsonCodec.name: JsonCodec(),
+    RawCodec.name: RawCodec(),
+}
+if msgpack is not None:
+    codecs[MsgpackCodec.name] = MsgpackCodec()
+
+DEFAULT_CODEC = JsonCodec.name
+
+def get_codec(name: Optional[str]) -> Codec:
+    name = (name or DEFAULT_CODEC).lower()
+    if name not in codecs:
+        raise ValueError(f"Unsupported codec: {name}")
+    return codecs[name]
+
+def negotiate(message: Any, accept: List[str], fallback: Optional[str] = None) -> Codec:
+    # First codec the caller accepts that can represent the message. Callers that
+    # name no known codec get the request codec, then JSON (or raw bytes when the
+    # result is binary). A codec the caller did not accept is never used instead.
+    accepted = [name.lower() for name in accept if name.lower() in codecs]
+    candidates = accepted or [(fallback or DEFAULT_CODEC).lower(), DEFAULT_CODEC, RawCodec.name]
+    for name in candidates:
+        codec = codecs.get(name)
+        if codec is not None and codec.can_encode(message):
+            return codec
+    raise ValueError(f"No accepted codec ({', '.join(candidates)}) can encode {type(message).__name__}")
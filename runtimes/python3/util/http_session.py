@@ -0,0 +1,59 @@
+import asyncio
+import os
+from typing import Optional
+import aiohttp # type: ignore
+
+class HttpSessionPool:
+    # Long-lived aiohttp session with a keep-alive connector and DNS cache.
+    # The instance is created once per node and shared by all its invocations.
+    def __init__(
+        self,
+        limit: Optional[int] = None,
+        limit_per_host: Optional[int] = None,
+        keepalive_timeout: Optional[float] = None,
+        dns_ttl: Optional[int] = None,
+        timeout: Optional[float] = None,
+    ):
+        self.limit = limit if limit is not None else int(os.getenv("HTTP_POOL_LIMIT", "100"))
+        self.limit_per_host = limit_per_host if limit_per_host is not None else int(os.getenv("HTTP_POOL_LIMIT_PER_HOST", "20"))
+        self.keepalive_timeout = keepalive_timeout if keepalive_timeout is not None else float(os.getenv("HTTP_POOL_KEEPALIVE", "30"))
+        self.dns_ttl = dns_ttl if dns_ttl is not None else int(os.getenv("HTTP_POOL_DNS_TTL", "300"))
+        self.timeout = timeout if timeout is not None else float(os.getenv("HTTP_POOL_TIMEOUT", "300"))
+        self.session: Optional[aiohttp.ClientSession] = None
+        self.loop: Optional[asyncio.AbstractEventLoop] = None
+
+    def create_connector(self) -> aiohttp.TCPConnector:
+        resolver = None
+        try:
+            import aiodns # type: ignore # noqa: F401
+            resolver = aiohttp.AsyncResolver()
+        except ImportError:
+            pass
+
+        return aiohttp.TCPConnector(
+            limit=self.limit,
+            limit_per_host=self.limit_per_host,
+            keepalive_timeout=self.keepalive_timeout,
+            use_dns_cache=True,
+            ttl_dns_cache=self.dns_ttl,
+            resolver=resolver,
+        )
+
+    async def get(self) -> aiohttp.ClientSession:
+        loop = asyncio.get_running_loop()
+
+        # A session is bound to the loop that created it
+        if self.session is None or self.session.closed or self.loop is not loop:
+            self.session = aiohttp.ClientSession(
+                connector=self.create_connector(),
+                timeout=aiohttp.ClientTimeout(total=self.timeout),
+            )
+            self.loop = loop
+
+        return self.session
+
+    async def close(self) -> None:
+        if self.session is not None and not self.session.closed:
+            await self.session.close()
+        self.session = None
+        self.loop = None
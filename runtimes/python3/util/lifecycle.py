@@ -0,0 +1,19 @@
+import gc
+from nodes.nodes import preload_nodes
+from core.util.model_registry import preload_models
+
+def preload(share: bool = False) -> None:
+    # Runs once before serving (and before forking workers): builds the nodes in
+    # PRELOAD_NODES, loads the models in PRELOAD_MODELS and freezes the result.
+    preloaded = preload_nodes()
+    if preloaded:
+        print(f"Preloaded nodes: {', '.join(preloaded)}")
+
+    loaded = preload_models(share=share)
+    if loaded:
+        print(f"Preloaded models: {', '.join(loaded)}")
+
+    # Everything built so far lives for the whole process: move it to the permanent
+    # generation so the cyclic GC stops walking model graphs, and forked workers do
+    # not touch (and copy) their pages when it runs
+    gc.freeze()
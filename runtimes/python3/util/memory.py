@@ -0,0 +1,41 @@
+import os
+import resource
+from typing import Dict, List
+
+# Fields of /proc/<pid>/smaps_rollup reported per worker, in kB
+FIELDS = ("Rss", "Pss", "Shared_Clean", "Shared_Dirty", "Private_Clean", "Private_Dirty")
+
+def memory_usage(pid: int = 0) -> Dict[str, float]:
+    # Resident memory of a process in MB. Shared pages (models mapped copy-on-write
+    # or through shared memory) are split from private ones where /proc allows it.
+    pid = pid or os.getpid()
+    try:
+        with open(f"/proc/{pid}/smaps_rollup") as file:
+            values = {}
+            for line in file:
+                parts = line.split()
+                if len(parts) >= 2 and parts[0].rstrip(":") in FIELDS:
+                    values[parts[0].rstrip(":")] = int(parts[1]) / 1024
+    except OSError:
+        if pid != os.getpid():
+            return {}
+        # ru_maxrss is in kB on Linux
+        return {"rss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024}
+
+    return {
+        "rss_mb": values.get("Rss", 0.0),
+        "pss_mb": values.get("Pss", 0.0),
+        "shared_mb": values.get("Shared_Clean", 0.0) + values.get("Shared_Dirty", 0.0),
+        "private_mb": values.get("Private_Clean", 0.0) + values.get("Private_Dirty", 0.0),
+    }
+
+def format_memory(usage: Dict[str, float]) -> str:
+    return " ".join(f"{key[:-3]}={value:.1f}MB" for key, value in usage.items())
+
+def memory_report(pids: Dict[int, int]) -> List[str]:
+    # One line per worker index -> pid
+    lines = []
+    for index, pid in sorted(pids.items()):
+        usage = memory_usage(pid)
+        lines.append(f"Worker {index} ({pid}): {format_memory(usage) if usage else 'unavailable'}")
+    return lines
@@ -1,6 +1,10 @@
-import json
 import base64
+from typing import Any, List, Optional, Tuple
 from xml.etree import ElementTree as ET
+from util.codecs import Codec, get_codec, json_dumps, json_loads, negotiate
+from util.shared_memory import open_segment
+
+BINARY_MESSAGE_VERSION = 1
 
 def decode_message(payload):
     # Extract fields from the payload
@@ -18,7 +22,7 @@ def decode_message(payload):
 
     # Step 2: Parse the decoded message based on the type
     if message_type == "JSON":
-        return json.loads(decoded_message)
+        return json_loads(decoded_message)
     elif message_type == "XML":
         return ET.fromstring(decoded_message)
     elif message_type == "TEXT":
@@ -34,10 +38,7 @@ def decode_message(payload):
 def encode_message(message, message_type):
     # Step 1: Encode the message based on the type
     if message_type == "JSON":
-        if hasattr(message, 'to_dict'):
-            encoded_message = json.dumps(message.to_dict())
-        else:
-            encoded_message = json.dumps(message)
+        encoded_message = json_dumps(message)
     elif message_type == "XML":
         encoded_message = ET.tostring(message).decode("utf-8")
     elif message_type == "TEXT":
@@ -50,4 +51,21 @@ def encode_message(message, message_type):
         raise ValueError(f"Unsupported message type: {message_type}")
 
     # Step 2: Encode the message in BASE64 format
-    return base64.b64encode(encoded_message.encode("utf-8")).decode("utf-8")
\ No newline at end of file
+    return base64.b64encode(encoded_message.encode("utf-8")).decode("utf-8")
+
+def decode_binary_message(payload) -> Any:
+    if payload.Version > BINARY_MESSAGE_VERSION:
+        raise ValueError(f"Unsupported message version: {payload.Version}")
+
+    codec = get_codec(payload.Codec)
+    if payload.HasField("Shared"):
+        # Same-host fast path: decode straight from the shared segment
+        with open_segment(payload.Shared) as segment:
+            return codec.decode(segment.view)
+
+    return codec.decode(payload.Payload)
+
+# Encode the message with the first codec accepted by the caller that can represent it
+def encode_binary_message(message: Any, accept: List[str], fallback: Optional[str] = None) -> Tuple[bytes, Codec]:
+    codec = negotiate(message, accept, fallback)
+    return codec.encode(message), codec
@@ -0,0 +1,56 @@
+import hashlib
+import os
+from typing import Any, Dict
+from core.util.mapper import TemplateMapper, collect_templates
+from core.util.schema import compile_schema
+from nodes.nodes import get_nodes
+from util.codecs import json_dumps
+
+SESSION_MAX_CONFIGS = int(os.getenv("SESSION_MAX_CONFIGS", "1024"))
+SESSION_CONCURRENCY = int(os.getenv("SESSION_CONCURRENCY", "16"))
+
+def config_id(name: str, config: Dict[str, Any]) -> str:
+    content = json_dumps({"name": name, "config": config})
+    return hashlib.sha256(content.encode("utf-8")).hexdigest()
+
+class RegisteredConfig:
+    # A node config sent once per session. The node is loaded, its validators are
+    # compiled and the config templates are parsed when it is registered; invocations
+    # only send the config id and are mapped with those templates.
+    def __init__(self, name: str, config: Dict[str, Any]):
+        self.name = name
+        self.config = config
+        self.id = config_id(name, config)
+
+        node = get_nodes()[name]
+        self.mapper = TemplateMapper(collect_templates(config, {}))
+        for schema in (getattr(node, "input_schema", None), getattr(node, "output_schema", None)):
+            if schema is not None:
+                compile_schema(schema)
+
+class SessionConfigs:
+    # Configs registered on one session stream; dropped when the stream ends
+    def __init__(self, size: int = SESSION_MAX_CONFIGS):
+        self.size = size
+        self.configs: Dict[str, RegisteredConfig] = {}
+
+    def register(self, name: str, config: Any) -> RegisteredConfig:
+        if not isinstance(config, dict):
+            raise ValueError("Session config must decode to an object")
+
+        registered = RegisteredConfig(name, config)
+        if registered.id not in self.configs and len(self.configs) >= self.size:
+            raise ValueError(f"Session exceeds the {self.size} registered configs limit")
+        return self.configs.setdefault(registered.id, registered)
+
+    def get(self, id: str) -> RegisteredConfig:
+        registered = self.configs.get(id)
+        if registered is None:
+            raise ValueError(f"Unknown session config: {id}")
+        return registered
+
+    def release(self, id: str) -> None:
+        self.configs.pop(id, None)
+
+    def __len__(self) -> int:
+        return len(self.configs)
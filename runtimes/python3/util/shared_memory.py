@@ -0,0 +1,87 @@
+import mmap
+import os
+import secrets
+from multiprocessing import resource_tracker, shared_memory
+from typing import Any, Optional
+
+# Only files below this directory can be mapped through a "file" reference
+SHARED_MEMORY_DIR = os.path.realpath(os.getenv("SHARED_MEMORY_DIR", "/dev/shm"))
+
+SHM = "shm"
+FILE = "file"
+
+def untrack(shm: shared_memory.SharedMemory) -> None:
+    # The resource tracker unlinks every segment this process touched when it exits;
+    # segments handed over by (or to) the caller are owned by the caller.
+    try:
+        resource_tracker.unregister(shm._name, "shared_memory")
+    except Exception:
+        pass
+
+class SharedSegment:
+    # A read-only view over a payload placed in shared memory by another process.
+    # The view stays valid until close().
+    def __init__(self, ref: Any):
+        self.kind = ref.Kind or SHM
+        self.shm: Optional[shared_memory.SharedMemory] = None
+        self.map: Optional[mmap.mmap] = None
+        self.buffer: Optional[memoryview] = None
+        self.view: Optional[memoryview] = None
+        offset = int(ref.Offset)
+        length = int(ref.Length)
+
+        if self.kind == SHM:
+            self.shm = shared_memory.SharedMemory(name=ref.Handle, create=False)
+            untrack(self.shm)
+            self.buffer = self.shm.buf
+        elif self.kind == FILE:
+            path = os.path.realpath(ref.Handle)
+            if not path.startswith(SHARED_MEMORY_DIR + os.sep):
+                raise ValueError(f"Shared memory file must be inside {SHARED_MEMORY_DIR}")
+            with open(path, "rb") as file:
+                self.map = mmap.mmap(file.fileno(), 0, access=mmap.ACCESS_READ)
+            self.buffer = memoryview(self.map)
+        else:
+            raise ValueError(f"Unsupported shared memory kind: {self.kind}")
+
+        if offset + length > len(self.buffer):
+            self.close()
+            raise ValueError("Shared memory reference is out of bounds")
+
+        self.view = self.buffer[offset:offset + length]
+
+    def close(self) -> None:
+        try:
+            if self.view is not None:
+                self.view.release()
+            if self.map is not None:
+                self.buffer.release()
+                self.map.close()
+            if self.shm is not None:
+                self.shm.close()
+        except BufferError:
+            # A node still holds a view on the segment; it is released with the last reference
+            pass
+
+    def __enter__(self) -> "SharedSegment":
+        return self
+
+    def __exit__(self, *args: Any) -> None:
+        self.close()
+
+def open_segment(ref: Any) -> SharedSegment:
+    return SharedSegment(ref)
+
+def write_segment(data: bytes) -> shared_memory.SharedMemory:
+    # Creates a new segment holding data. Ownership moves to the caller, which
+    # must unlink it after reading.
+    shm = shared_memory.SharedMemory(name=f"nanoservice-{secrets.token_hex(8)}", create=True, size=max(len(data), 1))
+    untrack(shm)
+    shm.buf[:len(data)] = data
+    shm.close()
+    return shm
+
+def unlink_segment(shm: shared_memory.SharedMemory) -> None:
+    # Balances untrack() so unlink() does not unregister a segment twice
+    resource_tracker.register(shm._name, "shared_memory")
+    shm.unlink()